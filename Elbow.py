@@ -1,29 +1,11 @@
-import tkinter as tk
 from tkinter import messagebox
 import os
-import json
-import subprocess
 from neck_cervicalspine import load_and_resize_images, create_layout
+import screen_router
+import selection_handoff
+import protocol_db
 
-# === Embedded therapy data for elbow conditions ===
-therapy_data = {
-    "Tennis Elbow": {
-        "BodyPart": "Elbow",
-        "Condition": "Tennis Elbow",
-        "Power": 30,
-        "Pulse Freq": 10000,
-        "Time": 10,
-        "Total Energy": 3200
-    },
-    "Golfer's Elbow": {
-        "BodyPart": "Elbow",
-        "Condition": "Golfer's Elbow",
-        "Power": 35,
-        "Pulse Freq": 8500,
-        "Time": 12,
-        "Total Energy": 3400
-    }
-}
+REGION = "Elbow"
 
 # === Project path for file output and script launching ===
 PROJECT_DIR = os.path.expanduser(r"C:\Users\malvi\OneDrive\Desktop\project delhi\PythonProject")
@@ -33,45 +15,25 @@ def resource_path(relative_path):
 
 def on_condition_selected(condition):
     try:
-        if condition in therapy_data:
-            therapy = therapy_data[condition]
+        therapy = protocol_db.lookup(REGION, condition)
+        if therapy is not None:
 
             data_to_send = {
                 "User Selections": {
-                    "Condition": therapy["Condition"]
+                    "Condition": therapy.ailment
                 },
-                "Therapy Data": {
-                    "Power": therapy["Power"],
-                    "Pulse Freq": therapy["Pulse Freq"],
-                    "Time": therapy["Time"],
-                    "Total Energy": therapy["Total Energy"]
-                },
-                "Body Part": therapy["BodyPart"]
+                "Therapy Data": protocol_db.therapy_data(therapy),
+                "Body Part": therapy.body_part
             }
 
-            temp_json_path = os.path.join(PROJECT_DIR, "temp_selection.json")
-            with open(temp_json_path, "w") as f:
-                json.dump(data_to_send, f)
-
-            therapy_script = os.path.join(PROJECT_DIR, "therapy.py")
-            subprocess.Popen(["python", therapy_script], cwd=PROJECT_DIR)
+            selection_handoff.hand_off(data_to_send, screen_router.get_router().root)
         else:
             messagebox.showwarning("Not Found", f"No therapy data for: {condition}")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to launch therapy.py:\n{e}")
 
-def main():
-    root = tk.Tk()
-    root.title("Lumino Pro - Elbow")
-    root.attributes('-fullscreen', True)
-
-    screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
-    base_width, base_height = 1300, 750
-    scale_factor = min(screen_width / base_width, screen_height / base_height)
-
-    root.geometry(f"{int(base_width * scale_factor)}x{int(base_height * scale_factor)}")
-    root.configure(bg="gray20")
+def build_screen(root, router):
+    scale_factor = router.scale_factor
 
     elbow_img_path = resource_path("image/bodyparts/elbow.png")
     anatomy_img_path = resource_path("image/anatomy.png")
@@ -85,11 +47,16 @@ def main():
         scale_factor,
         title="Lumino Pro",
         scroll_title="Elbow",
-        info_list=list(therapy_data.keys()),
+        region=REGION,
         callback=on_condition_selected
     )
 
-    root.mainloop()
+    return elbow_photo, anatomy_photo
+
+screen_router.register_screen("elbow", build_screen, title="Lumino Pro - Elbow")
+
+def main():
+    screen_router.run("elbow")
 
 if __name__ == "__main__":
     main()
@@ -1,28 +1,11 @@
-import tkinter as tk
 from tkinter import messagebox
 import os
-import json
-import subprocess
 from neck_cervicalspine import load_and_resize_images, create_layout
+import screen_router
+import selection_handoff
+import protocol_db
 
-therapy_data = {
-    "GTPS": {
-        "BodyPart": "Hip",
-        "Condition": "GTPS",
-        "Power": 38,
-        "Pulse Freq": 9500,
-        "Time": 14,
-        "Total Energy": 3600
-    },
-    "ITBS": {
-        "BodyPart": "Hip",
-        "Condition": "ITBS",
-        "Power": 36,
-        "Pulse Freq": 10000,
-        "Time": 12,
-        "Total Energy": 3400
-    }
-}
+REGION = "Hip"
 
 PROJECT_DIR = os.path.expanduser(r"C:\Users\malvi\OneDrive\Desktop\project delhi\PythonProject")
 
@@ -31,30 +14,21 @@ def resource_path(relative_path):
 
 def on_condition_selected(condition):
     try:
-        if condition in therapy_data:
-            therapy = therapy_data[condition]
+        therapy = protocol_db.lookup(REGION, condition)
+        if therapy is not None:
             data_to_send = {
-                "User Selections": {"Condition": therapy["Condition"]},
-                "Therapy Data": {k: therapy[k] for k in ["Power", "Pulse Freq", "Time", "Total Energy"]},
-                "Body Part": therapy["BodyPart"]
+                "User Selections": {"Condition": therapy.ailment},
+                "Therapy Data": protocol_db.therapy_data(therapy),
+                "Body Part": therapy.body_part
             }
-            with open(os.path.join(PROJECT_DIR, "temp_selection.json"), "w") as f:
-                json.dump(data_to_send, f)
-            subprocess.Popen(["python", os.path.join(PROJECT_DIR, "therapy.py")], cwd=PROJECT_DIR)
+            selection_handoff.hand_off(data_to_send, screen_router.get_router().root)
         else:
             messagebox.showwarning("Not Found", f"No therapy data for: {condition}")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to launch therapy.py:\n{e}")
 
-def main():
-    root = tk.Tk()
-    root.title("Lumino Pro - HIP")
-    root.attributes('-fullscreen', True)
-    screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
-    scale_factor = min(screen_width / 1300, screen_height / 750)
-    root.geometry(f"{int(1300 * scale_factor)}x{int(750 * scale_factor)}")
-    root.configure(bg="gray20")
+def build_screen(root, router):
+    scale_factor = router.scale_factor
 
     hip_img_path = resource_path("image/bodyparts/hip.png")
     anatomy_img_path = resource_path("image/anatomy.png")
@@ -67,11 +41,16 @@ def main():
         scale_factor,
         title="Lumino Pro",
         scroll_title="HIP",
-        info_list=list(therapy_data.keys()),
+        region=REGION,
         callback=on_condition_selected
     )
 
-    root.mainloop()
+    return hip_photo, anatomy_photo
+
+screen_router.register_screen("hip", build_screen, title="Lumino Pro - HIP")
+
+def main():
+    screen_router.run("hip")
 
 if __name__ == "__main__":
     main()
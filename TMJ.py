@@ -1,21 +1,11 @@
-import tkinter as tk
 from tkinter import messagebox
 import os
-import json
-import subprocess
 from neck_cervicalspine import load_and_resize_images, create_layout
+import screen_router
+import selection_handoff
+import protocol_db
 
-# === Therapy data for TMJ ===
-therapy_data = {
-    "TMDs": {
-        "BodyPart": "TMJ",
-        "Condition": "TMDs",
-        "Power": 36,
-        "Pulse Freq": 8700,
-        "Time": 11,
-        "Total Energy": 3100
-    }
-}
+REGION = "TMJ"
 
 PROJECT_DIR = os.path.expanduser(r"C:\Users\malvi\OneDrive\Desktop\project delhi\PythonProject")
 
@@ -24,38 +14,21 @@ def resource_path(relative_path):
 
 def on_condition_selected(condition):
     try:
-        if condition in therapy_data:
-            therapy = therapy_data[condition]
+        therapy = protocol_db.lookup(REGION, condition)
+        if therapy is not None:
             data_to_send = {
-                "User Selections": {"Condition": therapy["Condition"]},
-                "Therapy Data": {
-                    "Power": therapy["Power"],
-                    "Pulse Freq": therapy["Pulse Freq"],
-                    "Time": therapy["Time"],
-                    "Total Energy": therapy["Total Energy"]
-                },
-                "Body Part": therapy["BodyPart"]
+                "User Selections": {"Condition": therapy.ailment},
+                "Therapy Data": protocol_db.therapy_data(therapy),
+                "Body Part": therapy.body_part
             }
-            with open(os.path.join(PROJECT_DIR, "temp_selection.json"), "w") as f:
-                json.dump(data_to_send, f)
-            subprocess.Popen(["python", os.path.join(PROJECT_DIR, "therapy.py")], cwd=PROJECT_DIR)
+            selection_handoff.hand_off(data_to_send, screen_router.get_router().root)
         else:
             messagebox.showwarning("Not Found", f"No therapy data for: {condition}")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to launch therapy.py:\n{e}")
 
-def main():
-    root = tk.Tk()
-    root.title("Lumino Pro - TMJ")
-    root.attributes('-fullscreen', True)
-
-    screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
-    base_width, base_height = 1300, 750
-    scale_factor = min(screen_width / base_width, screen_height / base_height)
-
-    root.geometry(f"{int(base_width * scale_factor)}x{int(base_height * scale_factor)}")
-    root.configure(bg="gray20")
+def build_screen(root, router):
+    scale_factor = router.scale_factor
 
     base_image_dir = os.path.join("C:", os.sep, "Users", "malvi", "OneDrive", "Desktop", "project delhi", "image")
     tmj_path = os.path.join(base_image_dir, "bodyparts", "TMJ.png")
@@ -70,11 +43,16 @@ def main():
         scale_factor,
         title="Lumino Pro",
         scroll_title="TMJ",
-        info_list=list(therapy_data.keys()),
+        region=REGION,
         callback=on_condition_selected
     )
 
-    root.mainloop()
+    return tmj_photo, anatomy_photo
+
+screen_router.register_screen("tmj", build_screen, title="Lumino Pro - TMJ")
+
+def main():
+    screen_router.run("tmj")
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
-import subprocess
-import json
 import os
+import screen_router
+import selection_handoff
+import protocol_db
+import image_cache
 
 from neck_cervicalspine import create_sidebar_buttons
 
@@ -12,226 +13,191 @@ base_dir = os.path.expanduser(r"~\OneDrive\Desktop\project delhi")
 
 # Paths
 image_path = os.path.join(base_dir, "image", "anatomy.png")
-therapy_script = os.path.join(base_dir, "PythonProject", "therapy.py")
-temp_json_path = os.path.join(base_dir, "PythonProject", "temp_selection.json")
-
-# === THERAPY DATA (shortened for brevity, include all parts here) ===
-# === THERAPY DATA ===
-therapy_data = {
-    "ankle": {"acute": {"Power": 40, "Pulse Freq": 10000, "Time": 4, "Total Energy": 1500},
-              "subacute": {"Power": 40, "Pulse Freq": 10000, "Time": 7, "Total Energy": 2400},
-              "chronic": {"Power": 40, "Pulse Freq": 8000, "Time": 12, "Total Energy": 3500}},
-    "knee": {"acute": {"Power": 50, "Pulse Freq": 7000, "Time": 3, "Total Energy": 1000},
-             "subacute": {"Power": 50, "Pulse Freq": 7000, "Time": 6, "Total Energy": 1800},
-             "chronic": {"Power": 60, "Pulse Freq": 5500, "Time": 12, "Total Energy": 3500}},
-    "wrist": {"acute": {"Power": 45, "Pulse Freq": 6000, "Time": 3, "Total Energy": 750},
-              "subacute": {"Power": 45, "Pulse Freq": 6000, "Time": 5, "Total Energy": 1200},
-              "chronic": {"Power": 45, "Pulse Freq": 6000, "Time": 9, "Total Energy": 2100}},
-    "foot": {"acute": {"Power": 40, "Pulse Freq": 10000, "Time": 4, "Total Energy": 1500},
-             "subacute": {"Power": 40, "Pulse Freq": 10000, "Time": 7, "Total Energy": 2400},
-             "chronic": {"Power": 40, "Pulse Freq": 6000, "Time": 6, "Total Energy": 1400}},
-    "lumbar spine": {"acute": {"Power": 60, "Pulse Freq": 6500, "Time": 4, "Total Energy": 1500},
-                     "subacute": {"Power": 60, "Pulse Freq": 6500, "Time": 7, "Total Energy": 2400},
-                     "chronic": {"Power": 60, "Pulse Freq": 6000, "Time": 12, "Total Energy": 3500}},
-    "neck": {"acute": {"Power": 40, "Pulse Freq": 8000, "Time": 5, "Total Energy": 1500},
-             "subacute": {"Power": 35, "Pulse Freq": 10500, "Time": 7, "Total Energy": 2400},
-             "chronic": {"Power": 35, "Pulse Freq": 10500, "Time": 11, "Total Energy": 3500}},
-    "shoulder": {"acute": {"Power": 50, "Pulse Freq": 6500, "Time": 5, "Total Energy": 1500},
-                 "subacute": {"Power": 50, "Pulse Freq": 6500, "Time": 8, "Total Energy": 2400},
-                 "chronic": {"Power": 50, "Pulse Freq": 6500, "Time": 12, "Total Energy": 3500}},
-    "elbow": {"acute": {"Power": 45, "Pulse Freq": 8000, "Time": 3, "Total Energy": 1000},
-              "subacute": {"Power": 50, "Pulse Freq": 8000, "Time": 7, "Total Energy": 2400},
-              "chronic": {"Power": 50, "Pulse Freq": 8000, "Time": 10, "Total Energy": 3500}},
-    "tmj": {"acute": {"Power": 40, "Pulse Freq": 8000, "Time": 2, "Total Energy": 500},
-            "subacute": {"Power": 40, "Pulse Freq": 8000, "Time": 3, "Total Energy": 900},
-            "chronic": {"Power": 40, "Pulse Freq": 8000, "Time": 5, "Total Energy": 1400}},
-    "hip": {"acute": {"Power": 50, "Pulse Freq": 8000, "Time": 4, "Total Energy": 1500},
-            "subacute": {"Power": 50, "Pulse Freq": 8000, "Time": 7, "Total Energy": 2400},
-            "chronic": {"Power": 60, "Pulse Freq": 6000, "Time": 11, "Total Energy": 3500}},
-    "skin condition": {"acute": {"Power": 10, "Pulse Freq": 6000, "Time": 2, "Total Energy": 120},
-                       "subacute": {"Power": 10, "Pulse Freq": 6000, "Time": 4, "Total Energy": 240},
-                       "chronic": {"Power": 10, "Pulse Freq": 6000, "Time": 7, "Total Energy": 400}},
-    "neuropathy": {"acute": {"Power": 40, "Pulse Freq": 6000, "Time": 2, "Total Energy": 900},
-                   "subacute": {"Power": 40, "Pulse Freq": 6000, "Time": 4, "Total Energy": 1400},
-                   "chronic": {"Power": 40, "Pulse Freq": 6000, "Time": 6, "Total Energy": 1800}},
-    "muscle condition": {"acute": {"Power": 40, "Pulse Freq": 8000, "Time": 3, "Total Energy": 1000},
-                         "subacute": {"Power": 40, "Pulse Freq": 8000, "Time": 6, "Total Energy": 1800},
-                         "chronic": {"Power": 40, "Pulse Freq": 8000, "Time": 10, "Total Energy": 2800}}
-}
-# Load image size
-temp_img = Image.open(image_path)
-widthimg, heightimg = temp_img.size
-
-# === CLICKABLE POINTS ===
-points = [
-    (widthimg / 3.3, heightimg / 6.9, "TMJ"),
-    (widthimg / 2.63, heightimg / 4, "Shoulder"),
-    (widthimg / 6.4, heightimg / 2.5, "Elbow"),
-    (widthimg / 3, heightimg / 2.1, "Hip"),
-    (widthimg / 7.5, heightimg / 1.8, "Wrist"),
-    (widthimg / 4.2, heightimg / 1.38, "Knee"),
-    (widthimg / 3.4, heightimg / 1.065, "Foot"),
-    (widthimg / 1.41, heightimg / 6.8, "Neck"),
-    (widthimg / 1.465, heightimg / 1.075, "Ankle"),
-    (widthimg / 1.395, heightimg / 2.3, "Lumbar Spine"),
-    (widthimg / 1.350, heightimg / 1.055, "Neuropathy"),
-    (widthimg / 1.25, heightimg / 2.8, "Skin Condition"),
-    (widthimg / 1.50, heightimg / 1.5, "Muscle Condition")
+
+# === CLICKABLE POINTS (as fractions of the anatomy image size) ===
+POINT_DIVISORS = [
+    (3.3, 6.9, "TMJ"),
+    (2.63, 4, "Shoulder"),
+    (6.4, 2.5, "Elbow"),
+    (3, 2.1, "Hip"),
+    (7.5, 1.8, "Wrist"),
+    (4.2, 1.38, "Knee"),
+    (3.4, 1.065, "Foot"),
+    (1.41, 6.8, "Neck"),
+    (1.465, 1.075, "Ankle"),
+    (1.395, 2.3, "Lumbar Spine"),
+    (1.350, 1.055, "Neuropathy"),
+    (1.25, 2.8, "Skin Condition"),
+    (1.50, 1.5, "Muscle Condition")
 ]
 
 RADIUS = 6
-selected_circle = None
-user_selections = {}
-body_part_selected = None
-
-# === MAIN WINDOW SETUP ===
-root = tk.Tk()
-root.title("Lumino Pro")
-root.attributes('-fullscreen', True)
-screen_width = root.winfo_screenwidth()
-screen_height = root.winfo_screenheight()
-app_width, app_height = int(screen_width * 0.9), int(screen_height * 0.9)
-root.geometry(f"{app_width}x{app_height}")
-root.grid_rowconfigure(0, weight=1)
-root.grid_columnconfigure(1, weight=1)
-
-# === RIGHT FRAME ===
-right_frame = tk.Frame(root, bg="#2e2e2e", width=int(app_width * 0.35))
-right_frame.grid(row=0, column=0, padx=5, pady=20, sticky="nsew")
-right_frame.grid_propagate(False)
-
-img = Image.open(image_path)
-img_ratio = img.width / img.height
-img_height_final = min(int(app_height * 0.8), int(app_width * 0.35 / img_ratio))
-img_width_final = int(img_height_final * img_ratio)
-if img_width_final > int(app_width * 0.35):
-    img_width_final = int(app_width * 0.35)
-    img_height_final = int(img_width_final / img_ratio)
-img_resized = img.resize((img_width_final, img_height_final), Image.Resampling.LANCZOS)
-photo = ImageTk.PhotoImage(img_resized)
-
-canvas = tk.Canvas(right_frame, width=img_width_final, height=img_height_final,
-                   bg="#2e2e2e", highlightthickness=0)
-canvas.grid(row=0, column=0, sticky="nsew")
-canvas.create_image(0, 0, anchor="nw", image=photo)
-
-x_scale = img_width_final / widthimg
-y_scale = img_height_final / heightimg
-
-def on_point_click(label):
-    global selected_circle, body_part_selected
-
-    for item in canvas.find_withtag("clickable_point"):
-        canvas.itemconfig(item, fill="red", outline="red")
-
-    selected_tag = f"point_{label}"
-    for item in canvas.find_withtag(selected_tag):
-        canvas.itemconfig(item, fill="green", outline="green")
-        selected_circle = item
-
-    body_part_selected = label
-    save_button.config(state="normal")
-    for btn in input_buttons:
-        btn.config(state="normal")
-
-def on_enter():
-    global user_selections
-
-    if not body_part_selected:
-        messagebox.showwarning("Warning", "Please select a body part first.")
-        return
-
-    user_selections = {headers[i]: selected_vars[i].get() for i in range(len(headers))}
-
-    condition = user_selections["Condition"].lower()
-    body_part = body_part_selected.lower()
-
-    if body_part in therapy_data and condition in therapy_data[body_part]:
-        filtered = therapy_data[body_part][condition]
-    else:
-        messagebox.showwarning("No Data", f"No data for condition: {user_selections['Condition']} in {body_part_selected}")
-        return
-
-    all_data = {
-        "User Selections": user_selections,
-        "Body Part": body_part_selected,
-        "Therapy Data": filtered
-    }
-
-    try:
-        with open(temp_json_path, "w") as f:
-            json.dump(all_data, f, indent=2)
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to save data:\n{e}")
-        return
-
-    try:
-        subprocess.Popen(["python", therapy_script])
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to open therapy.py:\n{e}")
-
-# Draw points
-for x_orig, y_orig, label in points:
-    x = x_orig * x_scale
-    y = y_orig * y_scale
-    tag = f"point_{label}"
-    canvas.create_oval(x - RADIUS, y - RADIUS, x + RADIUS, y + RADIUS,
-                       fill="red", outline="red", tags=("clickable_point", tag))
-    canvas.create_text(x + RADIUS + 5, y, anchor="w", text=label,
-                       fill="white", font=("Arial", 8, "bold"))
-    canvas.tag_bind(tag, "<Button-1>", lambda event, lbl=label: on_point_click(lbl))
-
-# === LEFT FRAME ===
-left_frame = tk.Frame(root, bg="#2e2e2e")
-left_frame.grid(row=0, column=1, padx=10, pady=20, sticky="nsew")
-left_frame.grid_rowconfigure(0, weight=1)
-left_frame.grid_columnconfigure(0, weight=1)
-
-container = tk.Frame(left_frame, bg="#2e2e2e")
-container.grid(row=0, column=0, sticky="nsew")
-container.grid_columnconfigure(0, weight=1)
-
-tk.Label(container, text="Lumino Pro", font=("Arial", 20, "bold"), fg="red", bg="#2e2e2e")\
-    .grid(row=0, column=0, columnspan=6, pady=(0, 10))
 
 headers = ["Condition", "Size", "Area", "Skin Tone"]
 options = [["Acute", "Subacute", "Chronic"],
            ["Small", "Medium", "Large"],
            ["25cm2", "75cm2", "150cm2"],
            ["Light", "Tan", "Dark"]]
-
-selected_vars = [tk.StringVar(value=opts[0]) for opts in options]
 header_colors = ["#1E90FF", "#00CED1", "#32CD32", "#FF8C00"]
 option_bg_colors = ["#B0C4DE", "#AFEEEE", "#90EE90", "#FFDAB9"]
-input_buttons = []
-
-grid_frame = tk.Frame(container, bg="#2e2e2e")
-grid_frame.grid(row=1, column=0, pady=10)
-
-for row_idx, header in enumerate(headers):
-    tk.Label(grid_frame, text=header, font=("Arial", 10, "bold"), width=12,
-             bg=header_colors[row_idx], fg="black", relief="ridge", padx=5, pady=5)\
-        .grid(row=row_idx, column=0, padx=2, pady=2, sticky="w")
-
-    for col_idx, option in enumerate(options[row_idx]):
-        rb = tk.Radiobutton(grid_frame, text=option, variable=selected_vars[row_idx], value=option,
-                            bg=option_bg_colors[row_idx], fg="black", indicatoron=0, width=12,
-                            selectcolor="#FFD700", font=("Arial", 10, "bold"), relief="ridge")
-        rb.grid(row=row_idx, column=col_idx + 1, padx=2, pady=2)
-        rb.config(state="disabled")
-        input_buttons.append(rb)
-
-# SAVE button
-save_button = tk.Button(container, text="START", font=("Arial", 12, "bold"),
-                        bg="orange", fg="white", padx=20, pady=10, command=on_enter)
-save_button.grid(row=2, column=0, pady=20)
-save_button.config(state="disabled")
-
-# === SIDEBAR ===
-sidebar = tk.Frame(root, bg="gray20")
-sidebar.grid(row=0, column=2, padx=10, pady=20, sticky="ns")
-scale_factor = app_width / 1300
-create_sidebar_buttons(sidebar, scale_factor, root)
+
+
+class AutoModePage:
+    def __init__(self, root, router):
+        self.root = root
+        self.selected_circle = None
+        self.user_selections = {}
+        self.body_part_selected = None
+
+        # === MAIN WINDOW SETUP ===
+        app_width, app_height = int(router.width * 0.9), int(router.height * 0.9)
+        root.grid_rowconfigure(0, weight=1)
+        root.grid_columnconfigure(1, weight=1)
+
+        # === RIGHT FRAME ===
+        right_frame = tk.Frame(root, bg="#2e2e2e", width=int(app_width * 0.35))
+        right_frame.grid(row=0, column=0, padx=5, pady=20, sticky="nsew")
+        right_frame.grid_propagate(False)
+
+        widthimg, heightimg = image_cache.source_size(image_path)
+        img_ratio = widthimg / heightimg
+        img_height_final = min(int(app_height * 0.8), int(app_width * 0.35 / img_ratio))
+        img_width_final = int(img_height_final * img_ratio)
+        if img_width_final > int(app_width * 0.35):
+            img_width_final = int(app_width * 0.35)
+            img_height_final = int(img_width_final / img_ratio)
+        self.photo = image_cache.load_resized_async(image_path, (img_width_final, img_height_final))
+
+        self.canvas = tk.Canvas(right_frame, width=img_width_final, height=img_height_final,
+                                bg="#2e2e2e", highlightthickness=0)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.canvas.create_image(0, 0, anchor="nw", image=self.photo)
+
+        x_scale = img_width_final / widthimg
+        y_scale = img_height_final / heightimg
+
+        # Draw points
+        for x_div, y_div, label in POINT_DIVISORS:
+            x = widthimg / x_div * x_scale
+            y = heightimg / y_div * y_scale
+            tag = f"point_{label}"
+            self.canvas.create_oval(x - RADIUS, y - RADIUS, x + RADIUS, y + RADIUS,
+                                    fill="red", outline="red", tags=("clickable_point", tag))
+            self.canvas.create_text(x + RADIUS + 5, y, anchor="w", text=label,
+                                    fill="white", font=("Arial", 8, "bold"))
+            self.canvas.tag_bind(tag, "<Button-1>", lambda event, lbl=label: self.on_point_click(lbl))
+
+        # === LEFT FRAME ===
+        left_frame = tk.Frame(root, bg="#2e2e2e")
+        left_frame.grid(row=0, column=1, padx=10, pady=20, sticky="nsew")
+        left_frame.grid_rowconfigure(0, weight=1)
+        left_frame.grid_columnconfigure(0, weight=1)
+
+        container = tk.Frame(left_frame, bg="#2e2e2e")
+        container.grid(row=0, column=0, sticky="nsew")
+        container.grid_columnconfigure(0, weight=1)
+
+        tk.Label(container, text="Lumino Pro", font=("Arial", 20, "bold"), fg="red", bg="#2e2e2e")\
+            .grid(row=0, column=0, columnspan=6, pady=(0, 10))
+
+        self.selected_vars = [tk.StringVar(value=opts[0]) for opts in options]
+        self.input_buttons = []
+        self.stage_buttons = {}
+
+        grid_frame = tk.Frame(container, bg="#2e2e2e")
+        grid_frame.grid(row=1, column=0, pady=10)
+
+        for row_idx, header in enumerate(headers):
+            tk.Label(grid_frame, text=header, font=("Arial", 10, "bold"), width=12,
+                     bg=header_colors[row_idx], fg="black", relief="ridge", padx=5, pady=5)\
+                .grid(row=row_idx, column=0, padx=2, pady=2, sticky="w")
+
+            for col_idx, option in enumerate(options[row_idx]):
+                rb = tk.Radiobutton(grid_frame, text=option, variable=self.selected_vars[row_idx], value=option,
+                                    bg=option_bg_colors[row_idx], fg="black", indicatoron=0, width=12,
+                                    selectcolor="#FFD700", font=("Arial", 10, "bold"), relief="ridge")
+                rb.grid(row=row_idx, column=col_idx + 1, padx=2, pady=2)
+                rb.config(state="disabled")
+                self.input_buttons.append(rb)
+                if header == "Condition":
+                    self.stage_buttons[option] = rb
+
+        # SAVE button
+        self.save_button = tk.Button(container, text="START", font=("Arial", 12, "bold"),
+                                     bg="orange", fg="white", padx=20, pady=10, command=self.on_enter)
+        self.save_button.grid(row=2, column=0, pady=20)
+        self.save_button.config(state="disabled")
+
+        # === SIDEBAR ===
+        sidebar = tk.Frame(root, bg="gray20")
+        sidebar.grid(row=0, column=2, padx=10, pady=20, sticky="ns")
+        scale_factor = app_width / 1300
+        create_sidebar_buttons(sidebar, scale_factor, root)
+
+        protocol_db.add_listener(self.on_protocols_changed)
+
+    def close(self):
+        protocol_db.remove_listener(self.on_protocols_changed)
+
+    def on_protocols_changed(self, changed_body_parts):
+        if self.body_part_selected and protocol_db.auto_changed(changed_body_parts):
+            self.update_stage_buttons()
+
+    def update_stage_buttons(self):
+        """Only offers the stages the protocol data has for the selected body part."""
+        stages = protocol_db.auto_stages(self.body_part_selected)
+        for stage, rb in self.stage_buttons.items():
+            rb.config(state="normal" if stage in stages else "disabled")
+        stage_var = self.selected_vars[headers.index("Condition")]
+        if stages and stage_var.get() not in stages:
+            stage_var.set(stages[0])
+
+    def on_point_click(self, label):
+        for item in self.canvas.find_withtag("clickable_point"):
+            self.canvas.itemconfig(item, fill="red", outline="red")
+
+        selected_tag = f"point_{label}"
+        for item in self.canvas.find_withtag(selected_tag):
+            self.canvas.itemconfig(item, fill="green", outline="green")
+            self.selected_circle = item
+
+        self.body_part_selected = label
+        self.save_button.config(state="normal")
+        for btn in self.input_buttons:
+            btn.config(state="normal")
+        self.update_stage_buttons()
+
+    def on_enter(self):
+        if not self.body_part_selected:
+            messagebox.showwarning("Warning", "Please select a body part first.")
+            return
+
+        self.user_selections = {headers[i]: self.selected_vars[i].get() for i in range(len(headers))}
+
+        protocol = protocol_db.auto_protocol(self.body_part_selected, self.user_selections["Condition"])
+        if protocol is None:
+            messagebox.showwarning("No Data", f"No data for condition: {self.user_selections['Condition']} in {self.body_part_selected}")
+            return
+        filtered = protocol_db.therapy_data(protocol)
+
+        all_data = {
+            "User Selections": self.user_selections,
+            "Body Part": self.body_part_selected,
+            "Therapy Data": filtered
+        }
+
+        try:
+            version = selection_handoff.publish(all_data)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save data:\n{e}")
+            return
+
+        # Launching the monitor happens in the background; a failure is reported over this screen
+        selection_handoff.show(all_data, version, self)
+
+
+screen_router.register_screen("auto", AutoModePage, title="Lumino Pro")
 
 # === START ===
-root.mainloop()
+if __name__ == "__main__":
+    screen_router.run("auto")
@@ -0,0 +1,55 @@
+import tkinter as tk
+import os
+import sys
+import time
+import image_cache
+
+# === Cold vs warm timing for the resized image cache ===
+# Usage: python bench_image_cache.py [image ...]
+# Defaults to every PNG in the shared "image" folder, resized the way the
+# body-part screens do it at the current screen resolution.
+
+IMAGE_DIR = os.path.join(os.path.dirname(image_cache.BASE_DIR), "image")
+WARM_RUNS = 5
+
+
+def time_load(path, size):
+    start = time.perf_counter()
+    image_cache.read_resized(path, size)  # Bypasses the in-process registry
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    paths = sys.argv[1:]
+    if not paths and os.path.isdir(IMAGE_DIR):
+        paths = [os.path.join(IMAGE_DIR, name) for name in sorted(os.listdir(IMAGE_DIR))
+                 if name.lower().endswith(".png")]
+    if not paths:
+        print(f"No images given and none found in {IMAGE_DIR}")
+        return
+
+    root = tk.Tk()
+    root.withdraw()
+    scale_factor = min(root.winfo_screenwidth() / 1300, root.winfo_screenheight() / 750)
+    target = (int(530 * scale_factor), int(700 * scale_factor))
+
+    print(f"{'image':<30}{'size':>12}{'cold ms':>10}{'warm ms':>10}{'speedup':>10}")
+    total_cold = total_warm = 0.0
+    for path in paths:
+        size = image_cache.fit_size(path, *target)
+        cached = image_cache.find_cached(image_cache.cache_path(path, size, image_cache.Image.Resampling.LANCZOS))
+        if cached is not None:
+            os.remove(cached)
+
+        cold = time_load(path, size)
+        warm = min(time_load(path, size) for _ in range(WARM_RUNS))
+        total_cold += cold
+        total_warm += warm
+        print(f"{os.path.basename(path):<30}{f'{size[0]}x{size[1]}':>12}{cold:>10.1f}{warm:>10.1f}{cold / warm:>9.1f}x")
+
+    print(f"{'total':<30}{'':>12}{total_cold:>10.1f}{total_warm:>10.1f}{total_cold / total_warm:>9.1f}x")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
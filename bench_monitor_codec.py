@@ -0,0 +1,55 @@
+import json
+import sys
+import time
+import monitor_codec
+
+# === Encode/decode throughput: binary schema vs the JSON path ===
+# Usage: python bench_monitor_codec.py [iterations]
+# Times a full parameter snapshot and a typical one-field patch, the way
+# monitor_protocol encodes payloads (compact json.dumps + UTF-8) and decodes them.
+
+ITERATIONS = 200000
+SNAPSHOT = {
+    "command": "update_parameters", "seq": 1, "snapshot": True, "master_power": 10,
+    "wavelengths": {"808nm": {"enabled": True, "power_percent": 50}, "980nm": {"enabled": False, "power_percent": 0},
+                    "1064nm": {"enabled": True, "power_percent": 100}},
+    "mode": "Pulse", "pulse_type": "Frequency", "pulse_duration": 0.01, "frequency": 10, "set_power": 4.5,
+    "set_energy": 1200, "set_time_min": 4.44, "therapy_end_time": 1700000000.5, "delivery_mode": "Hand Probe",
+}
+PATCH = {"command": "update_parameters", "seq": 2, "therapy_end_time": 1700000030.5}
+
+
+def json_encode(message):
+    return json.dumps(message, separators=(",", ":")).encode("utf-8")
+
+
+def json_decode(payload):
+    return json.loads(payload.decode("utf-8"))
+
+
+def same(decoded, message):
+    """Equal, and every value has the type it was sent with (1200 must not come back as 1200.0)."""
+    return decoded == message and all(type(decoded[k]) is type(message[k]) for k in message)
+
+
+def rate(func, arg, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(arg)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else ITERATIONS
+    print(f"{'message':<10}{'codec':<8}{'bytes':>7}{'encode/s':>12}{'decode/s':>12}")
+    for label, message in (("snapshot", SNAPSHOT), ("patch", PATCH)):
+        for codec, encode, decode in (("json", json_encode, json_decode),
+                                      ("binary", monitor_codec.encode, monitor_codec.decode)):
+            payload = encode(message)
+            assert same(decode(payload), message)
+            print(f"{label:<10}{codec:<8}{len(payload):>7}{rate(encode, message, iterations):>12.0f}"
+                  f"{rate(decode, payload, iterations):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
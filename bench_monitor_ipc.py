@@ -0,0 +1,189 @@
+import argparse
+import heapq
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# === IPC load test: controller send path -> stand-in monitor ===
+# Usage: python bench_monitor_ipc.py [--rates 10,100,1000,0] [--sizes patch,full,1k,16k]
+#                                    [--seconds 2] [--json] [--transport unix|tcp]
+# Needs no display. The sending side is the controller's real MonitorLink, the
+# receiving side the monitor's real MonitorServer and TkInbox, with a small
+# thread standing in for the Tk event loop. Rate 0 sends as fast as possible.
+# Latency is measured from MonitorLink.send() to the message being applied on
+# the stand-in Tk thread; messages merged by the inbox count as delivered but
+# have no latency sample, and so do patches the link merged into a snapshot
+# when its queue was full ("merged"). Like the therapy screen, the sender answers a resync
+# request with a fresh snapshot. CPU time covers both sides (one process).
+
+# Keep away from a monitor that may be running on this machine
+os.environ.setdefault("XDG_RUNTIME_DIR", tempfile.mkdtemp(prefix="lumino_bench_"))
+import monitor_link
+import monitor_server
+import monitor_transport
+import tk_inbox
+
+RATES = "10,100,1000,10000,0"
+SIZES = "patch,full,1k,16k"
+FULL = {
+    "master_power": 10, "mode": "Pulse", "pulse_type": "Frequency", "pulse_duration": 0.01, "frequency": 10,
+    "set_power": 4.5, "set_energy": 1200.0, "set_time_min": 4.44, "delivery_mode": "Hand Probe",
+    "wavelengths": {"808nm": {"enabled": True, "power_percent": 50}, "980nm": {"enabled": False, "power_percent": 0},
+                    "1064nm": {"enabled": True, "power_percent": 100}},
+}
+DRAIN_TIMEOUT_SEC = 5.0
+
+
+class HeadlessTk:
+    """Just enough of a Tk widget for TkInbox: after() callbacks run on one thread, in due order."""
+
+    def __init__(self):
+        self._timers = []
+        self._count = 0
+        self._cond = threading.Condition()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def after(self, ms, func, *args):
+        with self._cond:
+            self._count += 1
+            heapq.heappush(self._timers, (time.monotonic() + ms / 1000, self._count, func, args))
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._timers or self._timers[0][0] > time.monotonic():
+                    self._cond.wait(self._timers[0][0] - time.monotonic() if self._timers else None)
+                _, _, func, args = heapq.heappop(self._timers)
+            func(*args)
+
+
+class Step:
+    def __init__(self):
+        self.sent_at = {}        # seq -> perf_counter() at send()
+        self.delivered = set()
+        self.latencies = []
+
+
+def message_for(size, seq):
+    message = {"command": "update_parameters", "seq": seq, "therapy_end_time": 1700000000.0 + seq}
+    if size != "patch":
+        message.update(FULL)
+    if size.endswith("k"):
+        message["note"] = "x" * (int(size[:-1]) * 1024)  # Not in the binary schema, so this goes as JSON
+    return message
+
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] if samples else float("nan")
+
+
+def run_step(state, rate, size, seconds, allow_binary):
+    step = state["step"] = Step()
+    link = monitor_link.MonitorLink(allow_binary=allow_binary)
+    deadline = time.monotonic() + DRAIN_TIMEOUT_SEC
+    while not link.connected and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+    snapshot = dict(message_for("patch", 0), snapshot=True, **FULL)
+    step.sent_at[0] = time.perf_counter()
+    link.send(snapshot)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    end = wall_start + seconds
+    seq = 0
+    while True:
+        now = time.perf_counter()
+        if now >= end:
+            break
+        if rate:
+            due = wall_start + seq / rate
+            if due > now:
+                time.sleep(due - now)
+        if any(reply.get("command") == "resync" for reply in link.received()):
+            seq += 1
+            step.sent_at[seq] = time.perf_counter()
+            link.send(dict(message_for("patch", seq), snapshot=True, **FULL))
+        seq += 1
+        step.sent_at[seq] = time.perf_counter()
+        link.send(message_for(size, seq))
+    sent = seq + 1
+
+    deadline = time.monotonic() + DRAIN_TIMEOUT_SEC
+    while len(step.delivered) + link.merged < sent and time.monotonic() < deadline:
+        if link.dropped and len(step.delivered) + link.merged + link.dropped >= sent:
+            break
+        time.sleep(0.01)
+    time.sleep(0.05)  # Let the last inbox drain run
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    link.close(terminate=False)
+
+    latencies = sorted(step.latencies)
+    return {
+        "sent": sent,
+        "delivered": len(step.delivered),
+        "merged": link.merged,
+        "dropped": max(0, sent - len(step.delivered) - link.merged),
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "msgs_per_s": len(step.delivered) / wall,
+        "cpu_us": cpu / max(1, sent) * 1e6,
+        "binary": link.binary,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the controller -> monitor IPC path headlessly.")
+    parser.add_argument("--rates", default=RATES, help="messages per second, comma separated; 0 = flat out")
+    parser.add_argument("--sizes", default=SIZES, help="patch, full, or NNk of JSON padding")
+    parser.add_argument("--seconds", type=float, default=2.0, help="duration of each step")
+    parser.add_argument("--json", action="store_true", help="do not negotiate the binary codec")
+    parser.add_argument("--transport", choices=("unix", "tcp"), help="force a transport (default: unix where available)")
+    parser.add_argument("--verbose", action="store_true", help="show the link and server log")
+    args = parser.parse_args(argv)
+    out = sys.stdout
+    if not args.verbose:
+        sys.stdout = open(os.devnull, "w")
+    if args.transport:
+        os.environ[monitor_transport.TRANSPORT_ENV] = args.transport
+
+    state = {"step": Step()}
+    applied = {"count": 0}
+
+    def on_deliver(message):
+        # Server loop thread: everything that made it through framing and sequencing
+        state["step"].delivered.add(message.get("seq"))
+        inbox.put(message)
+
+    def on_apply(message):
+        # Stand-in Tk thread
+        sent_at = state["step"].sent_at.get(message.get("seq"))
+        if sent_at is not None:
+            state["step"].latencies.append(time.perf_counter() - sent_at)
+        applied["count"] += 1
+
+    inbox = tk_inbox.TkInbox(HeadlessTk(), on_apply)
+    server = monitor_server.MonitorServer(on_deliver)
+    server.start()
+    if not server.ready.wait(DRAIN_TIMEOUT_SEC):
+        print("Stand-in monitor did not start listening", file=out)
+        return 1
+
+    print(f"{'rate/s':>8}{'size':>7}{'codec':>8}{'sent':>9}{'merged':>9}{'dropped':>9}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'msgs/s':>10}{'cpu us':>9}", file=out)
+    for size in args.sizes.split(","):
+        for rate in (int(r) for r in args.rates.split(",")):
+            result = run_step(state, rate, size, args.seconds, not args.json)
+            print(f"{rate or 'max':>8}{size:>7}{'binary' if result['binary'] else 'json':>8}{result['sent']:>9}"
+                  f"{result['merged']:>9}{result['dropped']:>9}{result['p50_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                  f"{result['msgs_per_s']:>10.0f}{result['cpu_us']:>9.1f}", file=out)
+    inbox_stats = inbox.stats()
+    print(f"garbled frames: {server.bad_messages}, resyncs requested: {server.resyncs}, "
+          f"merged by inbox: {inbox_stats['merged']}, peak inbox depth: {inbox_stats['max_depth']}", file=out)
+    return 1 if server.bad_messages else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import monitor_protocol
+
+# === Per-message latency of the controller -> monitor transports ===
+# Usage: python bench_monitor_transport.py [round trips]
+# Sends a typical update_parameters frame over each backend to an echo thread
+# and times the round trip, so both directions of the framing are included.
+
+ROUND_TRIPS = 20000
+MESSAGE = {"command": "update_parameters", "seq": 1, "set_power": 4.25, "set_energy": 1200.0,
+           "frequency": 10, "set_time_min": 5.0, "therapy_end_time": 1700000000.0}
+
+
+def echo(conn):
+    decoder = monitor_protocol.FrameDecoder()
+    with conn:
+        while True:
+            messages = decoder.read_from(conn)
+            if messages is None:
+                return
+            for message in messages:
+                conn.sendall(monitor_protocol.encode(message))
+
+
+def socketpair_backend():
+    client, server = socket.socketpair()
+    return client, server, None
+
+
+def listening_backend(family, address):
+    listener = socket.socket(family, socket.SOCK_STREAM)
+    listener.bind(address)
+    listener.listen(1)
+    client = socket.socket(family, socket.SOCK_STREAM)
+    client.connect(listener.getsockname())
+    server, _ = listener.accept()
+    return client, server, listener
+
+
+def measure(client, server, round_trips):
+    if client.family == socket.AF_INET:
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        server.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    threading.Thread(target=echo, args=(server,), daemon=True).start()
+    frame = monitor_protocol.encode(MESSAGE)
+    decoder = monitor_protocol.FrameDecoder(4096)
+    samples = []
+    for _ in range(round_trips):
+        start = time.perf_counter()
+        client.sendall(frame)
+        while not decoder.read_from(client):
+            pass
+        samples.append(time.perf_counter() - start)
+    client.close()
+    samples.sort()
+    return samples
+
+
+def main():
+    round_trips = int(sys.argv[1]) if len(sys.argv) > 1 else ROUND_TRIPS
+    backends = []
+    if hasattr(socket, "AF_UNIX"):
+        backends.append(("socketpair", socketpair_backend))
+        path = os.path.join(tempfile.mkdtemp(), "bench.sock")
+        backends.append(("unix", lambda: listening_backend(socket.AF_UNIX, path)))
+    backends.append(("tcp", lambda: listening_backend(socket.AF_INET, ("localhost", 0))))
+
+    print(f"{round_trips} round trips of a {len(monitor_protocol.encode(MESSAGE))}-byte frame")
+    print(f"{'transport':<12}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}{'msgs/s':>10}")
+    for name, open_backend in backends:
+        client, server, listener = open_backend()
+        samples = measure(client, server, round_trips)
+        if listener is not None:
+            listener.close()
+        mean = sum(samples) / len(samples)
+        print(f"{name:<12}{mean * 1e6:>10.1f}{samples[len(samples) // 2] * 1e6:>10.1f}"
+              f"{samples[int(len(samples) * 0.99)] * 1e6:>10.1f}{1 / mean:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import csv
+import os
+import random
+import shutil
+import sys
+import tempfile
+import protocol_compiler
+import protocol_file
+
+# === Protocol compiler benchmark ===
+# Usage: python bench_protocol_compiler.py [rows]
+# Builds a synthetic sheet (100k rows by default, every 20th BodyPart left
+# blank to exercise the forward fill) and times a full compile, a no-op
+# rebuild, a rebuild with 1% of the values edited (patched in place) and one
+# with rows inserted (rebuilt in full). Each rebuilt catalog is checked
+# byte for byte against a full compile of the same sheet.
+
+BODY_PARTS = ["Ankle", "Wrist", "Lumbar", "Foot", "Shoulder", "Elbow", "Hip", "Knee", "Neck", "Jaw", "Skin"]
+
+
+def write_sheet(path, row_count, seed=1):
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["BodyPart", "Ailment", "Power", "Frequency", "Avg Power",
+                         "Time_Acute", "Time_Subacute", "Time_Chronic",
+                         "TotalEnergy_Acute", "TotalEnergy_Subacute", "TotalEnergy_Chronic",
+                         "Size", "Area", "SkinTone"])
+        for i in range(row_count):
+            body_part = "" if i % 20 else rng.choice(BODY_PARTS)
+            writer.writerow([body_part, f"Ailment {i}", rng.choice([30, 40, 50, 60]), rng.choice([6000, 8000, 10000]),
+                             round(rng.uniform(1, 8), 2), round(rng.uniform(1, 6), 2), round(rng.uniform(4, 9), 2),
+                             round(rng.uniform(6, 13), 2), 1000, 1800, 2800,
+                             rng.choice(["Small", "Medium", "Large"]), rng.choice(["25cm2", "50cm2", "75cm2"]),
+                             rng.choice(["Fair", "Light", "Medium", "Tan", "Dark"])])
+
+
+def insert_rows(path, count, seed=3):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    rng = random.Random(seed)
+    for i in range(count):
+        row = list(rows[rng.randrange(1, len(rows))])
+        row[1] = f"Inserted {i}"
+        rows.insert(rng.randrange(2, len(rows)), row)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+
+
+def same_as_full(sheet, output):
+    reference = output + ".full"
+    protocol_compiler.compile_sheet(sheet, reference, incremental=False)
+    with open(output, "rb") as a, open(reference, "rb") as b:
+        return a.read() == b.read()
+
+
+def edit_rows(path, fraction, seed=2):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    rng = random.Random(seed)
+    for row in rng.sample(rows[1:], int((len(rows) - 1) * fraction)):
+        row[2] = str(int(row[2]) + 5)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+
+
+def report(label, stats):
+    written = "no" if not stats["written"] else f"patched {stats['patched']}" if stats["patched"] else "in full"
+    print(f"{label:<28}{stats['seconds'] * 1000:>10.0f} ms  parsed {stats['parsed']:>7}  reused {stats['reused']:>7}"
+          f"  written {written}")
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    work_dir = tempfile.mkdtemp(prefix="protocol_bench_")
+    try:
+        sheet = os.path.join(work_dir, "sheet.csv")
+        output = os.path.join(work_dir, "protocols.bin")
+        write_sheet(sheet, row_count)
+        print(f"Synthetic sheet: {row_count} rows, {os.path.getsize(sheet) / 1e6:.1f} MB")
+
+        report("full compile", protocol_compiler.compile_sheet(sheet, output, incremental=False))
+        report("no-op rebuild", protocol_compiler.compile_sheet(sheet, output))
+        edit_rows(sheet, 0.01)
+        report("1% of values edited", protocol_compiler.compile_sheet(sheet, output))
+        print(f"  matches a full compile: {same_as_full(sheet, output)}")
+        insert_rows(sheet, 10)
+        report("10 rows inserted", protocol_compiler.compile_sheet(sheet, output))
+        print(f"  matches a full compile: {same_as_full(sheet, output)}")
+
+        catalog = protocol_file.ProtocolFile(output)
+        print(f"Catalog: {len(catalog)} protocols, {os.path.getsize(output) / 1e6:.1f} MB")
+        catalog.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import sys
+import time
+import pulse_train
+
+# === Pulse train model benchmark ===
+# Usage: python bench_pulse_train.py [session seconds]
+# Times a full recompute (energy, on-time, pulse count, and the session length
+# for a target energy), which is what a settings change costs, for trains up
+# to 10 kHz over a 15 minute session. With NumPy installed, each result is also
+# checked against the train built pulse by pulse: every pulse's start and end,
+# clipped to the end of the session.
+
+SESSION_SEC = 15 * 60 + 0.00003  # Ends inside a pulse at the highest rates
+TRAINS = (
+    ("CW", pulse_train.PulseTrain(6.0)),
+    ("single 2s", pulse_train.PulseTrain(6.0, "Pulse", "Single", 2.0)),
+    ("10 Hz", pulse_train.PulseTrain(6.0, "Pulse", "Frequency", 0.03, 10)),
+    ("1 kHz", pulse_train.PulseTrain(6.0, "Pulse", "Frequency", 0.0004, 1000)),
+    ("10 kHz", pulse_train.PulseTrain(6.0, "Pulse", "Frequency", 0.00005, 10000)),
+)
+ITERATIONS = 20000
+
+
+def reference(train, session_sec):
+    """(energy J, pulses) summed over the explicit pulse schedule."""
+    np = pulse_train.np
+    if train.mode == "CW":
+        starts, width = np.zeros(1), session_sec
+    elif train.pulse_type == "Single":
+        starts, width = np.zeros(1), train.pulse_duration
+    else:
+        starts = np.arange(int(session_sec * train.frequency) + 1) / train.frequency
+        starts = starts[starts < session_sec]
+        width = min(train.pulse_duration, 1 / train.frequency)
+    on = np.minimum(starts + width, session_sec) - starts
+    return train.peak_w * float(on.sum()), len(starts)
+
+
+def recompute(train, session_sec):
+    summary = train.summary(session_sec)
+    train.time_for_energy(summary["energy_j"])
+    return summary
+
+
+def main():
+    session_sec = float(sys.argv[1]) if len(sys.argv) > 1 else SESSION_SEC
+    checked = pulse_train.np is not None
+    print(f"{'train':<11}{'pulses':>11}{'energy J':>14}{'recompute us':>14}{'check':>8}")
+    for label, train in TRAINS:
+        summary = recompute(train, session_sec)
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            recompute(train, session_sec)
+        per_call_us = (time.perf_counter() - start) / ITERATIONS * 1e6
+        verdict = "-"
+        if checked:
+            energy, pulses = reference(train, session_sec)
+            ok = pulses == summary["pulses"] and abs(energy - summary["energy_j"]) <= 1e-6 * max(1.0, energy)
+            verdict = "ok" if ok else f"MISMATCH ({pulses} pulses, {energy:.6f} J)"
+        print(f"{label:<11}{summary['pulses']:>11,}{summary['energy_j']:>14.6f}{per_call_us:>14.2f}{verdict:>8}")
+    if not checked:
+        print("NumPy is not installed: results were not checked against the explicit schedule")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from array import array
+
+# === Per-wavelength dose ===
+# Power, on-time and delivered energy of each diode over a session, kept in one
+# flat array of doubles:
+#
+#   [duty, power W x N, on-time s x N, energy J x N]     N = len(WAVELENGTHS)
+#
+# Power is each channel's average output. `duty` is the fraction of the session
+# the diodes are on, as the pulse train's on_time() gives it (so a single pulse
+# is on for all of its session, which ends with the pulse). A channel is "on"
+# for `duty` of every second it runs at a power above zero. advance()
+# accounts for a stretch of constant settings in O(N), so the controller only
+# calls it when a setting changes or when it writes telemetry. The array goes
+# into the session telemetry block as it is (see session_telemetry.py), so the
+# monitor gets the per-channel totals with the rest of the session state.
+
+WAVELENGTHS = ("808nm", "980nm", "1064nm")
+N = len(WAVELENGTHS)
+DUTY, POWER, ON, ENERGY = 0, 1, 1 + N, 1 + 2 * N
+SIZE = 1 + 3 * N
+ITEM_SIZE = array("d").itemsize
+
+
+class ChannelDose:
+    def __init__(self, values=None):
+        self.values = array("d", values) if values is not None else array("d", bytes(SIZE * ITEM_SIZE))
+
+    @classmethod
+    def from_bytes(cls, data):
+        dose = cls()
+        dose.values = array("d")
+        dose.values.frombytes(data)
+        return dose
+
+    def copy(self):
+        return ChannelDose(self.values)
+
+    def set_power(self, powers_w, duty=1.0):
+        """New settings from now on: average power per channel (WAVELENGTHS order) and the duty cycle."""
+        values = self.values
+        values[DUTY] = float(duty)
+        for i, power in enumerate(powers_w):
+            values[POWER + i] = float(power)
+
+    def advance(self, seconds):
+        """Accounts for `seconds` run at the current settings."""
+        if seconds <= 0:
+            return
+        values = self.values
+        on = values[DUTY] * seconds
+        for i in range(N):
+            power = values[POWER + i]
+            if power > 0:
+                values[ON + i] += on
+                values[ENERGY + i] += power * seconds
+
+    def advanced(self, seconds):
+        """A copy brought forward by `seconds`; this one is left as it is."""
+        dose = self.copy()
+        dose.advance(seconds)
+        return dose
+
+    @property
+    def energy_j(self):
+        return tuple(self.values[ENERGY:ENERGY + N])
+
+    @property
+    def on_time_s(self):
+        return tuple(self.values[ON:ON + N])
+
+    @property
+    def power_w(self):
+        return tuple(self.values[POWER:POWER + N])
+
+    def totals(self):
+        """{"808nm": {"power_w", "on_time_s", "energy_j"}, ...}"""
+        values = self.values
+        return {wl: {"power_w": values[POWER + i], "on_time_s": values[ON + i], "energy_j": values[ENERGY + i]}
+                for i, wl in enumerate(WAVELENGTHS)}
+
+    def describe(self):
+        """One line for status text and logs, e.g. "808nm 120.0 J, 980nm 0.0 J, 1064nm 240.0 J"."""
+        return ", ".join(f"{wl} {energy:.1f} J" for wl, energy in zip(WAVELENGTHS, self.energy_j))
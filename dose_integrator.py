@@ -0,0 +1,104 @@
+import time
+
+# === Delivered dose on the monotonic clock ===
+# Power only changes at discrete moments: a parameter update, a pause, a
+# resume. So the dose is a sum of constant-power segments. A segment is banked
+# (energy and run time) when it closes. The open segment is its power times
+# its run time so far, so every query is O(1) however many segments there
+# were, and a power change only prices the time after it. Times come from
+# time.monotonic(), so wall-clock steps (NTP, DST, a user changing the clock)
+# do not move the dose.
+#
+# Callers may pass `now` to evaluate several values at the same instant.
+
+
+class DoseIntegrator:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.reset()
+
+    def reset(self, power_w=0.0, target_j=0.0, duration_sec=0.0):
+        """Forgets the session and sets up a new one, paused at zero."""
+        self.power_w = float(power_w)
+        self.target_j = float(target_j)
+        self.duration_sec = float(duration_sec)
+        self._banked_sec = 0.0
+        self._banked_j = 0.0
+        self._segment_start = None     # Clock time the open segment began; None while paused
+
+    @property
+    def running(self):
+        return self._segment_start is not None
+
+    def _open_run(self, now):
+        """Run time of the open segment, stopping at the end of the session."""
+        if self._segment_start is None:
+            return 0.0
+        run = max(0.0, now - self._segment_start)
+        if self.duration_sec > 0:
+            run = min(run, max(0.0, self.duration_sec - self._banked_sec))
+        return run
+
+    def _close_segment(self, now):
+        run = self._open_run(now)
+        if run > 0:
+            self._banked_sec += run
+            self._banked_j += self.power_w * run
+
+    # --- Control ---
+
+    def resume(self, now=None):
+        if self._segment_start is None:
+            self._segment_start = self.clock() if now is None else now
+
+    def pause(self, now=None):
+        if self._segment_start is not None:
+            self._close_segment(self.clock() if now is None else now)
+            self._segment_start = None
+
+    def set_power(self, power_w, now=None):
+        """Changes the power from `now` on; energy already delivered keeps its old price."""
+        power_w = float(power_w)
+        if power_w == self.power_w:
+            return
+        if self._segment_start is not None:
+            now = self.clock() if now is None else now
+            self._close_segment(now)
+            self._segment_start = now
+        self.power_w = power_w
+
+    def set_duration(self, duration_sec, now=None):
+        if self._segment_start is not None:
+            # Bank what ran under the old duration before the cap moves
+            now = self.clock() if now is None else now
+            self._close_segment(now)
+            self._segment_start = now
+        self.duration_sec = float(duration_sec)
+
+    # --- Queries ---
+
+    def elapsed(self, now=None):
+        return self._banked_sec + self._open_run(self.clock() if now is None else now)
+
+    def delivered(self, now=None):
+        """Joules delivered so far."""
+        return self._banked_j + self.power_w * self._open_run(self.clock() if now is None else now)
+
+    def remaining_time(self, now=None):
+        return max(0.0, self.duration_sec - self.elapsed(now))
+
+    def remaining_energy(self, now=None):
+        return max(0.0, self.target_j - self.delivered(now))
+
+    def projected_end(self, now=None):
+        """Clock time the target dose is reached at the current power, or None if it never is.
+
+        While paused this assumes the session resumes at `now`.
+        """
+        now = self.clock() if now is None else now
+        remaining = self.remaining_energy(now)
+        if remaining <= 0:
+            return now
+        if self.power_w <= 0:
+            return None
+        return now + remaining / self.power_w
@@ -0,0 +1,156 @@
+import tkinter as tk
+from PIL import Image, ImageTk
+import hashlib
+import os
+import threading
+import photo_registry
+import screen_router
+
+# === On-disk cache of resized images ===
+# The anatomy and body-part PNGs are large and LANCZOS-resizing them costs far
+# more than showing the result. The resized copy is written once per source
+# file, target size and filter, in a format Tk decodes natively (PPM, or an
+# uncompressed PNG when the image has transparency), so a repeat visit loads it
+# straight into a PhotoImage without PIL touching the pixels. Within the
+# process the PhotoImages themselves are shared through photo_registry.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "image_cache")
+
+# Shown while an image is still being decoded (same gray as the error fallback)
+PLACEHOLDER_COLOR = "#808080"
+
+
+def source_size(path):
+    """Returns (width, height) of an image by reading only its header."""
+    with Image.open(path) as img:
+        return img.size
+
+
+def fit_size(path, max_width, max_height):
+    """Largest size that fits the image into max_width x max_height, keeping its ratio."""
+    original_width, original_height = source_size(path)
+    ratio = min(max_width / original_width, max_height / original_height)
+    return int(original_width * ratio), int(original_height * ratio)
+
+
+def cache_path(path, size, resample):
+    """Cache file for `path` resized to `size`. Changes whenever the source file does."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = f"{path}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}|{int(resample)}"
+    name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, name)
+
+
+def find_cached(base):
+    for ext in (".ppm", ".png"):
+        if os.path.exists(base + ext):
+            return base + ext
+    return None
+
+
+def _store(base, img):
+    """Writes the resized image atomically so a half-written file is never read back."""
+    has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+    if has_alpha:
+        img, ext, options = img.convert("RGBA"), ".png", {"compress_level": 0}
+    else:
+        img, ext, options = img.convert("RGB"), ".ppm", {}
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{base}.{os.getpid()}.tmp"
+    try:
+        img.save(tmp_path, format=ext[1:].upper(), **options)
+        os.replace(tmp_path, base + ext)
+    except OSError as e:
+        print(f"DEBUG: Could not write image cache {base + ext}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_resized(path, size, resample=Image.Resampling.LANCZOS):
+    """Creates a new PhotoImage of `path` resized to `size`, using the disk cache when possible."""
+    size = (max(1, int(size[0])), max(1, int(size[1])))
+    base = cache_path(path, size, resample)
+
+    cached = find_cached(base)
+    if cached is not None:
+        try:
+            return tk.PhotoImage(file=cached)
+        except tk.TclError as e:
+            print(f"DEBUG: Discarding unreadable image cache {cached}: {e}")
+            os.remove(cached)
+
+    with Image.open(path) as img:
+        resized = img.resize(size, resample)
+    _store(base, resized)
+    return ImageTk.PhotoImage(resized)
+
+
+def load_resized(path, size, resample=Image.Resampling.LANCZOS):
+    """Returns the shared PhotoImage of `path` resized to `size`."""
+    size = (max(1, int(size[0])), max(1, int(size[1])))
+    key = cache_path(path, size, resample)
+    return photo_registry.get(key, lambda: read_resized(path, size, resample))
+
+
+def _decode_in_background(root, path, size, resample, base):
+    """Returns a gray placeholder and fills it with the resized image once a worker has made it."""
+    placeholder = tk.PhotoImage(width=size[0], height=size[1])
+    placeholder.put(PLACEHOLDER_COLOR, to=(0, 0, size[0], size[1]))
+
+    def swap_in(resized):
+        # PhotoImages may only be created on the Tk thread. Copying into the
+        # placeholder updates every widget already showing it.
+        photo = ImageTk.PhotoImage(resized)
+        placeholder.tk.call(str(placeholder), "copy", str(photo), "-compositingrule", "set")
+
+    def forget():
+        # Screens already showing the placeholder keep it, but later ones load the image afresh
+        photo_registry.discard(base, placeholder)
+
+    def work():
+        try:
+            with Image.open(path) as img:
+                resized = img.resize(size, resample)
+            _store(base, resized)
+        except Exception as e:
+            print(f"DEBUG: Background decode of {path} failed: {e}")
+            callback, args = forget, ()
+        else:
+            callback, args = swap_in, (resized,)
+        try:
+            root.after(0, callback, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # Window closed while we were decoding
+
+    threading.Thread(target=work, daemon=True).start()
+    return placeholder
+
+
+def load_resized_async(path, size, resample=Image.Resampling.LANCZOS):
+    """Like load_resized(), but a disk cache miss is decoded on a worker thread.
+
+    The returned PhotoImage already has its final size, so the layout does not
+    move when the real pixels arrive.
+    """
+    size = (max(1, int(size[0])), max(1, int(size[1])))
+    key = cache_path(path, size, resample)
+    router = screen_router.get_router()
+    if router is None or find_cached(key) is not None:
+        return load_resized(path, size, resample)
+    return photo_registry.get(key, lambda: _decode_in_background(router.root, path, size, resample, key))
+
+
+def load_original(path):
+    """Returns the shared PhotoImage of `path` at its original size."""
+    path = os.path.abspath(path)
+    key = (path, os.stat(path).st_mtime_ns, "original")
+    return photo_registry.get(key, lambda: tk.PhotoImage(file=path))
+
+
+def clear():
+    """Deletes every cached image."""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    for name in os.listdir(CACHE_DIR):
+        os.remove(os.path.join(CACHE_DIR, name))
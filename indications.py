@@ -1,6 +1,8 @@
 import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
+import screen_router
+import image_cache
 
 # Dummy sidebar function (replace with your own from neck_cervicalspine.py if you have it)
 def create_sidebar_buttons(sidebar, scale_factor, root=None):
@@ -30,7 +32,6 @@ def create_layout(root, anatomy_photo, scale_factor, title="Lumino Pro", scroll_
 
     root.grid_rowconfigure(1, weight=1)
     root.grid_columnconfigure(1, weight=1)
-    root.attributes('-fullscreen', True)
 
     # Title
     title_label = tk.Label(root, text=title, font=("Arial", int(24 * scale_factor), "bold"), fg="red", bg="gray20")
@@ -97,23 +98,19 @@ def create_layout(root, anatomy_photo, scale_factor, title="Lumino Pro", scroll_
     sidebar.grid(row=1, column=2, padx=10, pady=10, sticky="ne")
     create_sidebar_buttons(sidebar, scale_factor, root)
 
-def main():
-    root = tk.Tk()
-    root.title("Lumino Pro - Shoulder")
-
+def build_screen(root, router):
     screen_width = root.winfo_screenwidth()
     screen_height = root.winfo_screenheight()
     base_width, base_height = 1300, 700
     scale_factor = min(screen_width / base_width, screen_height / base_height)
 
-    root.geometry(f"{int(base_width * scale_factor)}x{int(base_height * scale_factor)}")
     root.configure(bg="gray20")
 
     # Replace this with your actual image path!
     anatomy_img_path = r"C:\Users\malvi\OneDrive\Desktop\project delhi\image\anatomy.png"
     try:
-        anatomy_img = Image.open(anatomy_img_path).resize((int(400 * scale_factor), int(500 * scale_factor)))
-        anatomy_photo = ImageTk.PhotoImage(anatomy_img)
+        anatomy_photo = image_cache.load_resized_async(anatomy_img_path, (int(400 * scale_factor), int(500 * scale_factor)),
+                                                       Image.Resampling.BICUBIC)
     except Exception as e:
         # If image not found, use a blank image
         anatomy_photo = ImageTk.PhotoImage(Image.new("RGB", (int(400 * scale_factor), int(500 * scale_factor)), "gray"))
@@ -131,7 +128,12 @@ def main():
         ]
     )
 
-    root.mainloop()
+    return anatomy_photo
+
+screen_router.register_screen("indications", build_screen, title="Lumino Pro - Shoulder")
+
+def main():
+    screen_router.run("indications")
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,6 @@
 import tkinter as tk
-import subprocess
-import sys
 import os
+import screen_router
 
 # ----- Universal Path Setup -----
 # Get the directory where this file is located
@@ -29,20 +28,18 @@ def navigate(action, current_file):
 
         if action == "Home":
             # Go to home page
-            subprocess.Popen([sys.executable, HOME_PAGE])
+            screen_router.navigate(screen_router.screen_for_script(HOME_PAGE))
         else:
             # Find the current index
             index = PAGE_PATHS.index(current_file)
 
             # Navigate to next page if it exists
             if action == "Next" and index < len(PAGE_PATHS) - 1:
-                subprocess.Popen([sys.executable, PAGE_PATHS[index + 1]])
+                screen_router.navigate(screen_router.screen_for_script(PAGE_PATHS[index + 1]))
 
             # Navigate to previous page if it exists
             elif action == "Back" and index > 0:
-                subprocess.Popen([sys.executable, PAGE_PATHS[index - 1]])
-
-        sys.exit()  # Close current window
+                screen_router.navigate(screen_router.screen_for_script(PAGE_PATHS[index - 1]))
     except Exception as e:
         print(f"Navigation Error: {e}")
 
@@ -90,12 +87,11 @@ def add_colored_acronym(parent):
         tk.Label(row_frame, text=rest, fg="black", bg="white", font=("Arial", 22, "bold")).pack(side="left")
 
 # ----- Main Page Class -----
-class LaserClassificationPage(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("Lumino Pro - Laser Classification")
-        self.attributes("-fullscreen", True)  # Fullscreen mode
+class LaserClassificationPage(tk.Frame):
+    def __init__(self, parent):
+        super().__init__(parent)
         self.configure(bg="white")
+        self.pack(fill="both", expand=True)
 
         # ---- Main Frame (Content) ----
         main_frame = tk.Frame(self, bg="white")
@@ -173,7 +169,9 @@ class LaserClassificationPage(tk.Tk):
         # Add navigation buttons to sidebar
         create_sidebar_buttons(sidebar, scale_factor=1.0, current_file=__file__)
 
+screen_router.register_screen("instruction_page1", lambda root, router: LaserClassificationPage(root),
+                              title="Lumino Pro - Laser Classification")
+
 # ----- Run the App -----
 if __name__ == "__main__":
-    app = LaserClassificationPage()
-    app.mainloop()
+    screen_router.run("instruction_page1")
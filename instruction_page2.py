@@ -1,8 +1,8 @@
 import tkinter as tk
 import os
-import sys
-import subprocess
-from PIL import Image, ImageTk  # For displaying anatomy image
+import screen_router
+import image_cache
+from PIL import Image  # For resampling the anatomy image
 
 # --- Universal Path Setup ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Current script directory
@@ -34,8 +34,7 @@ def navigate(current_file, direction):
         else:
             return  # Invalid direction or out of range
 
-        subprocess.Popen([sys.executable, next_path])
-        sys.exit()
+        screen_router.navigate(screen_router.screen_for_script(next_path))
     except Exception as e:
         print(f"Navigation error: {e}")
 
@@ -55,10 +54,8 @@ def create_sidebar_buttons(sidebar, current_file, scale_factor=1.0):
         btn.pack(pady=int(10 * scale_factor), padx=5)
 
 # --- Main GUI Layout ---
-def design_gui():
+def design_gui(root, router):
     current_file = os.path.abspath(__file__)
-    root = tk.Tk()
-    root.title("Lumino Pro - Power Calculation")
     root.attributes('-fullscreen', True)
 
     # Dynamic scaling
@@ -68,7 +65,6 @@ def design_gui():
     scale_factor = min(screen_width / base_width, screen_height / base_height)
     window_width = int(base_width * scale_factor)
     window_height = int(base_height * scale_factor)
-    root.geometry(f"{window_width}x{window_height}")
     root.configure(bg="#2f2f2f")
 
     # Sidebar
@@ -130,17 +126,16 @@ def design_gui():
     # Anatomy Image (Optional)
     image_path = os.path.join(BASE_DIR, "image", "anatomy.png")
     try:
-        temp_img = Image.open(image_path)
-        temp_img = temp_img.resize((int(220 * scale_factor), int(250 * scale_factor)))
-        photo = ImageTk.PhotoImage(temp_img)
+        photo = image_cache.load_resized(image_path, (int(220 * scale_factor), int(250 * scale_factor)),
+                                         Image.Resampling.BICUBIC)
         image_label = tk.Label(root, image=photo, bg="#2f2f2f")
         image_label.image = photo  # Keep a reference
         image_label.place(x=int(650 * scale_factor), y=int(310 * scale_factor))
     except FileNotFoundError:
         print(f"Image not found at {image_path}")
 
-    root.mainloop()
+screen_router.register_screen("instruction_page2", design_gui, title="Lumino Pro - Power Calculation")
 
 # --- Entry Point ---
 if __name__ == "__main__":
-    design_gui()
+    screen_router.run("instruction_page2")
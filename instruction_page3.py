@@ -1,7 +1,6 @@
 import tkinter as tk
 import os
-import sys
-import subprocess
+import screen_router
 
 # Automatically detect the current directory to make paths universal
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -32,8 +31,7 @@ def navigate(current_file, direction):
             next_path = home_path
         else:
             return
-        subprocess.Popen(["python", next_path])  # Launch next page
-        sys.exit()  # Exit current window
+        screen_router.navigate(screen_router.screen_for_script(next_path))
     except Exception as e:
         print(f"Navigation error: {e}")
 
@@ -53,17 +51,12 @@ def create_sidebar_buttons(sidebar, current_file, scale_factor=1.0):
         btn.pack(pady=int(10 * scale_factor), padx=5)
 
 # Main GUI function
-def draw_photo_biomodulation_gui():
+def draw_photo_biomodulation_gui(root, router):
     current_file = os.path.abspath(__file__)
-    root = tk.Tk()
-    root.title("Photo Bio-Modulation Therapy")
 
-    # Scale window to 95% of screen dimensions
+    # Scale the layout to 95% of the screen width
     screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
     window_width = int(screen_width * 0.95)
-    window_height = int(screen_height * 0.9)
-    root.geometry(f"{window_width}x{window_height}")
     root.configure(bg="#2f2f2f")
 
     # Main frame for content
@@ -123,9 +116,8 @@ def draw_photo_biomodulation_gui():
     # Add navigation buttons
     create_sidebar_buttons(sidebar, current_file, scale_factor=window_width / 1300)
 
-    # Run the GUI loop
-    root.mainloop()
+screen_router.register_screen("instruction_page3", draw_photo_biomodulation_gui, title="Photo Bio-Modulation Therapy")
 
 # Entry point
 if __name__ == "__main__":
-    draw_photo_biomodulation_gui()
+    screen_router.run("instruction_page3")
@@ -1,7 +1,6 @@
 import tkinter as tk
 import os
-import sys
-import subprocess
+import screen_router
 
 # Define relative paths instead of hardcoding absolute paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -28,8 +27,7 @@ def navigate(current_file, direction):
             next_path = home_path
         else:
             return  # Invalid direction or edge of list
-        subprocess.Popen(["python", next_path])  # Launch next script
-        sys.exit()  # Exit current script
+        screen_router.navigate(screen_router.screen_for_script(next_path))
     except Exception as e:
         print(f"Navigation error: {e}")
 
@@ -50,21 +48,16 @@ def create_sidebar_buttons(sidebar, current_file, scale_factor=1.0):
         )
         btn.pack(pady=int(10 * scale_factor), padx=5)
 
-def draw_bio_modulation_gui():
+def draw_bio_modulation_gui(root, router):
     """
     Main GUI rendering function.
     """
     current_file = os.path.abspath(__file__)
-    root = tk.Tk()
-    root.title("Photo Bio-Modulation Therapy")
     root.configure(bg="#2f2f2f")
 
     # Fullscreen scaling
     screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
     window_width = int(screen_width * 0.95)
-    window_height = int(screen_height * 0.9)
-    root.geometry(f"{window_width}x{window_height}")
 
     # Main content area
     content_frame = tk.Frame(root, bg="#2f2f2f")
@@ -121,7 +114,7 @@ def draw_bio_modulation_gui():
     scale_factor = window_width / 1300
     create_sidebar_buttons(sidebar, current_file, scale_factor=scale_factor)
 
-    root.mainloop()
+screen_router.register_screen("instruction_page4", draw_bio_modulation_gui, title="Photo Bio-Modulation Therapy")
 
 if __name__ == "__main__":
-    draw_bio_modulation_gui()
+    screen_router.run("instruction_page4")
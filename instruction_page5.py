@@ -1,7 +1,6 @@
 import tkinter as tk
 import os
-import sys
-import subprocess
+import screen_router
 
 # === UNIVERSAL RELATIVE PATH SETUP ===
 
@@ -47,9 +46,8 @@ def navigate(current_file, direction):
         else:
             return  # Out of range or invalid direction
 
-        # Open the target script and close the current one
-        subprocess.Popen([sys.executable, next_path])
-        sys.exit()
+        # Swap to the target page in place
+        screen_router.navigate(screen_router.screen_for_script(next_path))
 
     except Exception as e:
         print(f"Navigation Error: {e}")
@@ -82,22 +80,17 @@ def create_sidebar_buttons(sidebar, current_file, scale_factor=1.0):
 
 # === EXAMPLE: BIOLOGICAL EFFECTS GUI PAGE ===
 
-def draw_biological_effects_gui():
+def draw_biological_effects_gui(root, router):
     """
     Creates a full-screen GUI showing biological effects of light therapy.
     Includes a sidebar for navigation.
     """
     current_file = os.path.abspath(__file__)
-    root = tk.Tk()
-    root.title("Photo Bio-Modulation Therapy - Biological Effects")
     root.configure(bg="#2f2f2f")
 
     # Get screen size and scale layout
     screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
     window_width = int(screen_width * 0.95)
-    window_height = int(screen_height * 0.9)
-    root.geometry(f"{window_width}x{window_height}")
 
     # === MAIN CONTENT AREA ===
     content_frame = tk.Frame(root, bg="#2f2f2f")
@@ -139,8 +132,8 @@ def draw_biological_effects_gui():
     scale_factor = window_width / 1300  # Scaling based on base width
     create_sidebar_buttons(sidebar, current_file, scale_factor=scale_factor)
 
-    root.mainloop()
+screen_router.register_screen("instruction_page5", draw_biological_effects_gui, title="Photo Bio-Modulation Therapy - Biological Effects")
 
 # === RUN MAIN ===
 if __name__ == "__main__":
-    draw_biological_effects_gui()
+    screen_router.run("instruction_page5")
@@ -1,12 +1,11 @@
 import tkinter as tk
 import os
-import sys
-import subprocess
+import screen_router
 
 # === Universal Path Configuration ===
 
 # Root directory for all scripts
-BASE_DIR = os.path.join("C:", os.sep, "Users", "malvi", "OneDrive", "Desktop", "project delhi", "PythonProject")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Instruction pages list
 page_paths = [
@@ -35,9 +34,8 @@ def navigate(current_file, direction):
         else:
             return  # Invalid direction or edge page reached
 
-        # Open target script and close current one
-        subprocess.Popen(["python", next_path])
-        sys.exit()
+        # Swap to the target page in place
+        screen_router.navigate(screen_router.screen_for_script(next_path))
     except Exception as e:
         print(f"Navigation error: {e}")
 
@@ -71,21 +69,16 @@ def create_sidebar_buttons(sidebar, current_file, scale_factor=1.0):
 
 # === Main GUI Window ===
 
-def draw_indications_gui():
+def draw_indications_gui(root, router):
     """
     GUI showing therapy indications with navigation and styling.
     """
     current_file = os.path.abspath(__file__)
-    root = tk.Tk()
-    root.title("Photo Bio-Modulation Therapy - Indications")
     root.configure(bg="#2f2f2f")
 
     # Adjust window to full screen size
     screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
     window_width = int(screen_width * 0.95)
-    window_height = int(screen_height * 0.9)
-    root.geometry(f"{window_width}x{window_height}")
 
     # Header frame with title
     header_frame = tk.Frame(root, bg="#2f2f2f")
@@ -158,9 +151,9 @@ def draw_indications_gui():
                   width=12, height=1, bg="#ff4d4d", fg="white",
                   command=lambda d=direction: navigate(current_file, d)).pack(side="left", padx=40)
 
-    root.mainloop()
 
+screen_router.register_screen("instruction_page6", draw_indications_gui, title="Photo Bio-Modulation Therapy - Indications")
 
 # Entry point
 if __name__ == "__main__":
-    draw_indications_gui()
+    screen_router.run("instruction_page6")
@@ -1,7 +1,6 @@
 import tkinter as tk
-import subprocess
-import sys
 import os
+import screen_router
 
 # === Get the base folder (i.e., current project directory) ===
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -31,8 +30,7 @@ def navigate(current_file, direction):
         else:
             return
 
-        subprocess.Popen(["python", next_path])
-        sys.exit()
+        screen_router.navigate(screen_router.screen_for_script(next_path))
 
     except Exception as e:
         print(f"Navigation error: {e}")
@@ -57,21 +55,16 @@ def create_sidebar_buttons(sidebar, current_file, scale_factor=1.0):
         )
         btn.pack(pady=int(10 * scale_factor), padx=5)
 
-def create_contraindications_window():
+def create_contraindications_window(root, router):
     """
     Launches the Contraindications page window.
     """
     current_file = os.path.abspath(__file__)
 
-    root = tk.Tk()
-    root.title("Contraindications")
     root.configure(bg="#2f2f2f")
 
     screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
     window_width = int(screen_width * 0.95)
-    window_height = int(screen_height * 0.9)
-    root.geometry(f"{window_width}x{window_height}")
 
     sidebar = tk.Frame(root, bg="#222222")
     sidebar.pack(side="right", fill="y", padx=(15, 0), pady=10)
@@ -118,7 +111,7 @@ def create_contraindications_window():
               width=12, height=1, bg="#ff4d4d", fg="white",
               command=lambda: navigate(current_file, "next")).pack(side="left", padx=40)
 
-    root.mainloop()
+screen_router.register_screen("instruction_page7", create_contraindications_window, title="Contraindications")
 
 if __name__ == "__main__":
-    create_contraindications_window()
+    screen_router.run("instruction_page7")
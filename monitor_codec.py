@@ -0,0 +1,169 @@
+import struct
+
+# === Binary encoding of the therapy messages ===
+# start_therapy, update_parameters, stop_therapy and therapy_completed have a
+# fixed set of fields, so instead of JSON with long key names they can be sent
+# as a small header plus the present fields packed with one struct call:
+#
+#   tag 0xB7, schema version, command id, flags, u16 field mask
+#   then every field whose mask bit is set, in SCHEMA order
+#
+# Flag bit 0 marks a snapshot. The "float" fields travel as doubles; the flag
+# bit after that for each of them (in SCHEMA order) says the value was an int,
+# so it decodes as one and the monitor shows "1200", not "1200.0", exactly as
+# with JSON. A patch only sets the bits of the fields it carries. JSON payloads always
+# start with "{", so both kinds can share one stream. Anything the schema
+# cannot represent (other commands, extra keys, values out of range) makes
+# encode() return None and the caller sends JSON instead. The monitor lists
+# CODEC_NAME in its monitor_ready message; the controller only uses the
+# binary form when it is offered.
+
+TAG = 0xB7
+SCHEMA_VERSION = 1
+CODEC_NAME = f"binary/{SCHEMA_VERSION}"
+
+HEADER = struct.Struct("<BBBBH")
+SNAPSHOT_FLAG = 0x01
+
+COMMANDS = ("start_therapy", "update_parameters", "stop_therapy", "therapy_completed")
+WAVELENGTHS = ("808nm", "980nm", "1064nm")
+ENUMS = {
+    "mode": ("CW", "Pulse"),
+    "pulse_type": ("Frequency", "Single"),
+    "delivery_mode": ("", "Hand Probe", "Foot Switch"),
+}
+TELEMETRY_NAME_SIZE = 32  # Pascal string: up to 31 bytes of a shared memory segment name
+
+# (field, struct format, kind)
+SCHEMA = (
+    ("seq", "I", "int"),
+    ("master_power", "i", "int"),
+    ("wavelengths", "?H?H?H", "wavelengths"),
+    ("mode", "B", "enum"),
+    ("pulse_type", "B", "enum"),
+    ("pulse_duration", "d", "float"),
+    ("frequency", "i", "int"),
+    ("set_power", "d", "float"),
+    ("set_energy", "d", "float"),
+    ("set_time_min", "d", "float"),
+    ("therapy_end_time", "d", "float"),
+    ("delivery_mode", "B", "enum"),
+    ("telemetry", f"{TELEMETRY_NAME_SIZE}p", "name"),
+)
+FIELD_BITS = {name: 1 << i for i, (name, _, _) in enumerate(SCHEMA)}
+INT_FLAGS = {name: SNAPSHOT_FLAG << (1 + i)
+             for i, name in enumerate(name for name, _, kind in SCHEMA if kind == "float")}
+MAX_EXACT_INT = 2 ** 53  # Larger ints do not survive the trip through a double
+INT_RANGES = {"I": (0, 2 ** 32 - 1), "i": (-2 ** 31, 2 ** 31 - 1), "H": (0, 2 ** 16 - 1)}
+
+_layouts = {}  # field mask -> Struct of the present fields
+
+
+class CodecError(ValueError):
+    pass
+
+
+def _layout(mask):
+    layout = _layouts.get(mask)
+    if layout is None:
+        layout = _layouts[mask] = struct.Struct(
+            "<" + "".join(fmt for i, (_, fmt, _) in enumerate(SCHEMA) if mask & (1 << i)))
+    return layout
+
+
+def _is_int(value, fmt):
+    low, high = INT_RANGES[fmt]
+    return type(value) is int and low <= value <= high
+
+
+def _pack_field(name, fmt, kind, value, out):
+    """Appends the packed values of one field to `out`. Returns False if the schema cannot hold it."""
+    if kind == "int":
+        if not _is_int(value, fmt):
+            return False
+        out.append(value)
+    elif kind == "float":
+        if type(value) not in (int, float) or (type(value) is int and abs(value) > MAX_EXACT_INT):
+            return False
+        out.append(value)
+    elif kind == "enum":
+        choices = ENUMS[name]
+        if value not in choices:
+            return False
+        out.append(choices.index(value))
+    elif kind == "name":
+        if value is None:
+            value = ""
+        if not isinstance(value, str):
+            return False
+        data = value.encode("utf-8")
+        if len(data) >= TELEMETRY_NAME_SIZE:
+            return False
+        out.append(data)
+    else:  # wavelengths
+        if not isinstance(value, dict) or set(value) != set(WAVELENGTHS):
+            return False
+        for wl in WAVELENGTHS:
+            channel = value[wl]
+            if set(channel) != {"enabled", "power_percent"} or not _is_int(channel["power_percent"], "H"):
+                return False
+            out.append(bool(channel["enabled"]))
+            out.append(channel["power_percent"])
+    return True
+
+
+def encode(message):
+    """Binary payload for a message, or None if it has to go as JSON."""
+    command = message.get("command")
+    if command not in COMMANDS:
+        return None
+    flags = SNAPSHOT_FLAG if message.get("snapshot") else 0
+    known = 2 if "snapshot" in message else 1
+    mask = 0
+    values = []
+    for i, (name, fmt, kind) in enumerate(SCHEMA):
+        if name in message:
+            if not _pack_field(name, fmt, kind, message[name], values):
+                return None
+            mask |= 1 << i
+            known += 1
+            if kind == "float" and type(message[name]) is int:
+                flags |= INT_FLAGS[name]
+    if known != len(message):
+        return None  # Keys outside the schema
+    return HEADER.pack(TAG, SCHEMA_VERSION, COMMANDS.index(command), flags, mask) + _layout(mask).pack(*values)
+
+
+def decode(payload):
+    """Turns a binary payload back into the same dict the JSON form would give."""
+    try:
+        tag, version, command, flags, mask = HEADER.unpack_from(payload, 0)
+        if tag != TAG or version != SCHEMA_VERSION:
+            raise CodecError(f"Unsupported binary message (tag {tag:#x}, schema {version})")
+        values = _layout(mask).unpack_from(payload, HEADER.size)
+        message = {"command": COMMANDS[command]}
+    except (struct.error, IndexError) as e:
+        raise CodecError(f"Malformed binary message: {e}")
+    if flags & SNAPSHOT_FLAG:
+        message["snapshot"] = True
+    index = 0
+    for i, (name, _, kind) in enumerate(SCHEMA):
+        if not mask & (1 << i):
+            continue
+        if kind == "wavelengths":
+            message[name] = {wl: {"enabled": values[index + 2 * n], "power_percent": values[index + 2 * n + 1]}
+                             for n, wl in enumerate(WAVELENGTHS)}
+            index += 6
+            continue
+        value = values[index]
+        index += 1
+        if kind == "enum":
+            if value >= len(ENUMS[name]):
+                raise CodecError(f"Unknown {name} value {value}")
+            value = ENUMS[name][value]
+        elif kind == "name":
+            value = value.decode("utf-8") or None
+        elif kind == "float" and flags & INT_FLAGS[name]:
+            value = int(value)
+        message[name] = value
+    return message
@@ -0,0 +1,268 @@
+import collections
+import select
+import socket
+import threading
+import time
+import monitor_codec
+import monitor_protocol
+import monitor_transport
+
+# === Background connection to the therapy monitor ===
+# Launching the monitor, connecting and sending all happen on one worker thread,
+# so the Tk thread never sleeps or blocks on IPC. send() only queues a frame.
+# The link counts as up once the monitor says {"command": "monitor_ready"} on
+# the new connection; until then frames wait in the queue. A dropped connection
+# is retried with exponential backoff. Messages are encoded when they are sent,
+# in the binary form if the monitor offered it in monitor_ready and as JSON
+# otherwise. Patches queued across a reconnect reach a
+# connection that has not seen a snapshot yet, so the monitor asks for a resync
+# (see monitor_protocol.PatchSequence) and the controller sends a fresh snapshot.
+# When the queue fills up, the queued parameter updates are merged into one
+# snapshot of the latest values instead of losing a patch (see _shrink()).
+#
+# The link gives up when the monitor is not up for LINK_TIMEOUT_SEC, whether it
+# never started or dropped and did not come back: `failed` then says why, and
+# the controller must not carry on with a session the monitor cannot show. On
+# close() a link that is down keeps trying for CLOSE_TIMEOUT_SEC so the final
+# command still gets through; what is left after that is counted in
+# `undelivered`. The monitor is terminated either way.
+
+INITIAL_BACKOFF_SEC = 0.05
+MAX_BACKOFF_SEC = 2.0
+READY_TIMEOUT_SEC = 5.0
+LINK_TIMEOUT_SEC = 10.0     # Not up for this long (starting, or after a drop): the link fails
+CLOSE_TIMEOUT_SEC = 5.0
+MAX_QUEUED = 256            # Beyond this the queued parameter updates are merged into one snapshot
+PARAMETER_COMMAND = "update_parameters"
+TERMINATE_TIMEOUT_SEC = 5
+
+
+class MonitorLink:
+    def __init__(self, launcher=None, allow_binary=True):
+        self.launcher = launcher     # Starts the monitor and returns its process
+        self.allow_binary = allow_binary
+        self.process = None
+        self.transport = None
+        self.binary = False          # Whether the current connection uses monitor_codec
+        self.connects = 0
+        self.merged = 0              # Parameter updates folded into a snapshot on overflow
+        self.dropped = 0
+        self.failed = None           # Why the link gave up, once it has
+        self.undelivered = 0         # Messages still queued when the link closed
+        self._outbox = collections.deque()
+        self._params = None          # Every parameter as of the last queued update, once a snapshot was queued
+        self._inbox = collections.deque()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._closing = threading.Event()
+        self._close_deadline = 0.0
+        self._terminate = False
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def connected(self):
+        return self._ready.is_set()
+
+    def send(self, message):
+        """Queues a message for the monitor. Never blocks."""
+        with self._lock:
+            if message.get("command") == PARAMETER_COMMAND:
+                fields = {k: v for k, v in message.items() if k not in ("command", "seq", "snapshot")}
+                if message.get("snapshot"):
+                    self._params = fields
+                elif self._params is not None:
+                    self._params.update(fields)
+            self._outbox.append(message)
+            if len(self._outbox) > MAX_QUEUED:
+                self._shrink()
+        self._wake()
+
+    def _shrink(self):
+        """Makes room in a full queue. Called with the lock held.
+
+        Evicting a patch would leave a gap in the sequence numbers, and the
+        monitor would reject every later patch until a snapshot round trip.
+        Instead, all queued parameter updates become one snapshot of the
+        latest values, carrying the latest sequence number. Only if there is
+        nothing to merge is the oldest message dropped.
+        """
+        queued = [m for m in self._outbox if m.get("command") == PARAMETER_COMMAND]
+        if self._params is not None and len(queued) > 1:
+            snapshot = {"command": PARAMETER_COMMAND, "seq": queued[-1].get("seq"), "snapshot": True, **self._params}
+            self._outbox = collections.deque(m for m in self._outbox if m.get("command") != PARAMETER_COMMAND)
+            self._outbox.append(snapshot)
+            self.merged += len(queued) - 1
+        if len(self._outbox) > MAX_QUEUED:
+            self._outbox.popleft()
+            self.dropped += 1
+
+    def received(self):
+        """Messages the monitor sent since the last call."""
+        messages = []
+        while self._inbox:
+            messages.append(self._inbox.popleft())
+        return messages
+
+    def close(self, terminate=True):
+        """Sends whatever is still queued, then disconnects (and ends the monitor) in the background."""
+        self._terminate = terminate
+        self._close_deadline = time.monotonic() + CLOSE_TIMEOUT_SEC
+        self._closing.set()
+        self._wake()
+
+    def _keep_trying(self):
+        """Whether the worker should (re)connect: until close(), then while queued messages can still go."""
+        if self.failed is not None:
+            return False
+        if not self._closing.is_set():
+            return True
+        with self._lock:
+            pending = bool(self._outbox)
+        return pending and time.monotonic() < self._close_deadline
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass  # Buffer full: the worker is awake already
+
+    def _sleep(self, seconds):
+        """Waits for the backoff delay, waking early on close()."""
+        select.select([self._wake_r], [], [], seconds)
+        self._drain_wake()
+
+    def _drain_wake(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _connect(self):
+        if self.process is None or self.process.poll() is not None:
+            if self.launcher is not None:
+                self.process = self.launcher()
+                print(f"Started monitor application (pid {self.process.pid})")
+        sock, self.transport = monitor_transport.connect(self.process)
+        return sock
+
+    def _run(self):
+        # Whatever ends the worker, the monitor and the wake sockets are cleaned up
+        try:
+            self._loop()
+        except Exception as e:
+            self.failed = f"the monitor link stopped ({e})"
+            raise
+        finally:
+            self._finish()
+
+    def _loop(self):
+        backoff = INITIAL_BACKOFF_SEC
+        down_since = time.monotonic()
+        while self._keep_trying():
+            if not self._closing.is_set() and time.monotonic() - down_since > LINK_TIMEOUT_SEC:
+                self.failed = f"the monitor was not ready within {LINK_TIMEOUT_SEC:.0f} s"
+                print(f"Monitor link failed: {self.failed}")
+                break
+            try:
+                sock = self._connect()
+            except Exception as e:
+                print(f"Monitor connection failed ({e}); retrying in {backoff:.2f}s")
+                self._sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SEC)
+                continue
+            if self._serve(sock):
+                backoff = INITIAL_BACKOFF_SEC  # It was up, so the next attempt starts fast again
+                down_since = time.monotonic()
+            else:
+                self._sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SEC)
+
+    def _serve(self, sock):
+        """Runs one connection until it drops or the link closes. Returns whether it got ready."""
+        decoder = monitor_protocol.FrameDecoder(4096)
+        was_ready = False
+        deadline = time.monotonic() + READY_TIMEOUT_SEC
+        with sock:
+            try:
+                while True:
+                    if self._ready.is_set():
+                        self._flush(sock)
+                        if self._closing.is_set():
+                            return True
+                    elif not self._keep_trying():
+                        return was_ready
+                    timeout = None if self._ready.is_set() else max(0.0, deadline - time.monotonic())
+                    if self._closing.is_set():
+                        # close() may have come in since the check above, while timeout is None
+                        remaining = max(0.0, self._close_deadline - time.monotonic())
+                        timeout = remaining if timeout is None else min(timeout, remaining)
+                    readable, _, _ = select.select([sock, self._wake_r], [], [], timeout)
+                    if not readable:
+                        if not self._closing.is_set():
+                            print("Monitor did not signal ready in time; reconnecting")
+                        return False
+                    if self._wake_r in readable:
+                        self._drain_wake()
+                    if sock in readable:
+                        messages = decoder.read_from(sock)
+                        if messages is None:
+                            print("Monitor closed the connection.")
+                            return was_ready
+                        for message in messages:
+                            if message.get("command") == "monitor_ready":
+                                self.connects += 1
+                                was_ready = True
+                                self.binary = self.allow_binary and monitor_codec.CODEC_NAME in message.get("codecs", ())
+                                self._ready.set()
+                                print(f"Connected to monitor application over {self.transport}"
+                                      f" ({'binary' if self.binary else 'JSON'} messages).")
+                            else:
+                                self._inbox.append(message)
+            except (OSError, monitor_protocol.FramingError) as e:
+                print(f"Monitor connection lost: {e}")
+                return was_ready
+            finally:
+                self._ready.clear()
+
+    def _flush(self, sock):
+        while True:
+            with self._lock:
+                if not self._outbox:
+                    return
+                message = self._outbox[0]
+            try:
+                frame = monitor_protocol.encode(message, binary=self.binary)
+            except monitor_protocol.FramingError as e:
+                print(f"Dropping message for monitor: {e}")
+                frame = None
+            if frame is not None:
+                sock.sendall(frame)
+            with self._lock:
+                # Only drop it once it is sent, so a failed send is retried after reconnecting
+                if self._outbox and self._outbox[0] is message:
+                    self._outbox.popleft()
+
+    def _finish(self):
+        with self._lock:
+            self.undelivered = len(self._outbox)
+            last = self._outbox[-1].get("command") if self._outbox else None
+        if self.undelivered:
+            print(f"WARNING: {self.undelivered} message(s) never reached the monitor (last: {last})")
+        self._wake_r.close()
+        self._wake_w.close()
+        channel = monitor_transport.take_channel(self.process)
+        if channel is not None:
+            channel.close()
+        # A monitor the link gave up on must not keep showing the session
+        if (self._terminate or self.failed) and self.process is not None and self.process.poll() is None:
+            print("Terminating monitor application.")
+            try:
+                self.process.terminate()
+                self.process.wait(timeout=TERMINATE_TIMEOUT_SEC)
+            except Exception as e:
+                print(f"Error terminating monitor process: {e}")
+                self.process.kill()
@@ -0,0 +1,138 @@
+import json
+import struct
+import monitor_codec
+
+# === Wire format between the controller and the therapy monitor ===
+# TCP is a byte stream: one send() can arrive split over several recv() calls,
+# and several sends can arrive in one. Every message is therefore framed as a
+# 4-byte big-endian payload length followed by the payload: UTF-8 JSON, or
+# the binary form from monitor_codec.py when both sides support it.
+HEADER = struct.Struct("!I")
+MAX_MESSAGE_SIZE = 1024 * 1024
+RECV_BUFFER_SIZE = 64 * 1024
+
+
+class FramingError(Exception):
+    pass
+
+
+def encode(message, binary=False):
+    """Frames one message (a JSON-serializable dict) for sendall().
+
+    With `binary`, messages the binary schema covers are sent in that form.
+    """
+    payload = monitor_codec.encode(message) if binary else None
+    if payload is None:
+        payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    if len(payload) > MAX_MESSAGE_SIZE:
+        raise FramingError(f"Message of {len(payload)} bytes exceeds {MAX_MESSAGE_SIZE}")
+    return HEADER.pack(len(payload)) + payload
+
+
+def decode(payload):
+    """Decodes one frame payload of either kind."""
+    if payload[:1] == b"{":
+        return json.loads(payload.decode("utf-8"))
+    return monitor_codec.decode(payload)
+
+
+class FrameDecoder:
+    """Pulls complete messages out of a byte stream.
+
+    Reads go straight into one preallocated buffer with recv_into(). It only
+    grows when a single message does not fit. After each read every complete
+    frame is decoded once, and a trailing partial frame is moved to the front
+    for the next read.
+    """
+
+    def __init__(self, buffer_size=RECV_BUFFER_SIZE):
+        self._buffer = bytearray(buffer_size)
+        self._end = 0            # Bytes of unconsumed data at the front of the buffer
+        self.messages = 0
+        self.bad_messages = 0
+
+    def read_from(self, sock):
+        """Reads once from `sock`. Returns the decoded messages, or None when the peer closed."""
+        if self._end == len(self._buffer):
+            self._buffer.extend(bytes(len(self._buffer)))
+        with memoryview(self._buffer)[self._end:] as view:
+            count = sock.recv_into(view)
+        if count == 0:
+            return None
+        self._end += count
+        return self._drain()
+
+    def feed(self, data):
+        """Adds bytes that were received some other way and returns the decoded messages."""
+        needed = self._end + len(data)
+        if needed > len(self._buffer):
+            self._buffer.extend(bytes(needed - len(self._buffer)))
+        self._buffer[self._end:needed] = data
+        self._end = needed
+        return self._drain()
+
+    def _drain(self):
+        messages = []
+        start = 0
+        buffer = self._buffer
+        while self._end - start >= HEADER.size:
+            (length,) = HEADER.unpack_from(buffer, start)
+            if length > MAX_MESSAGE_SIZE:
+                raise FramingError(f"Frame of {length} bytes exceeds {MAX_MESSAGE_SIZE}; stream is out of sync")
+            frame_end = start + HEADER.size + length
+            if frame_end > self._end:
+                # Partial frame; make sure the whole frame will fit
+                if frame_end - start > len(buffer):
+                    buffer.extend(bytes(frame_end - start - len(buffer)))
+                break
+            try:
+                messages.append(decode(bytes(buffer[start + HEADER.size:frame_end])))
+                self.messages += 1
+            except ValueError as e:  # JSON, UTF-8 and monitor_codec errors are all ValueErrors
+                # The frame boundary is still known, so only this message is lost
+                self.bad_messages += 1
+                print(f"Dropping undecodable message: {e}")
+            start = frame_end
+        if start:
+            remaining = self._end - start
+            buffer[:remaining] = buffer[start:self._end]
+            self._end = remaining
+        return messages
+
+
+class PatchSequence:
+    """Orders the controller's parameter messages on the monitor side.
+
+    The controller sends one full snapshot and then patches holding only the
+    fields that changed, each with the next sequence number. A patch only
+    applies on top of the message right before it, so after a gap every patch
+    is dropped until a new snapshot arrives. accept() returns whether to apply
+    the message and whether a resync request should be sent (once per gap).
+    """
+
+    def __init__(self):
+        self.expected = None     # Next seq that can be applied; None until the first snapshot
+        self.resync_pending = False
+        self.gaps = 0
+        self.dropped = 0
+
+    def accept(self, message):
+        seq = message.get("seq")
+        if seq is None:
+            return True, False   # Unsequenced message from an older controller
+        if message.get("snapshot"):
+            self.expected = seq + 1
+            self.resync_pending = False
+            return True, False
+        if seq == self.expected:
+            self.expected += 1
+            return True, False
+        self.dropped += 1
+        if self.resync_pending:
+            return False, False
+        self.gaps += 1
+        self.resync_pending = True
+        return False, True
+
+    def resync_request(self):
+        return encode({"command": "resync", "expected": self.expected})
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import monitor_codec
+import monitor_protocol
+import monitor_transport
+
+# === Monitor-side server ===
+# One asyncio loop on its own thread serves every client at once: the
+# controller (over the inherited socketpair or a listener), remote clinic
+# dashboards and loggers. Each connection gets its own decoder and sequence
+# check. Messages that are applied go to `deliver` (normally a TkInbox) and are
+# fanned out to the other clients, together with whatever the monitor itself
+# publish()es. A connection that sends therapy commands is a controller: it
+# already knows its own updates and does not read the monitor's state, so
+# nothing is fanned out to it. A backend that fails to bind is retried until
+# it succeeds.
+
+BIND_RETRY_SEC = 1.0
+# A client that stops reading is dropped rather than buffering without limit
+MAX_CLIENT_BACKLOG = 256 * 1024
+
+
+class MonitorServer:
+    def __init__(self, deliver, ready=None):
+        self.deliver = deliver
+        self.ready = ready or threading.Event()  # Set once the first round of listeners is up
+        self.clients = {}                # writer -> peer name
+        self.controllers = set()         # Writers of clients that send therapy commands
+        self.relayed = 0
+        self.slow_clients = 0
+        self.bad_messages = 0            # Undecodable frames, summed over closed connections
+        self.resyncs = 0
+        self._loop = None
+        self._servers = []
+        self._tasks = set()              # The loop only keeps weak references to tasks
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._spawn(self._start())
+        self._loop.run_forever()
+
+    def _spawn(self, coroutine):
+        task = self._loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def publish(self, message):
+        """Sends a message from the monitor to every client. Safe to call from any thread."""
+        frame = monitor_protocol.encode(message)
+        self._loop.call_soon_threadsafe(self._broadcast, frame)
+
+    async def _start(self):
+        # The controller that spawned us is already connected through the inherited socketpair
+        channel = monitor_transport.inherited_channel()
+        if channel is not None:
+            try:
+                reader, writer = await asyncio.open_connection(sock=channel)
+                self._spawn(self._serve(reader, writer, "socketpair", controller=True))
+            except OSError as e:
+                print(f"Could not use the inherited monitor channel: {e}")
+        pending = monitor_transport.backends()
+        while True:
+            for backend in list(pending):
+                if await self._listen(backend):
+                    pending.remove(backend)
+            self.ready.set()
+            if not pending:
+                return
+            await asyncio.sleep(BIND_RETRY_SEC)
+
+    async def _listen(self, backend):
+        opened = monitor_transport.listen(backend)
+        if opened is None:
+            return False
+        name, sock = opened
+        if backend == "unix":
+            server = await asyncio.start_unix_server(self._on_connect, sock=sock)
+        else:
+            server = await asyncio.start_server(self._on_connect, sock=sock)
+        self._servers.append(server)
+        print(f"Monitoring application listening for data on {name}...")
+        return True
+
+    async def _on_connect(self, reader, writer):
+        await self._serve(reader, writer, writer.get_extra_info("peername") or "local client")
+
+    async def _serve(self, reader, writer, peer, controller=False):
+        print(f"Connected by {peer}")
+        self.clients[writer] = peer
+        if controller:
+            self.controllers.add(writer)
+        # One decoder per connection; a partial frame never carries over to the next client
+        decoder = monitor_protocol.FrameDecoder()
+        sequence = monitor_protocol.PatchSequence()
+        try:
+            # Tells the controller's monitor_link it can start sending
+            writer.write(monitor_protocol.encode({"command": "monitor_ready",
+                                                  "codecs": [monitor_codec.CODEC_NAME, "json"]}))
+            while True:
+                data = await reader.read(monitor_protocol.RECV_BUFFER_SIZE)
+                if not data:
+                    print(f"Client {peer} disconnected.")
+                    break
+                for update in decoder.feed(data):
+                    apply, resync = sequence.accept(update)
+                    if resync:
+                        self.resyncs += 1
+                        print(f"DEBUG: Parameter seq {update.get('seq')} out of order, requesting resync")
+                        writer.write(sequence.resync_request())
+                    if apply:
+                        if update.get("command") in monitor_codec.COMMANDS:
+                            self.controllers.add(writer)
+                        self.deliver(update)
+                        self._broadcast(monitor_protocol.encode(update))
+        except monitor_protocol.FramingError as e:
+            print(f"Framing error, dropping connection: {e}")
+        except OSError as e:
+            print(f"Connection from {peer} failed: {e}")
+        finally:
+            self.bad_messages += decoder.bad_messages
+            self.clients.pop(writer, None)
+            self.controllers.discard(writer)
+            writer.close()
+
+    def _broadcast(self, frame):
+        for writer, peer in list(self.clients.items()):
+            if writer in self.controllers or writer.is_closing():
+                continue
+            if writer.transport.get_write_buffer_size() > MAX_CLIENT_BACKLOG:
+                print(f"Client {peer} is not reading, dropping it")
+                self.slow_clients += 1
+                self.clients.pop(writer, None)
+                writer.close()
+                continue
+            writer.write(frame)
+            self.relayed += 1
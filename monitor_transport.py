@@ -0,0 +1,147 @@
+import os
+import socket
+import tempfile
+
+# === Controller <-> monitor transport ===
+# Both processes run on the same device, so loopback TCP only adds overhead and
+# can collide with whatever else owns port 65432. Connections are tried in order:
+#   1. socketpair  - one end is inherited by a monitor spawned by monitor_zygote
+#   2. unix        - a Unix domain socket in the runtime directory
+#   3. tcp         - localhost:65432 as before; also what remote viewers use
+# LUMINO_MONITOR_TRANSPORT=unix|tcp forces one backend on the controller side.
+# The monitor only listens on TCP when LUMINO_MONITOR_TCP=host:port is set, or
+# when the platform has no Unix domain sockets (Windows).
+
+TCP_ADDRESS = ("localhost", 65432)
+TRANSPORT_ENV = "LUMINO_MONITOR_TRANSPORT"
+TCP_ENV = "LUMINO_MONITOR_TCP"
+INHERITED_FD_ENV = "LUMINO_MONITOR_FD"
+BACKLOG = 8  # Controller, dashboards and loggers can all connect at once
+HAS_UNIX = hasattr(socket, "AF_UNIX")
+HAS_SOCKETPAIR = HAS_UNIX and os.name == "posix"  # pass_fds is POSIX only
+
+
+def unix_path():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(runtime_dir, "lumino_monitor.sock")
+
+
+def tcp_address():
+    """The TCP address to listen on, or None when TCP is not needed."""
+    value = os.environ.get(TCP_ENV)
+    if value:
+        host, _, port = value.rpartition(":")
+        return host or TCP_ADDRESS[0], int(port)
+    if not HAS_UNIX or os.environ.get(TRANSPORT_ENV, "").lower() == "tcp":
+        return TCP_ADDRESS
+    return None
+
+
+# --- Monitor side ---
+
+def backends():
+    """Names of the listening backends the monitor should serve."""
+    names = ["unix"] if HAS_UNIX else []
+    if tcp_address() is not None:
+        names.append("tcp")
+    return names
+
+
+def listen(backend):
+    """Opens the listening socket for one backend. Returns (name, socket), or None if it failed."""
+    if backend == "unix":
+        path = unix_path()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            # A leftover from a crashed monitor, or the previous monitor: the newest one wins
+            if os.path.exists(path):
+                os.unlink(path)
+            sock.bind(path)
+            sock.listen(BACKLOG)
+            return f"unix:{path}", sock
+        except OSError as e:
+            print(f"Failed to listen on {path}: {e}")
+            sock.close()
+            return None
+    address = tcp_address()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    try:
+        sock.bind(address)
+        sock.listen(BACKLOG)
+        return f"tcp:{address[0]}:{address[1]}", sock
+    except OSError as e:
+        print(f"Failed to bind {address[0]}:{address[1]}: {e}. Port might be in use.")
+        sock.close()
+        return None
+
+
+def inherited_channel():
+    """The socketpair end handed down by the controller, or None."""
+    fd = os.environ.pop(INHERITED_FD_ENV, None)
+    if fd is None:
+        return None
+    try:
+        return socket.socket(fileno=int(fd))
+    except (OSError, ValueError) as e:
+        print(f"Ignoring inherited monitor channel {fd}: {e}")
+        return None
+
+
+# --- Controller side ---
+
+def channel_pair():
+    """Creates a socketpair for a monitor about to be spawned.
+
+    Returns (controller end, monitor end), or (None, None) where that is not possible.
+    The monitor end goes into Popen(pass_fds=...) with child_env(); the caller closes
+    its copy after the spawn.
+    """
+    if not HAS_SOCKETPAIR:
+        return None, None
+    controller_end, monitor_end = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    monitor_end.set_inheritable(True)
+    return controller_end, monitor_end
+
+
+def child_env(monitor_end):
+    env = dict(os.environ)
+    if monitor_end is not None:
+        env[INHERITED_FD_ENV] = str(monitor_end.fileno())
+    return env
+
+
+def take_channel(process):
+    """Takes the controller end of a spawned monitor's socketpair (usable once)."""
+    channel = getattr(process, "channel", None)
+    if channel is not None:
+        process.channel = None
+    return channel
+
+
+def connect(process=None):
+    """Connects to the monitor, preferring the inherited socketpair of `process`.
+
+    Raises the last OSError when no backend is reachable; ConnectionRefusedError
+    and FileNotFoundError mean the monitor is not listening yet.
+    """
+    forced = os.environ.get(TRANSPORT_ENV, "").lower()
+    if forced not in ("unix", "tcp"):
+        channel = take_channel(process)
+        if channel is not None:
+            return channel, "socketpair"
+    error = None
+    if HAS_UNIX and forced != "tcp":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(unix_path())
+            return sock, "unix"
+        except OSError as e:
+            sock.close()
+            error = e
+    if forced == "tcp" or not HAS_UNIX:
+        try:
+            return socket.create_connection(tcp_address()), "tcp"
+        except OSError as e:
+            error = e
+    raise error or OSError(f"No monitor transport available for {TRANSPORT_ENV}={forced}")
@@ -0,0 +1,149 @@
+import json
+import subprocess
+import threading
+import queue
+import atexit
+import sys
+import os
+import monitor_transport
+
+# === Warm standby for the therapy monitor ===
+# Starting therapy.py cold costs an interpreter start, the tkinter import and the
+# LuminoProApp widget build. Instead we keep one monitor process running in
+# "--standby" mode: everything is built, but the window is withdrawn and the
+# socket server is not started yet. launch_monitor() tells it to show itself over
+# its stdin control channel, waits for MONITOR_READY on stdout and hands the
+# process to the caller. MONITOR_FAILED (or no answer in time) means the standby
+# could not start serving; it is dropped and the caller falls back to a cold
+# start. A fresh standby is then started for the next session.
+# Each monitor is spawned holding one end of a socketpair; the other end rides
+# along on the returned process as `channel` (see monitor_transport.py).
+
+MONITOR_APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "therapy.py")
+READY_LINE = "MONITOR_READY"
+FAILED_LINE = "MONITOR_FAILED"
+READY_TIMEOUT_SEC = 5.0
+
+
+class MonitorZygote:
+    def __init__(self, script_path=MONITOR_APP_PATH):
+        self.script_path = script_path
+        self.process = None
+        self._ready_queue = None
+
+    def _echo_output(self, process, ready_queue):
+        """Picks the ready handshake out of the monitor's stdout control channel."""
+        for line in process.stdout:
+            if line.strip() == READY_LINE:
+                ready_queue.put(True)
+            elif line.strip() == FAILED_LINE:
+                ready_queue.put(False)
+            else:
+                print(line, end="")
+
+    def prestart(self):
+        """Starts a hidden standby monitor if one is not already waiting."""
+        if self.process is not None and self.process.poll() is None:
+            return
+        try:
+            self.process = spawn(self.script_path, "--standby",
+                                 stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+        except Exception as e:
+            print(f"Could not start standby monitor: {e}")
+            self.process = None
+            return
+        self._ready_queue = queue.Queue()
+        threading.Thread(target=self._echo_output, args=(self.process, self._ready_queue), daemon=True).start()
+        print(f"DEBUG: Standby monitor started (pid {self.process.pid})")
+
+    def acquire(self, timeout=READY_TIMEOUT_SEC, selection=None):
+        """Shows the standby monitor and returns its process once it is listening.
+
+        A `selection` message (see selection_handoff.py) is passed on first, so the
+        monitor does not have to read temp_selection.json.
+        Returns None if the standby did not come up in time or reported that it could not serve.
+        """
+        self.prestart()
+        process, ready_queue = self.process, self._ready_queue
+        self.process = self._ready_queue = None
+        if process is None:
+            return None
+        try:
+            if selection is not None:
+                process.stdin.write("select " + json.dumps(selection) + "\n")
+            process.stdin.write("show\n")
+            process.stdin.flush()
+            if ready_queue.get(timeout=timeout):
+                return process
+            print("Standby monitor could not start serving")
+        except (OSError, queue.Empty) as e:
+            print(f"Standby monitor did not become ready: {e}")
+        process.kill()
+        _close_channel(process)
+        return None
+
+    def shutdown(self):
+        if self.process is not None and self.process.poll() is None:
+            try:
+                self.process.stdin.close()  # EOF tells an unused standby to exit
+                self.process.wait(timeout=2)
+            except Exception:
+                self.process.kill()
+        if self.process is not None:
+            _close_channel(self.process)
+        self.process = None
+
+
+def spawn(script_path, *args, **popen_args):
+    """Starts a monitor process with the monitor end of a fresh socketpair."""
+    controller_end, monitor_end = monitor_transport.channel_pair()
+    try:
+        process = subprocess.Popen(
+            [sys.executable, script_path, *args], cwd=os.path.dirname(script_path),
+            env=monitor_transport.child_env(monitor_end),
+            pass_fds=(monitor_end.fileno(),) if monitor_end is not None else (),
+            **popen_args)
+    except Exception:
+        if controller_end is not None:
+            controller_end.close()
+        raise
+    finally:
+        if monitor_end is not None:
+            monitor_end.close()  # The child has its own copy now
+    process.channel = controller_end
+    return process
+
+
+def _close_channel(process):
+    channel = monitor_transport.take_channel(process)
+    if channel is not None:
+        channel.close()
+
+
+_zygote = MonitorZygote()
+_zygote_lock = threading.Lock()  # The therapy screen launches from monitor_link's worker thread
+atexit.register(_zygote.shutdown)
+
+
+def prestart():
+    _zygote.prestart()
+
+
+def launch_monitor(selection=None):
+    """Brings a therapy monitor on screen and returns its process.
+
+    Uses the warm standby when available and falls back to a cold start, which
+    reads the selection from temp_selection.json instead.
+    A replacement standby is started right away for the next session.
+    """
+    with _zygote_lock:
+        process = _zygote.acquire(selection=selection)
+        if process is None:
+            process = spawn(MONITOR_APP_PATH)
+            print(f"Started monitor application cold: {MONITOR_APP_PATH}")
+        _zygote.prestart()
+    return process
+
+
+def shutdown():
+    _zygote.shutdown()
@@ -1,36 +1,11 @@
-import tkinter as tk
 from tkinter import messagebox
 import os
-import json
-import subprocess
 from neck_cervicalspine import load_and_resize_images, create_layout
+import screen_router
+import selection_handoff
+import protocol_db
 
-therapy_data = {
-    "Muscle Spasm": {
-        "BodyPart": "Muscle",
-        "Condition": "Muscle Spasm",
-        "Power": 34,
-        "Pulse Freq": 8800,
-        "Time": 9,
-        "Total Energy": 3100
-    },
-    "Strains": {
-        "BodyPart": "Muscle",
-        "Condition": "Strains",
-        "Power": 36,
-        "Pulse Freq": 9000,
-        "Time": 10,
-        "Total Energy": 3300
-    },
-    "Sprains": {
-        "BodyPart": "Muscle",
-        "Condition": "Sprains",
-        "Power": 35,
-        "Pulse Freq": 8900,
-        "Time": 10,
-        "Total Energy": 3200
-    }
-}
+REGION = "Muscle Condition"
 
 PROJECT_DIR = os.path.expanduser(r"C:\Users\malvi\OneDrive\Desktop\project delhi\PythonProject")
 
@@ -39,38 +14,21 @@ def resource_path(relative_path):
 
 def on_condition_selected(condition):
     try:
-        if condition in therapy_data:
-            therapy = therapy_data[condition]
+        therapy = protocol_db.lookup(REGION, condition)
+        if therapy is not None:
             data_to_send = {
-                "User Selections": {"Condition": therapy["Condition"]},
-                "Therapy Data": {
-                    "Power": therapy["Power"],
-                    "Pulse Freq": therapy["Pulse Freq"],
-                    "Time": therapy["Time"],
-                    "Total Energy": therapy["Total Energy"]
-                },
-                "Body Part": therapy["BodyPart"]
+                "User Selections": {"Condition": therapy.ailment},
+                "Therapy Data": protocol_db.therapy_data(therapy),
+                "Body Part": therapy.body_part
             }
-            with open(os.path.join(PROJECT_DIR, "temp_selection.json"), "w") as f:
-                json.dump(data_to_send, f)
-            subprocess.Popen(["python", os.path.join(PROJECT_DIR, "therapy.py")], cwd=PROJECT_DIR)
+            selection_handoff.hand_off(data_to_send, screen_router.get_router().root)
         else:
             messagebox.showwarning("Not Found", f"No therapy data for: {condition}")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to launch therapy.py:\n{e}")
 
-def main():
-    root = tk.Tk()
-    root.title("Lumino Pro - Muscle Condition")
-    root.attributes('-fullscreen', True)
-
-    screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
-    base_width, base_height = 1300, 750
-    scale_factor = min(screen_width / base_width, screen_height / base_height)
-
-    root.geometry(f"{int(base_width * scale_factor)}x{int(base_height * scale_factor)}")
-    root.configure(bg="gray20")
+def build_screen(root, router):
+    scale_factor = router.scale_factor
 
     muscle_img_path = resource_path("image/bodyparts/muscle_condition.png")
     anatomy_img_path = resource_path("image/anatomy.png")
@@ -84,11 +42,16 @@ def main():
         scale_factor,
         title="Lumino Pro",
         scroll_title="Muscle Condition",
-        info_list=list(therapy_data.keys()),
+        region=REGION,
         callback=on_condition_selected
     )
 
-    root.mainloop()
+    return muscle_photo, anatomy_photo
+
+screen_router.register_screen("muscle_condition", build_screen, title="Lumino Pro - Muscle Condition")
+
+def main():
+    screen_router.run("muscle_condition")
 
 if __name__ == "__main__":
     main()
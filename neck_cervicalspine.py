@@ -1,61 +1,27 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
-import subprocess
 import os
-import sys
-import json
+import screen_router
+import selection_handoff
+import protocol_db
+import image_cache
 
 # === Paths ===
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_DIR = os.path.dirname(BASE_DIR)
-
-# === Therapy data for cervical spine ===
-therapy_data = {
-    "Spondylosis": {
-        "BodyPart": "Cervical Spine",
-        "Condition": "Spondylosis",
-        "Power": 36,
-        "Pulse Freq": 8800,
-        "Time": 12,
-        "Total Energy": 3400
-    },
-    "Spondylo-arthrosis": {
-        "BodyPart": "Cervical Spine",
-        "Condition": "Spondylo-arthrosis",
-        "Power": 35,
-        "Pulse Freq": 8500,
-        "Time": 11,
-        "Total Energy": 3250
-    },
-    "Spondylitis": {
-        "BodyPart": "Cervical Spine",
-        "Condition": "Spondylitis",
-        "Power": 34,
-        "Pulse Freq": 8700,
-        "Time": 10,
-        "Total Energy": 3100
-    }
-}
+
+REGION = "Neck"
 
 def on_condition_selected(condition):
     try:
-        if condition in therapy_data:
-            therapy = therapy_data[condition]
+        therapy = protocol_db.lookup(REGION, condition)
+        if therapy is not None:
             data_to_send = {
-                "User Selections": {"Condition": therapy["Condition"]},
-                "Therapy Data": {
-                    "Power": therapy["Power"],
-                    "Pulse Freq": therapy["Pulse Freq"],
-                    "Time": therapy["Time"],
-                    "Total Energy": therapy["Total Energy"]
-                },
-                "Body Part": therapy["BodyPart"]
+                "User Selections": {"Condition": therapy.ailment},
+                "Therapy Data": protocol_db.therapy_data(therapy),
+                "Body Part": therapy.body_part
             }
-            json_path = os.path.join(PROJECT_DIR, "PythonProject", "temp_selection.json")
-            with open(json_path, "w") as f:
-                json.dump(data_to_send, f)
-            subprocess.Popen(["python", os.path.join(PROJECT_DIR, "PythonProject", "therapy.py")], cwd=os.path.join(PROJECT_DIR, "PythonProject"))
+            selection_handoff.hand_off(data_to_send, screen_router.get_router().root)
         else:
             messagebox.showwarning("Not Found", f"No therapy data for: {condition}")
     except Exception as e:
@@ -71,13 +37,8 @@ def load_and_resize_images(bodypart_img_name, anatomy_img_name, scale_factor):
     target_bodypart_height = int(400 * scale_factor)
 
     try:
-        bodypart_img = Image.open(bodypart_img_path)
-        original_width, original_height = bodypart_img.size
-        ratio = min(target_bodypart_width / original_width, target_bodypart_height / original_height)
-        new_width = int(original_width * ratio)
-        new_height = int(original_height * ratio)
-        bodypart_img = bodypart_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        bodypart_photo = ImageTk.PhotoImage(bodypart_img)
+        new_size = image_cache.fit_size(bodypart_img_path, target_bodypart_width, target_bodypart_height)
+        bodypart_photo = image_cache.load_resized_async(bodypart_img_path, new_size)
     except Exception as e:
         messagebox.showerror("Image Error", f"Body part image error:\n{e}")
         bodypart_photo = ImageTk.PhotoImage(Image.new("RGB", (target_bodypart_width, target_bodypart_height), "gray"))
@@ -87,13 +48,8 @@ def load_and_resize_images(bodypart_img_name, anatomy_img_name, scale_factor):
     target_anatomy_height = int(700 * scale_factor)
 
     try:
-        anatomy_img = Image.open(anatomy_img_path)
-        original_width, original_height = anatomy_img.size
-        ratio = min(target_anatomy_width / original_width, target_anatomy_height / original_height)
-        new_width = int(original_width * ratio)
-        new_height = int(original_height * ratio)
-        anatomy_img = anatomy_img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        anatomy_photo = ImageTk.PhotoImage(anatomy_img)
+        new_size = image_cache.fit_size(anatomy_img_path, target_anatomy_width, target_anatomy_height)
+        anatomy_photo = image_cache.load_resized_async(anatomy_img_path, new_size)
     except Exception as e:
         messagebox.showerror("Image Error", f"Anatomy image error:\n{e}")
         anatomy_photo = ImageTk.PhotoImage(Image.new("RGB", (target_anatomy_width, target_anatomy_height), "gray"))
@@ -104,17 +60,16 @@ def create_sidebar_buttons(sidebar, scale_factor, root):
     sidebar_buttons = ["🔄 Auto", "📜 Protocol", "🏃 Therapy", "🏠 Home", "🔙 Back"]
 
     def on_button_click(name):
-        script_paths = {
-            "🔄 Auto": os.path.join(BASE_DIR, "automode.py"),
-            "📜 Protocol": os.path.join(BASE_DIR, "protocol1.py"),
-            "🏃 Therapy": os.path.join(BASE_DIR, "therapyq.py"),
-            "🏠 Home": os.path.join(BASE_DIR, "new_passwordscreen.py")
+        screens = {
+            "🔄 Auto": "auto",
+            "📜 Protocol": "protocol",
+            "🏃 Therapy": "therapy",
+            "🏠 Home": "home"
         }
         if name == "🔙 Back":
-            root.destroy()
-        elif name in script_paths and os.path.exists(script_paths[name]):
-            subprocess.Popen([sys.executable, script_paths[name]])
-            root.destroy()
+            screen_router.go_back()
+        elif name in screens:
+            screen_router.navigate(screens[name])
 
     for btn_text in sidebar_buttons:
         canvas = tk.Canvas(sidebar, width=int(160*scale_factor), height=int(100*scale_factor), bg="gray20", highlightthickness=0)
@@ -127,9 +82,10 @@ def create_sidebar_buttons(sidebar, scale_factor, root):
             canvas.tag_bind(item, "<Button-1>", lambda e, name=btn_text: on_button_click(name))
 
 def create_layout(root, anatomy_photo, bodypart_photo, scale_factor,
-                  title="Lumino Pro", scroll_title="Cervical Spine", info_list=None, callback=None):
+                  title="Lumino Pro", scroll_title="Cervical Spine", info_list=None, callback=None, region=None):
+    # With a region the condition list comes from protocol_db and follows protocol reloads
     if info_list is None:
-        info_list = list(therapy_data.keys())
+        info_list = protocol_db.region_ailments(region or REGION)
 
     root.grid_rowconfigure(1, weight=1)
     root.grid_columnconfigure(1, weight=1)
@@ -174,48 +130,64 @@ def create_layout(root, anatomy_photo, bodypart_photo, scale_factor,
     scroll_canvas.bind("<Configure>", update_scroll_region)
     text_frame.bind("<Configure>", update_scroll_region)
 
-    for item in info_list:
-        btn = tk.Button(text_frame, text=item, font=("Segoe UI", int(18*scale_factor), "bold"), fg="white", bg="#284b63",
-                        activebackground="#3b6a8d", activeforeground="white", width=28, relief="flat", bd=0,
-                        cursor="hand2", padx=10, pady=10, command=lambda i=item: callback(i) if callback else print(f"{i} clicked!"))
-        btn.pack(pady=8, padx=12)
-        btn.bind("<Enter>", lambda e: e.widget.config(bg="#3b6a8d"))
-        btn.bind("<Leave>", lambda e: e.widget.config(bg="#284b63"))
+    buttons = {}
+
+    def show_conditions(items):
+        # Reuse the buttons that are still listed, only create or destroy the difference
+        for item in list(buttons):
+            if item not in items:
+                buttons.pop(item).destroy()
+        for item in items:
+            btn = buttons.get(item)
+            if btn is None:
+                btn = tk.Button(text_frame, text=item, font=("Segoe UI", int(18*scale_factor), "bold"), fg="white", bg="#284b63",
+                                activebackground="#3b6a8d", activeforeground="white", width=28, relief="flat", bd=0,
+                                cursor="hand2", padx=10, pady=10, command=lambda i=item: callback(i) if callback else print(f"{i} clicked!"))
+                btn.bind("<Enter>", lambda e: e.widget.config(bg="#3b6a8d"))
+                btn.bind("<Leave>", lambda e: e.widget.config(bg="#284b63"))
+                buttons[item] = btn
+            btn.pack_forget()
+            btn.pack(pady=8, padx=12)
+
+    show_conditions(info_list)
+
+    if region is not None:
+        def on_protocols_changed(changed_body_parts):
+            if protocol_db.region_changed(region, changed_body_parts):
+                show_conditions(protocol_db.region_ailments(region))
+
+        protocol_db.add_listener(on_protocols_changed)
+        text_frame.bind("<Destroy>", lambda e: protocol_db.remove_listener(on_protocols_changed), add="+")
 
     # Sidebar
     sidebar = tk.Frame(root, bg="gray20")
     sidebar.grid(row=1, column=2, padx=10, pady=10, sticky="ne")
     create_sidebar_buttons(sidebar, scale_factor, root)
 
-def main():
-    root = tk.Tk()
-    root.title("Lumino Pro - Cervical Spine")
-    root.attributes('-fullscreen', True)
-
-    screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
-    scale_factor = min(screen_width / 1300, screen_height / 750)
-
-    root.geometry(f"{int(1300 * scale_factor)}x{int(750 * scale_factor)}")
-    root.configure(bg="gray20")
-
+def build_screen(root, router):
     neck_img_name = r"bodyparts\Neck.png"
     anatomy_img_name = r"anatomy.png"
 
-    neck_photo, anatomy_photo = load_and_resize_images(neck_img_name, anatomy_img_name, scale_factor)
+    neck_photo, anatomy_photo = load_and_resize_images(neck_img_name, anatomy_img_name, router.scale_factor)
 
     create_layout(
         root,
         anatomy_photo,
         neck_photo,
-        scale_factor,
+        router.scale_factor,
         title="Lumino Pro",
         scroll_title="Cervical Spine",
-        info_list=list(therapy_data.keys()),
+        region=REGION,
         callback=on_condition_selected
     )
 
-    root.mainloop()
+    # Keep the PhotoImages alive for as long as the screen exists
+    return neck_photo, anatomy_photo
+
+screen_router.register_screen("neck", build_screen, title="Lumino Pro - Cervical Spine")
+
+def main():
+    screen_router.run("neck")
 
 if __name__ == "__main__":
     main()
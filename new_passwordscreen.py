@@ -1,19 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import subprocess
-import os
-import sys
 import configparser
 from pathlib import Path
+import screen_router
 
 PASSWORD = "1234"
 
-class PasswordApp(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("Ray of Hope")
-        self.state('zoomed')
+class PasswordApp(tk.Frame):
+    def __init__(self, parent):
+        super().__init__(parent)
         self.configure(bg="#2E3440")
+        self.pack(fill="both", expand=True)
 
         # Style setup
         self.style = ttk.Style(self)
@@ -92,13 +89,12 @@ class PasswordApp(tk.Tk):
 
                 selected_mode = config.get('DEFAULT', 'selected_mode', fallback='automode.py')
                 selected_mode = Path(selected_mode).name  # Remove any folders if present
-                target_script = self.base_dir / selected_mode
+                target_screen = screen_router.screen_for_script(selected_mode)
 
-                if not target_script.exists():
-                    raise FileNotFoundError(f"Script not found:\n{target_script}")
+                if target_screen is None:
+                    raise FileNotFoundError(f"No screen registered for:\n{selected_mode}")
 
-                subprocess.Popen([sys.executable, str(target_script)])
-                self.destroy()
+                screen_router.navigate(target_screen)
 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to launch the main script:\n{e}")
@@ -108,28 +104,16 @@ class PasswordApp(tk.Tk):
                 messagebox.showwarning("Access Denied", f"Incorrect password. {self.attempts_left} attempts left.")
             else:
                 messagebox.showerror("Machine Locked", "Machine Locked! Too many failed attempts.")
-                self.after(5000, self.destroy)
+                self.after(5000, self.winfo_toplevel().destroy)
             self.clear_display()
 
     def show_instructions(self):
-        try:
-            script_path = self.base_dir / "instruction_page1.py"
-            if not script_path.exists():
-                raise FileNotFoundError("Instructions page missing.")
-            subprocess.Popen([sys.executable, str(script_path)])
-            self.destroy()
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not open instructions:\n{e}")
+        screen_router.navigate("instruction_page1")
 
     def open_setting_page(self):
-        try:
-            script_path = self.base_dir / "setting_page.py"
-            if not script_path.exists():
-                raise FileNotFoundError("Settings page missing.")
-            subprocess.Popen([sys.executable, str(script_path)])
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not open settings:\n{e}")
+        screen_router.navigate("settings")
+
+screen_router.register_screen("home", lambda root, router: PasswordApp(root), title="Ray of Hope", cache=False)
 
 if __name__ == "__main__":
-    app = PasswordApp()
-    app.mainloop()
+    screen_router.run("home")
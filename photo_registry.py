@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# === Shared PhotoImage registry ===
+# Several screens show the same picture at the same size (anatomy.png above
+# all). get() hands out one PhotoImage per key and records which screen holds
+# it. The screen router marks the screen being built with holder() and calls
+# release() when it destroys that screen. Images nobody holds any more stay
+# around for a quick revisit until they exceed UNHELD_BUDGET_MB, and are then
+# dropped oldest first.
+UNHELD_BUDGET_MB = 32
+
+_entries = OrderedDict()   # key -> [photo, holders, bytes], least recently used first
+_holders = []              # Stack of screens currently being built
+hits = 0
+misses = 0
+
+
+@contextmanager
+def holder(owner):
+    """Every image fetched inside this block is recorded as held by `owner`."""
+    _holders.append(owner)
+    try:
+        yield
+    finally:
+        _holders.pop()
+
+
+def _photo_bytes(photo):
+    try:
+        return photo.width() * photo.height() * 4
+    except Exception:
+        return 0
+
+
+def get(key, loader):
+    """Returns the shared PhotoImage for `key`, calling loader() to create it on first use."""
+    global hits, misses
+    entry = _entries.get(key)
+    if entry is None:
+        misses += 1
+        photo = loader()
+        entry = [photo, set(), _photo_bytes(photo)]
+        _entries[key] = entry
+    else:
+        hits += 1
+        _entries.move_to_end(key)
+    if _holders:
+        entry[1].add(_holders[-1])
+    trim()
+    return entry[0]
+
+
+def discard(key, photo=None):
+    """Forgets `key` (only if it still maps to `photo`, when given), so the next get() loads it again."""
+    entry = _entries.get(key)
+    if entry is not None and (photo is None or entry[0] is photo):
+        del _entries[key]
+
+
+def release(owner):
+    """Drops every hold `owner` has, e.g. when its screen is destroyed."""
+    for entry in _entries.values():
+        entry[1].discard(owner)
+    trim()
+
+
+def unheld_bytes():
+    return sum(entry[2] for entry in _entries.values() if not entry[1])
+
+
+def trim(budget_mb=None):
+    """Forgets the oldest unheld images until they fit the budget."""
+    budget = (UNHELD_BUDGET_MB if budget_mb is None else budget_mb) * 1024 * 1024
+    excess = unheld_bytes() - budget
+    if excess <= 0:
+        return
+    for key in [key for key, entry in _entries.items() if not entry[1]]:
+        excess -= _entries.pop(key)[2]
+        if excess <= 0:
+            break
+
+
+def stats():
+    return {
+        "images": len(_entries),
+        "held": sum(1 for entry in _entries.values() if entry[1]),
+        "total_mb": sum(entry[2] for entry in _entries.values()) / (1024 * 1024),
+        "unheld_mb": unheld_bytes() / (1024 * 1024),
+        "hits": hits,
+        "misses": misses,
+    }
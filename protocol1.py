@@ -1,9 +1,8 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
 from pathlib import Path
-import subprocess
-import sys
+import screen_router
+import image_cache
 
 # -------------------- CONFIG --------------------
 
@@ -12,26 +11,25 @@ BASE_DIR = Path(__file__).resolve().parent.parent  # One level up from this scri
 
 # Paths
 IMG_PATH = BASE_DIR / "image" / "anatomy.png"
-SEARCH_PAGE_SCRIPT = BASE_DIR / "PythonProject" / "search_page.py"
 
 # List of (x, y, label) for clickable points (calculated below image load)
 points = []
 
-# Script mapping (relative and dynamic)
-SCRIPT_MAP = {
-    "Neck": BASE_DIR / "PythonProject" / "neck_cervicalspine.py",
-    "Shoulder": BASE_DIR / "PythonProject" / "shoulder.py",
-    "Elbow": BASE_DIR / "PythonProject" / "Elbow.py",
-    "Wrist": BASE_DIR / "PythonProject" / "Wrist.py",
-    "Lumbar Spine": BASE_DIR / "PythonProject" / "lumberspine.py",
-    "Muscle Condition": BASE_DIR / "PythonProject" / "muscle_condition.py",
-    "Ankle": BASE_DIR / "PythonProject" / "ankle.py",
-    "TMJ": BASE_DIR / "PythonProject" / "TMJ.py",
-    "Hip": BASE_DIR / "PythonProject" / "Hip.py",
-    "Knee": BASE_DIR / "PythonProject" / "knee.py",
-    "Foot": BASE_DIR / "PythonProject" / "foot.py",
-    "Neuropathy": BASE_DIR / "PythonProject" / "neuropathy.py",
-    "Skin Condition": BASE_DIR / "PythonProject" / "skin.py",
+# Point label -> screen name registered with screen_router
+SCREEN_MAP = {
+    "Neck": "neck",
+    "Shoulder": "shoulder",
+    "Elbow": "elbow",
+    "Wrist": "wrist",
+    "Lumbar Spine": "lumbar_spine",
+    "Muscle Condition": "muscle_condition",
+    "Ankle": "ankle",
+    "TMJ": "tmj",
+    "Hip": "hip",
+    "Knee": "knee",
+    "Foot": "foot",
+    "Neuropathy": "neuropathy",
+    "Skin Condition": "skin",
 }
 
 # -------------------- GUI CLASS --------------------
@@ -39,12 +37,10 @@ SCRIPT_MAP = {
 class AnatomyImageGUI:
     def __init__(self, root):
         self.root = root
-        self.root.title("Anatomy Image with Points")
 
         # Load image
-        img = Image.open(IMG_PATH)
-        widthimg, heightimg = img.size
-        self.photo = ImageTk.PhotoImage(img)
+        widthimg, heightimg = image_cache.source_size(IMG_PATH)
+        self.photo = image_cache.load_original(IMG_PATH)
 
         global points
         points = [
@@ -110,33 +106,24 @@ class AnatomyImageGUI:
         ).pack(pady=30)
 
     def launch_search_page(self):
-        if SEARCH_PAGE_SCRIPT.exists():
-            try:
-                subprocess.Popen([sys.executable, str(SEARCH_PAGE_SCRIPT)])
-            except Exception as e:
-                messagebox.showerror("Launch Error", f"Could not launch search page:\n{e}")
-        else:
-            messagebox.showwarning("Script Not Found", f"Search page script not found:\n{SEARCH_PAGE_SCRIPT}")
+        screen_router.navigate("search")
 
     def on_click(self, event):
         RADIUS = 6
         for x, y, label in points:
             if (event.x - x) ** 2 + (event.y - y) ** 2 <= RADIUS ** 2:
-                script_path = SCRIPT_MAP.get(label)
-                if script_path and script_path.exists():
-                    try:
-                        subprocess.Popen([sys.executable, str(script_path)])
-                    except Exception as e:
-                        messagebox.showerror("Launch Error", f"Could not launch script for {label}:\n{e}")
+                screen_name = SCREEN_MAP.get(label)
+                if screen_name:
+                    screen_router.navigate(screen_name)
                 elif label == "Neuropathy":
                     messagebox.showinfo("Information", f"Script for '{label}' is not yet configured.")
                 else:
                     messagebox.showwarning("Script Not Found", f"No script mapped for: {label}")
                 break
 
+screen_router.register_screen("protocol", lambda root, router: AnatomyImageGUI(root),
+                              title="Anatomy Image with Points")
+
 # Run the app
 if __name__ == "__main__":
-    root = tk.Tk()
-    root.geometry("1200x800")
-    app = AnatomyImageGUI(root)
-    root.mainloop()
+    screen_router.run("protocol")
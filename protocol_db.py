@@ -0,0 +1,227 @@
+import math
+import os
+import tempfile
+from collections import namedtuple
+import protocol_file
+import protocol_compiler
+
+# === Protocol database ===
+# data_set.csv is the single source of therapy parameters. It is compiled into
+# protocols.bin (see protocol_file.py), which is memory-mapped and queried by
+# (BodyPart, Ailment, stage) without parsing anything. The sheet is only
+# compiled again (protocol_compiler.py) when it is newer than the compiled
+# file. data_set.xlsx holds the same rows on its first sheet ("Protocols") and
+# is only used when the CSV is missing (needs openpyxl); its "Sheet1" is the
+# original dosing sheet with its formulas.
+#
+# The body-part pages' rows carry the BodyPart label the monitor shows. Auto
+# mode picks a region and a stage but no ailment: its rows are in the
+# "Auto Mode" group, one per region, with power and frequency per stage. The
+# original reference rows are flagged in the Reference column and compiled
+# under "Reference: <BodyPart>", which no screen looks up.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CSV_PATH = os.path.join(BASE_DIR, "data_set.csv")
+XLSX_PATH = os.path.join(BASE_DIR, "data_set.xlsx")
+BIN_PATH = os.path.join(BASE_DIR, "protocols.bin")
+
+STAGES = ("Acute", "Subacute", "Chronic")
+# Body-part pages have no stage picker; their values are stored as the chronic ones
+DEFAULT_STAGE = "Chronic"
+AUTO_BODY_PART = "Auto Mode"
+
+# Anatomy labels used by the screens -> BodyPart of their rows in the data set
+REGIONS = {
+    "Neck": "Cervical Spine",
+    "Shoulder": "Shoulder",
+    "Elbow": "Elbow",
+    "Wrist": "Wrist",
+    "Lumbar Spine": "Lumbar Spine",
+    "Ankle": "Ankle",
+    "TMJ": "TMJ",
+    "Hip": "Hip",
+    "Knee": "Knee",
+    "Foot": "Foot",
+    "Neuropathy": "Neuropathy",
+    "Muscle Condition": "Muscle",
+    "Skin Condition": "Skin",
+}
+
+Protocol = namedtuple("Protocol", ["body_part", "ailment", "stage", "power", "frequency", "time_min", "total_energy",
+                                   "avg_power", "size", "area", "skin_tone"])
+
+
+def _key(text):
+    return str(text).strip().lower()
+
+
+def _stored(value):
+    """Turns a stored float back into what the data set said: int, float or None."""
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else value
+
+
+def _source_path():
+    return CSV_PATH if os.path.exists(CSV_PATH) else XLSX_PATH
+
+
+class ProtocolDB:
+    def __init__(self, path):
+        self.path = path
+        self._file = protocol_file.ProtocolFile(path)
+
+    def __len__(self):
+        return len(self._file)
+
+    def close(self):
+        self._file.close()
+
+    def _protocol(self, index, stage_index):
+        f = self._file
+        record = f.record(index)
+        # Powers, frequencies, times and energies follow the row's own fields, one per stage
+        power, frequency, time_min, total_energy = record[protocol_file.STAGE_VALUES + stage_index::len(STAGES)]
+        if math.isnan(time_min) or math.isnan(total_energy):
+            return None  # Stage not specified for this ailment
+        body_part, ailment, size, area, skin_tone, avg_power = record[:protocol_file.STAGE_VALUES]
+        return Protocol(f.string(body_part), f.string(ailment), STAGES[stage_index],
+                        _stored(power), _stored(frequency), _stored(time_min), _stored(total_energy),
+                        _stored(avg_power), f.string(size), f.string(area), f.string(skin_tone))
+
+    def get(self, body_part, ailment, stage=DEFAULT_STAGE):
+        """Protocol for an ailment at a stage, or None."""
+        stage_keys = [_key(s) for s in STAGES]
+        if _key(stage) not in stage_keys:
+            return None
+        index = self._file.find(body_part, ailment)
+        if index is None:
+            return None
+        return self._protocol(index, stage_keys.index(_key(stage)))
+
+    def ailments(self, body_part):
+        """Ailment names for a body part in data set order."""
+        first, count = self._file.group(body_part)
+        return [self._file.string(self._file.record(i)[1]) for i in range(first, first + count)]
+
+
+def _is_stale(bin_path):
+    source = _source_path()
+    if not os.path.exists(bin_path):
+        return True
+    # A deployment may ship only the compiled file
+    return os.path.exists(source) and os.path.getmtime(source) > os.path.getmtime(bin_path)
+
+
+def _compile(bin_path, incremental=True):
+    stats = protocol_compiler.compile_sheet(_source_path(), bin_path, incremental=incremental)
+    print(f"DEBUG: Compiled {stats['rows']} protocols into {bin_path}")
+
+
+def _open_compiled():
+    """Opens protocols.bin, recompiling it first if the data set changed."""
+    for bin_path in (BIN_PATH, os.path.join(tempfile.gettempdir(), "lumino_protocols.bin")):
+        try:
+            if _is_stale(bin_path):
+                _compile(bin_path)
+            try:
+                return ProtocolDB(bin_path)
+            except protocol_file.ProtocolFileError as e:
+                # e.g. written by an older version of the app
+                print(f"DEBUG: Rebuilding {bin_path}: {e}")
+                _compile(bin_path, incremental=False)
+                return ProtocolDB(bin_path)
+        except (OSError, protocol_file.ProtocolFileError, protocol_compiler.ProtocolCompileError) as e:
+            print(f"DEBUG: Could not use {bin_path}: {e}")
+    raise RuntimeError("No usable protocol file could be built from the data set")
+
+
+_db = None
+_listeners = []
+
+
+def get_db():
+    """Opens the compiled protocols on first use and returns the shared database."""
+    global _db
+    if _db is None:
+        _db = _open_compiled()
+    return _db
+
+
+def source_path():
+    """The spreadsheet the protocols are compiled from."""
+    return _source_path()
+
+
+def add_listener(callback):
+    """Calls callback(changed_body_parts) after every reload that changed something."""
+    _listeners.append(callback)
+
+
+def remove_listener(callback):
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def reload():
+    """Recompiles the rows that changed in the sheet and swaps in the new catalog.
+
+    Returns the set of data set body parts whose protocols changed and tells
+    every listener about them.
+    """
+    global _db
+    if _db is None:
+        get_db()
+        return set()
+    path = _db.path
+    # Windows cannot replace a file that is still mapped
+    _db.close()
+    try:
+        stats = protocol_compiler.compile_sheet(_source_path(), path)
+    finally:
+        _db = ProtocolDB(path)
+    changed = set(stats["changed_body_parts"])
+    if changed:
+        print(f"DEBUG: Reloaded protocols, changed: {', '.join(sorted(changed))}")
+        for callback in list(_listeners):
+            try:
+                callback(changed)
+            except Exception as e:
+                print(f"Error in protocol listener: {e}")
+    return changed
+
+
+def region_ailments(region):
+    """Ailments listed for an anatomy region, e.g. "Knee" or "Skin Condition"."""
+    return get_db().ailments(REGIONS[region])
+
+
+def lookup(region, ailment, stage=DEFAULT_STAGE):
+    return get_db().get(REGIONS[region], ailment, stage)
+
+
+def region_changed(region, changed_body_parts):
+    return _key(REGIONS[region]) in {_key(b) for b in changed_body_parts}
+
+
+def auto_protocol(region, stage):
+    """Auto mode's protocol for a region at a stage, or None."""
+    return get_db().get(AUTO_BODY_PART, region, stage)
+
+
+def auto_stages(region):
+    """Stages auto mode has a protocol for in the region."""
+    return [stage for stage in STAGES if auto_protocol(region, stage) is not None]
+
+
+def auto_changed(changed_body_parts):
+    return _key(AUTO_BODY_PART) in {_key(b) for b in changed_body_parts}
+
+
+def therapy_data(protocol):
+    """The "Therapy Data" block therapy.py reads from temp_selection.json."""
+    return {
+        "Power": protocol.power,
+        "Pulse Freq": protocol.frequency,
+        "Time": protocol.time_min,
+        "Total Energy": protocol.total_energy,
+    }
@@ -0,0 +1,299 @@
+import math
+import mmap
+import os
+import shutil
+import struct
+
+# === Binary protocol file ===
+# A read-only, memory-mapped image of the protocol catalog. Nothing is parsed
+# on open: lookups hash the key, probe an on-disk table and unpack a single
+# fixed-width record, so load time does not grow with the number of protocols.
+#
+# Layout (little endian, every section 8-byte aligned):
+#   header
+#   string offsets   u32[string_count + 1]  into the string blob
+#   string blob      UTF-8, interned BodyPart/Ailment/Size/Area/SkinTone values
+#   string hash      u32[string_hash_size]  string id + 1, 0 = empty
+#   records          RECORD[record_count], grouped by body part in data set order
+#   record hash      u32[record_hash_size]  record index + 1, keyed on (body part, ailment)
+#   groups           GROUP[group_count]     sorted by body part string id
+# Missing numbers (e.g. a stage without values) are stored as NaN, missing
+# strings as NO_STRING. Version 2 stores power and frequency per stage, as auto
+# mode's protocols vary them; version 3 adds Avg Power, Size, Area and SkinTone.
+#
+# Records are fixed width, so when a sheet edit only changes the values of
+# existing rows (same keys in the same order), update() rewrites just those
+# records in a copy of the file instead of building it again.
+
+MAGIC = b"LPPROT"
+VERSION = 3
+STAGE_COUNT = 3
+NO_STRING = 0xFFFFFFFF
+
+HEADER = struct.Struct("<6sHIIIIIIIIIII")  # magic, version, counts, section offsets/sizes, reserved
+# body part, ailment, size, area, skin tone (string ids), avg power,
+# then per stage: powers, frequencies, times, energies
+RECORD = struct.Struct("<IIIII4xd3d3d3d3d")
+STAGE_VALUES = 6  # Index of the first per-stage value in an unpacked record
+GROUP = struct.Struct("<III")           # body part string id, first record, record count
+U32 = struct.Struct("<I")
+
+
+class ProtocolFileError(Exception):
+    pass
+
+
+def _normalize(text):
+    return str(text).strip().lower()
+
+
+def _hash(text):
+    """FNV-1a over the normalized UTF-8 text."""
+    h = 0x811C9DC5
+    for byte in _normalize(text).encode("utf-8"):
+        h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def _pair_hash(body_part_id, ailment_id):
+    return ((body_part_id * 0x9E3779B1) ^ (ailment_id * 0x85EBCA77)) & 0xFFFFFFFF
+
+
+def _table_size(count):
+    size = 8
+    while size < count * 2:
+        size *= 2
+    return size
+
+
+def _align(buf):
+    buf.extend(b"\0" * (-len(buf) % 8))
+
+
+def _float(value):
+    return math.nan if value is None else float(value)
+
+
+def _values(row):
+    """The numbers of a record: avg power, then powers, frequencies, times and energies per stage."""
+    return (_float(row[5]), *[_float(v) for values in row[6:10] for v in values])
+
+
+def _record_order(body_parts):
+    """Row positions in record order: grouped by body part, in data set order inside each group."""
+    grouped = {}
+    for position, body_part in enumerate(body_parts):
+        grouped.setdefault(_normalize(body_part), []).append(position)
+    return [position for positions in grouped.values() for position in positions]
+
+
+def write(path, rows):
+    """Writes protocol rows to `path`.
+
+    Each row is (body_part, ailment, size, area, skin_tone, avg_power, powers,
+    frequencies, times, energies). Size, area, skin tone and avg power may be
+    None; the last four hold one value (or None) per stage.
+    """
+    strings, string_ids, raw_ids = [], {}, {}
+
+    def intern(text):
+        string_id = raw_ids.get(text)
+        if string_id is None:
+            key = _normalize(text)
+            if key not in string_ids:
+                string_ids[key] = len(strings)
+                strings.append(str(text).strip())
+            string_id = raw_ids[text] = string_ids[key]
+        return string_id
+
+    def intern_optional(text):
+        return NO_STRING if text is None or not str(text).strip() else intern(text)
+
+    # Group by body part, keeping data set order inside each group
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(intern(row[0]), []).append(row)  # Same order as _record_order()
+
+    records, groups = [], []
+    for body_part_id, group_rows in grouped.items():
+        groups.append((body_part_id, len(records), len(group_rows)))
+        for row in group_rows:
+            records.append((body_part_id, intern(row[1]),
+                            intern_optional(row[2]), intern_optional(row[3]), intern_optional(row[4]), *_values(row)))
+    groups.sort()
+
+    body = bytearray()
+    blob = [s.encode("utf-8") for s in strings]
+
+    strings_offset = HEADER.size + (-HEADER.size % 8)
+    body.extend(b"\0" * strings_offset)
+    offset = 0
+    for data in blob:
+        body.extend(U32.pack(offset))
+        offset += len(data)
+    body.extend(U32.pack(offset))
+    for data in blob:
+        body.extend(data)
+    _align(body)
+
+    string_hash_offset = len(body)
+    string_hash_size = _table_size(len(strings))
+    table = [0] * string_hash_size
+    for string_id, text in enumerate(strings):
+        slot = _hash(text) & (string_hash_size - 1)
+        while table[slot]:
+            slot = (slot + 1) & (string_hash_size - 1)
+        table[slot] = string_id + 1
+    body.extend(struct.pack(f"<{string_hash_size}I", *table))
+    _align(body)
+
+    records_offset = len(body)
+    body.extend(b"".join(RECORD.pack(*record) for record in records))
+    _align(body)
+
+    record_hash_offset = len(body)
+    record_hash_size = _table_size(len(records))
+    table = [0] * record_hash_size
+    for index, record in enumerate(records):
+        slot = _pair_hash(record[0], record[1]) & (record_hash_size - 1)
+        while table[slot]:
+            slot = (slot + 1) & (record_hash_size - 1)
+        table[slot] = index + 1
+    body.extend(struct.pack(f"<{record_hash_size}I", *table))
+    _align(body)
+
+    groups_offset = len(body)
+    for group in groups:
+        body.extend(GROUP.pack(*group))
+
+    body[:HEADER.size] = HEADER.pack(MAGIC, VERSION, len(records), len(strings), len(groups),
+                                     strings_offset, string_hash_offset, string_hash_size,
+                                     records_offset, record_hash_offset, record_hash_size,
+                                     groups_offset, 0)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(body)
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+def update(path, body_parts, rows):
+    """Rewrites some records of the catalog at `path` in place.
+
+    `body_parts` is the body part of every row in data set order and `rows`
+    maps a row position to its new row. The rows must keep the (body part,
+    ailment) keys and order the catalog was written with, so its groups and
+    hash tables still hold. Returns False, leaving the file alone, if a row
+    needs a string the catalog does not have; the caller then writes it in full.
+    """
+    record_index = {position: index for index, position in enumerate(_record_order(body_parts))}
+    catalog = ProtocolFile(path)
+
+    def stored_id(text):
+        # Exactly as spelled: a full write would store a new spelling
+        string_id = catalog.string_id(text)
+        return string_id if string_id is not None and catalog.string(string_id) == str(text).strip() else None
+
+    try:
+        if catalog.record_count != len(body_parts):
+            return False
+        patches = []
+        for position, row in rows.items():
+            ids = [stored_id(row[0]), stored_id(row[1])]
+            ids += [NO_STRING if text is None else stored_id(text) for text in row[2:5]]
+            if None in ids:
+                return False
+            patches.append((catalog._records + RECORD.size * record_index[position], RECORD.pack(*ids, *_values(row))))
+    finally:
+        catalog.close()
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.copyfile(path, tmp_path)
+    with open(tmp_path, "r+b") as f:
+        for offset, data in patches:
+            f.seek(offset)
+            f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+class ProtocolFile:
+    """Read-only view of a protocol file. Records are unpacked on access."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            raise ProtocolFileError(f"{path} is too short to be a protocol file")
+        (magic, version, self.record_count, self.string_count, self.group_count,
+         self._strings, self._string_hash, self._string_hash_size,
+         self._records, self._record_hash, self._record_hash_size,
+         self._groups, _) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ProtocolFileError(f"{path} is not a protocol file")
+        if version != VERSION:
+            raise ProtocolFileError(f"{path} has version {version}, expected {VERSION}")
+        self._blob = self._strings + 4 * (self.string_count + 1)
+
+    def close(self):
+        self._map.close()
+
+    def __len__(self):
+        return self.record_count
+
+    def string(self, string_id):
+        if string_id == NO_STRING:
+            return None
+        start, end = struct.unpack_from("<II", self._map, self._strings + 4 * string_id)
+        return self._map[self._blob + start:self._blob + end].decode("utf-8")
+
+    def string_id(self, text):
+        """Id of an interned string (case-insensitive), or None."""
+        key = _normalize(text)
+        mask = self._string_hash_size - 1
+        slot = _hash(key) & mask
+        while True:
+            entry = U32.unpack_from(self._map, self._string_hash + 4 * slot)[0]
+            if entry == 0:
+                return None
+            if _normalize(self.string(entry - 1)) == key:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def record(self, index):
+        """Raw record tuple: ids for strings, floats (NaN when missing) for numbers."""
+        return RECORD.unpack_from(self._map, self._records + RECORD.size * index)
+
+    def find(self, body_part, ailment):
+        """Index of the record for (body_part, ailment), or None."""
+        body_part_id, ailment_id = self.string_id(body_part), self.string_id(ailment)
+        if body_part_id is None or ailment_id is None:
+            return None
+        mask = self._record_hash_size - 1
+        slot = _pair_hash(body_part_id, ailment_id) & mask
+        while True:
+            entry = U32.unpack_from(self._map, self._record_hash + 4 * slot)[0]
+            if entry == 0:
+                return None
+            record = self.record(entry - 1)
+            if record[0] == body_part_id and record[1] == ailment_id:
+                return entry - 1
+            slot = (slot + 1) & mask
+
+    def group(self, body_part):
+        """(first record, count) for a body part, found by binary search over the groups."""
+        body_part_id = self.string_id(body_part)
+        if body_part_id is None:
+            return 0, 0
+        low, high = 0, self.group_count
+        while low < high:
+            mid = (low + high) // 2
+            group_id, first, count = GROUP.unpack_from(self._map, self._groups + GROUP.size * mid)
+            if group_id == body_part_id:
+                return first, count
+            if group_id < body_part_id:
+                low = mid + 1
+            else:
+                high = mid
+        return 0, 0
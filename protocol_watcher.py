@@ -0,0 +1,106 @@
+import os
+import tkinter as tk
+import protocol_db
+
+# inotify is optional: without it (or on Windows) the sheet is polled
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+
+# === Protocol hot reload ===
+# Watches the protocol spreadsheet from the Tk event loop and calls
+# protocol_db.reload() when it changes. Screens that subscribed with
+# protocol_db.add_listener() then update their condition lists in place.
+POLL_INTERVAL_MS = 2000
+# Editors often write a file in several steps; wait for it to settle
+SETTLE_MS = 300
+
+
+class ProtocolWatcher:
+    def __init__(self, root, path=None, interval_ms=POLL_INTERVAL_MS):
+        self.root = root
+        self.path = path or protocol_db.source_path()
+        self.interval_ms = interval_ms
+        self.reloads = 0
+        self._signature = self._read_signature()
+        self._after_id = None
+        self._inotify = None
+
+    def _read_signature(self):
+        """Cheap change check: modification time and size of the sheet."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def start(self):
+        if INotify is not None and hasattr(self.root.tk, "createfilehandler"):
+            try:
+                self._inotify = INotify()
+                self._inotify.add_watch(os.path.dirname(os.path.abspath(self.path)),
+                                        flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE)
+                self.root.tk.createfilehandler(self._inotify.fileno(), tk.READABLE, self._on_inotify)
+                print(f"DEBUG: Watching {self.path} with inotify")
+                return
+            except (OSError, tk.TclError) as e:
+                print(f"DEBUG: inotify unavailable ({e}), polling instead")
+                self._inotify = None
+        self._after_id = self.root.after(self.interval_ms, self._poll)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self._inotify is not None:
+            self.root.tk.deletefilehandler(self._inotify.fileno())
+            self._inotify.close()
+            self._inotify = None
+
+    def _on_inotify(self, fd, mask):
+        name = os.path.basename(self.path)
+        if any(event.name == name for event in self._inotify.read(timeout=0)):
+            if self._after_id is None:
+                self._after_id = self.root.after(SETTLE_MS, self._check_once)
+
+    def _check_once(self):
+        self._after_id = None
+        self.check()
+
+    def _poll(self):
+        self.check()
+        self._after_id = self.root.after(self.interval_ms, self._poll)
+
+    def check(self):
+        """Reloads the protocols if the sheet changed since the last check."""
+        signature = self._read_signature()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            protocol_db.reload()
+        except Exception as e:
+            print(f"Protocol reload failed: {e}")
+            return False
+        self.reloads += 1
+        return True
+
+
+_watcher = None
+
+
+def start(root):
+    """Starts watching the protocol sheet for the app's root window."""
+    global _watcher
+    if _watcher is None:
+        _watcher = ProtocolWatcher(root)
+        _watcher.start()
+    return _watcher
+
+
+def stop():
+    global _watcher
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher = None
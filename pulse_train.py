@@ -0,0 +1,126 @@
+import math
+
+# NumPy is optional: it is only needed to evaluate many instants in one call
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# === Pulse train energy model ===
+# The laser output over a session, exactly:
+#
+#   CW                one pulse that lasts the whole session
+#   Pulse/Frequency   a pulse of `pulse_duration` at the start of every 1/frequency
+#                     period; the last period may be cut short by the end of the
+#                     session, and so may its pulse
+#   Pulse/Single      one pulse of `pulse_duration` at the start of the session
+#
+# The pattern is periodic, so energy, on-time and pulse count at any instant
+# come from the number of whole periods plus the partial one. The cost is the
+# same at 10 kHz over 15 minutes (9 million pulses) as for a single pulse.
+# Nothing is materialized. The functions that take a time also accept a NumPy
+# array of times and return an array.
+
+# Treat a session ending within this fraction of a period of a pulse edge as ending on it
+EDGE_TOLERANCE = 1e-9
+
+
+class PulseTrain:
+    def __init__(self, peak_w, mode="CW", pulse_type="Frequency", pulse_duration=0.0, frequency=0.0):
+        self.peak_w = float(peak_w)
+        self.mode = mode
+        self.pulse_type = pulse_type
+        self.pulse_duration = float(pulse_duration)
+        self.frequency = float(frequency)
+
+    @property
+    def continuous(self):
+        # A pulse as long as its period leaves no gap: that is CW
+        return self.mode == "CW" or (self.pulse_type == "Frequency" and self.duty_cycle >= 1.0)
+
+    @property
+    def duty_cycle(self):
+        if self.mode == "CW":
+            return 1.0
+        if self.pulse_type != "Frequency" or self.frequency <= 0 or self.pulse_duration <= 0:
+            return 0.0
+        return min(1.0, self.pulse_duration * self.frequency)
+
+    def average_power(self):
+        """Mean output power of the running train. For a single pulse, its power while it is on,
+        which only holds for a session no longer than the pulse (see session_limit())."""
+        if self.mode == "Pulse" and self.pulse_type == "Single":
+            return self.peak_w if self.pulse_duration > 0 else 0.0
+        return self.peak_w * self.duty_cycle
+
+    def session_limit(self):
+        """Longest session this train delivers anything in: a single pulse is over after
+        `pulse_duration`. None for trains that keep going."""
+        if self.mode == "Pulse" and self.pulse_type == "Single":
+            return self.pulse_duration
+        return None
+
+    def _split(self, t):
+        """(whole periods, time into the current period) at session time `t`."""
+        x = t * self.frequency
+        if np is not None and isinstance(x, np.ndarray):
+            whole = np.floor(x + EDGE_TOLERANCE)
+            return whole, np.maximum(x - whole, 0.0) / self.frequency
+        whole = math.floor(x + EDGE_TOLERANCE)
+        return whole, max(x - whole, 0.0) / self.frequency
+
+    def on_time(self, t):
+        """Seconds the laser has been on after `t` seconds of session."""
+        if np is not None and isinstance(t, np.ndarray):
+            minimum = np.minimum
+        else:
+            minimum = min
+        if self.continuous:
+            return t
+        if self.mode != "Pulse" or self.pulse_duration <= 0:
+            return t * 0.0
+        if self.pulse_type == "Single":
+            return minimum(t, self.pulse_duration)
+        whole, into = self._split(t)
+        return whole * self.pulse_duration + minimum(into, self.pulse_duration)
+
+    def energy(self, t):
+        """Joules delivered after `t` seconds of session, including a partial final pulse."""
+        return self.peak_w * self.on_time(t)
+
+    def pulse_count(self, t):
+        """Pulses started within `t` seconds of session; a pulse cut short at the end counts."""
+        if self.mode == "Pulse" and self.pulse_duration <= 0:
+            return t * 0
+        if self.mode == "Pulse" and self.pulse_type == "Frequency":
+            if self.frequency <= 0:
+                return t * 0
+            whole, into = self._split(t)
+            count = whole + (into > 0)
+            return count.astype(np.int64) if np is not None and isinstance(count, np.ndarray) else int(count)
+        return (t > 0) * 1  # CW or a single pulse
+
+    def time_for_energy(self, energy_j):
+        """Session length that delivers `energy_j` exactly, or None if this train never does."""
+        if energy_j <= 0:
+            return 0.0
+        if self.peak_w <= 0 or self.average_power() <= 0:
+            return None
+        needed_on = energy_j / self.peak_w
+        if self.continuous:
+            return needed_on
+        if self.pulse_type == "Single":
+            return needed_on if needed_on <= self.pulse_duration else None
+        # Whole pulses, then the part of one more; a target that ends exactly on a pulse
+        # edge finishes with that pulse rather than at the start of the next period
+        pulses = math.floor(needed_on / self.pulse_duration + EDGE_TOLERANCE)
+        rest = needed_on - pulses * self.pulse_duration
+        if pulses == 0:
+            return needed_on  # Less than the tolerance into the first pulse
+        if rest <= self.pulse_duration * EDGE_TOLERANCE:
+            return (pulses - 1) / self.frequency + self.pulse_duration
+        return pulses / self.frequency + rest
+
+    def summary(self, t):
+        """Energy (J), on-time (s) and pulse count of a session of `t` seconds."""
+        return {"energy_j": self.energy(t), "on_time_s": self.on_time(t), "pulses": self.pulse_count(t)}
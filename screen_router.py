@@ -0,0 +1,367 @@
+import tkinter as tk
+from tkinter import messagebox
+import importlib
+import os
+import time
+from collections import OrderedDict, deque
+import monitor_zygote
+import photo_registry
+import protocol_watcher
+
+# === Screen registry ===
+# Every page module calls register_screen() at import time. The router only
+# knows which module owns which screen, so pages are imported lazily on the
+# first visit instead of all at startup.
+SCREEN_MODULES = {
+    "home": "new_passwordscreen",
+    "auto": "automode",
+    "protocol": "protocol1",
+    "therapy": "therapyq",
+    "search": "search_page",
+    "settings": "setting_page",
+    "indications": "indications",
+    "neck": "neck_cervicalspine",
+    "shoulder": "shoulder",
+    "elbow": "Elbow",
+    "wrist": "Wrist",
+    "lumbar_spine": "lumberspine",
+    "muscle_condition": "muscle_condition",
+    "ankle": "ankle",
+    "tmj": "TMJ",
+    "hip": "Hip",
+    "knee": "knee",
+    "foot": "foot",
+    "neuropathy": "neuropathy",
+    "skin": "skin",
+    "instruction_page1": "instruction_page1",
+    "instruction_page2": "instruction_page2",
+    "instruction_page3": "instruction_page3",
+    "instruction_page4": "instruction_page4",
+    "instruction_page5": "instruction_page5",
+    "instruction_page6": "instruction_page6",
+    "instruction_page7": "instruction_page7",
+}
+
+# Reference layout size the pages were designed against
+BASE_WIDTH, BASE_HEIGHT = 1300, 750
+
+# === Screen cache budget ===
+# Screens left behind are kept built but hidden, so going back to them is
+# instant. Least recently used screens are destroyed once any limit is hit.
+# Sized for the 1 GB Pi units; the hit/miss counts printed on every
+# transition show whether the budget is too small.
+CACHE_MAX_SCREENS = 8
+CACHE_IMAGE_BUDGET_MB = 64     # Decoded PhotoImage pixels held by hidden screens
+CACHE_RSS_BUDGET_MB = 350      # Whole-process resident memory
+
+# How many screens back() can walk back through
+HISTORY_LIMIT = 32
+
+_builders = {}
+_router = None
+
+
+def register_screen(name, builder, title="Lumino Pro", cache=True):
+    """Registers the function that builds a screen into a parent frame.
+
+    The builder is called as builder(parent, router). Whatever it returns is kept
+    alive for as long as the screen exists (PhotoImages, app objects, ...). If the
+    returned object has a close() method it is called before the screen is torn down,
+    and an on_show() method is called whenever a cached screen is shown again.
+    A can_leave() method is asked before the screen is left or the app quits;
+    returning False cancels that (e.g. to confirm stopping a running therapy).
+    Screens holding live state (e.g. a running therapy) should pass cache=False.
+    """
+    _builders[name] = (builder, title, cache)
+    return builder
+
+
+def _photo_images(obj, seen=None):
+    """Finds the PhotoImages a builder's return value keeps alive."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return []
+    seen.add(id(obj))
+    # tk.PhotoImage, or PIL's ImageTk.PhotoImage which wraps one
+    if isinstance(obj, tk.Image) or hasattr(obj, "_PhotoImage__photo"):
+        return [obj]
+    if isinstance(obj, (list, tuple, set)):
+        children = obj
+    elif isinstance(obj, dict):
+        children = obj.values()
+    elif hasattr(obj, "__dict__") and not isinstance(obj, tk.Misc):
+        children = vars(obj).values()
+    else:
+        return []
+    images = []
+    for child in children:
+        images.extend(_photo_images(child, seen))
+    return images
+
+
+def _widget_images(widget, seen):
+    """Finds the PhotoImages kept on the widgets of a tree (`label.image = photo`)."""
+    images = []
+    # master and other widgets are tk.Misc and skipped, so this never walks up the tree
+    for value in vars(widget).values():
+        images.extend(_photo_images(value, seen))
+    for child in widget.children.values():
+        images.extend(_widget_images(child, seen))
+    return images
+
+
+def image_bytes(screen, frame=None):
+    """Approximate memory taken by the decoded images of a screen (RGBA)."""
+    seen = set()
+    images = _photo_images(screen, seen)
+    if frame is not None:
+        images.extend(_widget_images(frame, seen))
+    total = 0
+    for image in images:
+        try:
+            total += image.width() * image.height() * 4
+        except (tk.TclError, RuntimeError):
+            pass  # Image already deleted
+    return total
+
+
+def process_rss_bytes():
+    """Resident set size of this process, or 0 where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return 0
+
+
+def screen_for_script(script_path):
+    """Maps a page script path (e.g. from config.ini) to its screen name."""
+    # config.ini may hold a Windows path, so split on either separator
+    file_name = os.path.basename(str(script_path).replace("\\", "/"))
+    module_name = os.path.splitext(file_name)[0].lower()
+    for name, module in SCREEN_MODULES.items():
+        if module.lower() == module_name:
+            return name
+    return None
+
+
+class ScreenRouter:
+    """Owns the single long-lived Tk root and swaps page frames in place."""
+
+    def __init__(self, root=None):
+        self.root = root if root is not None else tk.Tk()
+        self.root.title("Lumino Pro")
+        self.root.attributes('-fullscreen', True)
+        self.root.configure(bg="gray20")
+
+        self.width = self.root.winfo_screenwidth()
+        self.height = self.root.winfo_screenheight()
+        self.scale_factor = min(self.width / BASE_WIDTH, self.height / BASE_HEIGHT)
+        self.root.geometry(f"{self.width}x{self.height}")
+        self.root.protocol("WM_DELETE_WINDOW", self.quit)
+
+        self.current = None      # Name of the visible screen
+        self.history = deque(maxlen=HISTORY_LIMIT)  # Screens to return to with back(); oldest dropped first
+        self._frame = None
+        self._screen = None      # Object returned by the current screen's builder
+        self.last_transition_ms = 0.0
+
+        # name -> (frame, screen, image bytes) of hidden screens, oldest first
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _builder_for(self, name):
+        if name not in _builders:
+            module = SCREEN_MODULES.get(name)
+            if module is None:
+                raise KeyError(f"Unknown screen: {name}")
+            importlib.import_module(module)
+        if name not in _builders:
+            raise KeyError(f"Module '{SCREEN_MODULES[name]}' did not register screen: {name}")
+        return _builders[name]
+
+    def _may_leave(self):
+        """Asks the visible screen whether it can be left now."""
+        can_leave = getattr(self._screen, "can_leave", None)
+        if not callable(can_leave):
+            return True
+        try:
+            return bool(can_leave())
+        except Exception as e:
+            print(f"Error asking screen '{self.current}' to leave: {e}")
+            return True
+
+    def _close_screen(self, frame, screen):
+        close = getattr(screen, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                print(f"Error closing screen: {e}")
+        frame.destroy()
+        photo_registry.release(frame)
+
+    def _hide_current(self):
+        """Moves the visible screen into the cache, or closes it if it is not cacheable."""
+        name, frame, screen = self.current, self._frame, self._screen
+        frame.pack_forget()
+        if self._builder_for(name)[2]:
+            stale = self._cache.pop(name, None)
+            if stale is not None:
+                self._close_screen(stale[0], stale[1])
+            self._cache[name] = (frame, screen, image_bytes(screen, frame))
+        else:
+            self._close_screen(frame, screen)
+        self._frame = self._screen = None
+
+    def _cached_image_bytes(self):
+        return sum(entry[2] for entry in self._cache.values())
+
+    def _over_budget(self):
+        if len(self._cache) > CACHE_MAX_SCREENS:
+            return True
+        return self._cached_image_bytes() > CACHE_IMAGE_BUDGET_MB * 1024 * 1024
+
+    def _evict_oldest(self, reason):
+        name, (frame, screen, _) = self._cache.popitem(last=False)
+        self._close_screen(frame, screen)
+        print(f"DEBUG: Evicted cached screen '{name}' ({reason})")
+
+    def _evict(self):
+        """Destroys least recently used hidden screens until the cache fits the budget."""
+        while self._cache and self._over_budget():
+            self._evict_oldest("screen/image budget")
+        # Freed memory shows up in RSS late, if at all, so re-measuring here would empty
+        # the whole cache: drop one screen per transition while the process is over budget
+        if self._cache and process_rss_bytes() > CACHE_RSS_BUDGET_MB * 1024 * 1024:
+            self._evict_oldest("RSS budget")
+
+    def clear_cache(self):
+        while self._cache:
+            _, (frame, screen, _) = self._cache.popitem(last=False)
+            self._close_screen(frame, screen)
+
+    def cache_stats(self):
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "screens": list(self._cache),
+            "image_mb": self._cached_image_bytes() / (1024 * 1024),
+            "rss_mb": process_rss_bytes() / (1024 * 1024),
+        }
+
+    def show(self, name, remember=True):
+        """Swaps screen `name` in for the current one, reusing a cached build if there is one.
+
+        Returns None, leaving the current screen up, if that screen refuses to be left.
+        """
+        start = time.perf_counter()
+        builder, title, _ = self._builder_for(name)
+        if self._frame is not None and not self._may_leave():
+            print(f"DEBUG: Screen '{self.current}' did not allow leaving for '{name}'")
+            return None
+
+        cached = self._cache.pop(name, None)
+        if cached is not None:
+            self.cache_hits += 1
+            frame, screen, _ = cached
+        else:
+            self.cache_misses += 1
+            frame = tk.Frame(self.root, bg="gray20")
+            try:
+                # Shared images fetched while building are held by this frame
+                with photo_registry.holder(frame):
+                    screen = builder(frame, self)
+            except Exception:
+                frame.destroy()
+                photo_registry.release(frame)
+                raise
+
+        # Only hide the old screen once the new one is ready
+        if self._frame is not None:
+            previous = self.current
+            self._hide_current()
+            if remember:
+                self.history.append(previous)
+
+        frame.pack(fill="both", expand=True)
+        self._frame, self._screen, self.current = frame, screen, name
+        self.root.title(title)
+        if cached is not None:
+            on_show = getattr(screen, "on_show", None)
+            if callable(on_show):
+                on_show()
+        self._evict()
+        self.root.update_idletasks()
+
+        self.last_transition_ms = (time.perf_counter() - start) * 1000
+        print(f"DEBUG: Screen '{name}' shown in {self.last_transition_ms:.1f} ms "
+              f"({'cached' if cached is not None else 'built'}; "
+              f"cache hits {self.cache_hits}, misses {self.cache_misses})")
+        return screen
+
+    def back(self):
+        """Returns to the previous screen, or to the home screen if there is none."""
+        if self.history:
+            self.show(self.history.pop(), remember=False)
+        elif self.current != "home":
+            self.show("home", remember=False)
+
+    def quit(self):
+        if self._frame is not None and not self._may_leave():
+            return
+        if self._frame is not None:
+            self._close_screen(self._frame, self._screen)
+            self._frame = self._screen = None
+        self.clear_cache()
+        protocol_watcher.stop()
+        print(f"DEBUG: Screen cache hits {self.cache_hits}, misses {self.cache_misses}")
+        print(f"DEBUG: Shared images {photo_registry.stats()}")
+        monitor_zygote.shutdown()
+        self.root.destroy()
+
+
+def get_router():
+    return _router
+
+
+def navigate(name):
+    """Switches the running app to screen `name`."""
+    if _router is None:
+        raise RuntimeError("Screen router is not running. Start the app with screen_router.run().")
+    if name is None:
+        # e.g. screen_for_script() did not recognise a page path
+        messagebox.showerror("Navigation Error", "That page is not available in this app.")
+        print("Navigation error: no screen name given")
+        return None
+    try:
+        return _router.show(name)
+    except Exception as e:
+        messagebox.showerror("Navigation Error", f"Could not open screen '{name}':\n{e}")
+        print(f"Navigation error: {e}")
+
+
+def go_back():
+    if _router is not None:
+        _router.back()
+
+
+def run(initial_screen="home"):
+    """Creates the app's only Tk root, shows `initial_screen` and enters the mainloop."""
+    global _router
+    _router = ScreenRouter()
+    # Build a hidden therapy monitor now so starting a session later is instant
+    monitor_zygote.prestart()
+    # Pick up edits to the protocol sheet while the app is running
+    protocol_watcher.start(_router.root)
+    _router.show(initial_screen)
+    _router.root.mainloop()
+
+
+if __name__ == "__main__":
+    # Run as a script this file is __main__, but the pages register their screens
+    # with (and navigate through) the imported screen_router module, so start that one
+    import screen_router
+    screen_router.run("home")
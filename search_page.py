@@ -1,52 +1,26 @@
 import tkinter as tk
 from tkinter import messagebox
 from neck_cervicalspine import create_sidebar_buttons
-import subprocess
-import sys
-
-# List of conditions
-ISSUES = sorted([
-    "Spondylosis", "Spondylo-arthrosis", "Spondylitis", "Frozen shoulder", "Swimmer's shoulder",
-    "Golfer's elbow", "Tennis elbow", "De Quervain's Tenosynovitis", "Tendinitis of wrist", "Carpal tunnel syndrome (CTS)",
-    "Degenerative Disc", "Herniated Discs", "Spondylolisthesis", "Spinal Stenosis", "Sciatica", "Sacroiliitis",
-    "Piriformis syndrome", "Muscle Spasm", "Strains", "Sprains", "Achilles tendinitis", "Ankle Sprain",
-    "TMDs", "GTPS", "ITBS", "Knee OA", "Runner's knee", "Jumper's knee", "Meniscus tear",
-    "Pes Anserine Bursitis", "Plantar fasciitis", "Morton's neuroma", "Diabetic neuropathy", "Burns",
-    "Bedsores/ Ulcer", "Wrinkles", "Stretch Marks", "Skin Rejuvenation", "Acne vulgaris", "Herpes simplex",
-    "Wound healing", "Toe Nail Fungus"
-])
-
-# Map conditions to body-part scripts
-CONDITION_TO_SCRIPT = {
-    "Frozen shoulder": "shoulder.py",
-    "Swimmer's shoulder": "shoulder.py",
-    "Tennis elbow": "elbow.py",
-    "Golfer's elbow": "elbow.py",
-    "De Quervain's Tenosynovitis": "wrist.py",
-    "Tendinitis of wrist": "wrist.py",
-    "Carpal tunnel syndrome (CTS)": "wrist.py",
-    "Achilles tendinitis": "ankle.py",
-    "Ankle Sprain": "ankle.py",
-    "TMDs": "tmj.py",
-    "Burns": "skin.py",
-    "Bedsores/ Ulcer": "skin.py",
-    "Wrinkles": "skin.py",
-    "Stretch Marks": "skin.py",
-    "Skin Rejuvenation": "skin.py",
-    "Acne vulgaris": "skin.py",
-    "Herpes simplex": "skin.py",
-    "Wound healing": "skin.py",
-    "Toe Nail Fungus": "skin.py"
-    # Add remaining mappings as needed
-}
-
-class SearchPage(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("Search Issues")
-        self.geometry("1000x750")
-
-        self.filtered_issues = list(ISSUES)
+import screen_router
+import protocol_db
+from protocol1 import SCREEN_MAP
+
+
+def condition_regions():
+    """Every ailment in the protocol database, and the anatomy region whose page lists it."""
+    regions = {}
+    for region in protocol_db.REGIONS:
+        for ailment in protocol_db.region_ailments(region):
+            regions.setdefault(ailment, region)
+    return regions
+
+class SearchPage(tk.Frame):
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.pack(fill=tk.BOTH, expand=True)
+
+        self.load_issues()
+        self.filtered_issues = list(self.issues)
 
         main_frame = tk.Frame(self)
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -91,9 +65,20 @@ class SearchPage(tk.Tk):
         self.create_virtual_keyboard(content_frame)
         create_sidebar_buttons(sidebar, scale_factor=1, root=self)
 
+        protocol_db.add_listener(self.on_protocols_changed)
+        self.bind("<Destroy>", lambda e: protocol_db.remove_listener(self.on_protocols_changed), add="+")
+
+    def load_issues(self):
+        self.condition_regions = condition_regions()
+        self.issues = sorted(self.condition_regions, key=str.lower)
+
+    def on_protocols_changed(self, changed_body_parts):
+        self.load_issues()
+        self.update_list()
+
     def update_list(self, *args):
         search_term = self.search_var.get().lower()
-        self.filtered_issues = [issue for issue in ISSUES if search_term in issue.lower()]
+        self.filtered_issues = [issue for issue in self.issues if search_term in issue.lower()]
         self.listbox.delete(0, tk.END)
         for issue in self.filtered_issues:
             self.listbox.insert(tk.END, issue)
@@ -147,25 +132,23 @@ class SearchPage(tk.Tk):
     def enter_key_pressed(self, event=None):
         input_text = self.search_var.get().strip().lower()
         match = None
-        for issue in ISSUES:
+        for issue in self.issues:
             if input_text in issue.lower():
                 match = issue
                 break
 
         if match:
             self.selected_var.set(f"Selected: {match}")
-            script_name = CONDITION_TO_SCRIPT.get(match)
-            if script_name:
-                try:
-                    subprocess.Popen([sys.executable, script_name])
-                except Exception as e:
-                    messagebox.showerror("Error", f"Cannot open {script_name}\n{e}")
+            screen_name = SCREEN_MAP.get(self.condition_regions.get(match))
+            if screen_name:
+                screen_router.navigate(screen_name)
             else:
                 messagebox.showwarning("Not Found", f"No script found for '{match}'")
         else:
             messagebox.showinfo("No Match", "No matching issue found. Please check spelling or try again.")
 
 
+screen_router.register_screen("search", lambda root, router: SearchPage(root), title="Search Issues")
+
 if __name__ == "__main__":
-    app = SearchPage()
-    app.mainloop()
+    screen_router.run("search")
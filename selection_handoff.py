@@ -0,0 +1,135 @@
+import json
+import os
+import queue
+import threading
+import time
+import tkinter as tk
+from tkinter import messagebox
+import monitor_protocol
+import monitor_transport
+import monitor_zygote
+
+# === Selection handoff to the therapy monitor ===
+# automode and the body-part screens hand the chosen protocol to therapy.py.
+# The selection is still saved to temp_selection.json (a cold-started monitor
+# reads it), but it is written to a temp file and renamed over the old one, so
+# a reader never sees half a file. Every selection carries a version stamp.
+# The monitor itself does not need the file: a warm standby gets the selection
+# on its control channel before it is shown, and a monitor this process already
+# has on screen is sent a "selection" message instead of a new window opening.
+# Launching a monitor can take seconds, so that happens on a worker thread and
+# the Tk thread returns from show() at once; failures come back through after().
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Where the monitor has always looked; falls back to the app folder where that tree does not exist
+LEGACY_DIR = os.path.join(os.path.expanduser(r"~\OneDrive\Desktop\project delhi"), "PythonProject")
+SELECTION_PATH = os.path.join(LEGACY_DIR if os.path.isdir(LEGACY_DIR) else BASE_DIR, "temp_selection.json")
+VERSION_KEY = "Version"
+
+_monitor = None  # The monitor process the last handoff put on screen (worker thread only)
+_requests = queue.Queue()  # (selection, version, widget) waiting for the worker
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def publish(selection, path=SELECTION_PATH):
+    """Atomically saves a selection and returns its version stamp."""
+    version = time.time_ns()  # Grows across processes without a shared counter
+    data = dict(selection, **{VERSION_KEY: version})
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(json.dumps(data, indent=2))
+    os.replace(tmp_path, path)
+    return version
+
+
+def read(path=SELECTION_PATH):
+    """(version, selection) from the saved file with a single open().
+
+    Raises OSError or ValueError (bad JSON) like open() and json.loads() do.
+    Files written before versioning have version 0.
+    """
+    with open(path, "r") as f:
+        data = json.loads(f.read())
+    return data.pop(VERSION_KEY, 0), data
+
+
+def selection_message(selection, version):
+    return {"command": "selection", "version": version, "selection": selection}
+
+
+def _notify(process, message):
+    """Sends a message to a monitor we launched. Returns False if it cannot be reached."""
+    channel = getattr(process, "channel", None)
+    try:
+        if channel is None:
+            sock, _ = monitor_transport.connect()
+            with sock:
+                sock.sendall(monitor_protocol.encode(message))
+            return True
+        # Throw away whatever the monitor sent us (monitor_ready, relayed state) so its buffer never fills
+        channel.setblocking(False)
+        try:
+            while channel.recv(65536):
+                pass
+        except BlockingIOError:
+            pass
+        channel.setblocking(True)
+        channel.sendall(monitor_protocol.encode(message))
+        return True
+    except OSError as e:
+        print(f"DEBUG: Could not notify the running monitor: {e}")
+        return False
+
+
+def _show_now(selection, version):
+    """Puts a selection on the monitor: the one already on screen, or a new one. Blocks."""
+    global _monitor
+    if _monitor is not None and _monitor.poll() is None:
+        if _notify(_monitor, selection_message(selection, version)):
+            print(f"DEBUG: Sent selection {version} to the running monitor (pid {_monitor.pid})")
+            return _monitor
+    _monitor = monitor_zygote.launch_monitor(selection=selection_message(selection, version))
+    return _monitor
+
+
+def _report(widget, error):
+    """Shows a failed handoff on the Tk thread that asked for it."""
+    try:
+        widget.after(0, lambda: messagebox.showerror("Error", f"Failed to open therapy.py:\n{error}"))
+    except (RuntimeError, tk.TclError) as e:
+        print(f"DEBUG: Could not report the failed handoff ({e})")
+
+
+def _run():
+    while True:
+        request = _requests.get()
+        # Only the newest selection is worth showing when several are waiting
+        while not _requests.empty():
+            request = _requests.get_nowait()
+        selection, version, widget = request
+        try:
+            _show_now(selection, version)
+        except Exception as e:
+            print(f"Could not show selection {version} on the monitor: {e}")
+            if widget is not None:
+                _report(widget, e)
+
+
+def show(selection, version, widget=None):
+    """Puts a selection on the monitor in the background. Never blocks.
+
+    Errors are shown in a message box over `widget`, if one is given.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_run, daemon=True)
+            _worker.start()
+    _requests.put((selection, version, widget))
+
+
+def hand_off(selection, widget=None):
+    """Saves a selection and shows it on the monitor in the background."""
+    version = publish(selection)
+    show(selection, version, widget)
@@ -0,0 +1,145 @@
+import time
+
+# === Therapy session scheduler ===
+# Owns the timing of one therapy session on the monotonic clock: start, pause,
+# resume, stop and the completion deadline. Nothing polls. The deadline is a
+# single Tk after() timer, re-armed on pause/resume, and "completed" is emitted
+# exactly once when it passes. A separate once-a-second "tick" keeps displays
+# and the monitor link up to date while the session runs.
+#
+# Subscribers: scheduler.on(event, callback); callback(scheduler) is called on
+# the Tk thread for "started", "paused", "resumed", "stopped", "completed" and "tick".
+
+IDLE, RUNNING, PAUSED, COMPLETED, STOPPED = "idle", "running", "paused", "completed", "stopped"
+EVENTS = ("started", "paused", "resumed", "stopped", "completed", "tick")
+TICK_MS = 1000
+# after() can fire a little early; closer than this to the deadline counts as reached
+DEADLINE_SLACK_SEC = 0.002
+
+
+class SessionScheduler:
+    def __init__(self, root, tick_ms=TICK_MS, clock=time.monotonic):
+        self.root = root
+        self.tick_ms = tick_ms
+        self.clock = clock
+        self.state = IDLE
+        self.duration_sec = 0.0
+        self._elapsed_before = 0.0     # Run time banked by earlier segments (before a pause)
+        self._segment_start = 0.0      # Clock time the current running segment began
+        self._deadline_id = None
+        self._tick_id = None
+        self._ticks = 0
+        self._subscribers = {event: [] for event in EVENTS}
+
+    def on(self, event, callback):
+        self._subscribers[event].append(callback)
+
+    def off(self, event, callback):
+        if callback in self._subscribers[event]:
+            self._subscribers[event].remove(callback)
+
+    def _emit(self, event):
+        for callback in list(self._subscribers[event]):
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"Error in session {event} handler: {e}")
+
+    # --- Queries ---
+
+    @property
+    def running(self):
+        return self.state == RUNNING
+
+    def elapsed(self):
+        elapsed = self._elapsed_before
+        if self.state == RUNNING:
+            elapsed += self.clock() - self._segment_start
+        return min(elapsed, self.duration_sec)
+
+    def remaining(self):
+        return max(0.0, self.duration_sec - self.elapsed())
+
+    # --- Control ---
+
+    def start(self, duration_sec):
+        """Starts a new session of `duration_sec` seconds, replacing any current one."""
+        self._cancel_timers()
+        self.duration_sec = float(duration_sec)
+        self._elapsed_before = 0.0
+        self._run()
+        self._emit("started")
+
+    def pause(self):
+        if self.state != RUNNING:
+            return
+        self._elapsed_before = self.elapsed()
+        self.state = PAUSED
+        self._cancel_timers()
+        self._emit("paused")
+
+    def resume(self):
+        if self.state != PAUSED:
+            return
+        self._run()
+        self._emit("resumed")
+
+    def stop(self):
+        """Ends the session early. Does nothing unless it is running or paused."""
+        if self.state not in (RUNNING, PAUSED):
+            return
+        self._elapsed_before = self.elapsed()
+        self.state = STOPPED
+        self._cancel_timers()
+        self._emit("stopped")
+
+    def set_duration(self, duration_sec):
+        """Changes the length of the session in progress; the deadline moves with it."""
+        self.duration_sec = float(duration_sec)
+        if self.state == RUNNING:
+            self._arm_deadline()
+
+    # --- Timers ---
+
+    def _run(self):
+        self.state = RUNNING
+        self._segment_start = self.clock()
+        self._ticks = 0
+        self._arm_deadline()
+        self._arm_tick()
+
+    def _arm_deadline(self):
+        if self._deadline_id is not None:
+            self.root.after_cancel(self._deadline_id)
+        self._deadline_id = self.root.after(max(0, int(self.remaining() * 1000 + 0.5)), self._on_deadline)
+
+    def _on_deadline(self):
+        self._deadline_id = None
+        if self.state != RUNNING:
+            return
+        if self.remaining() > DEADLINE_SLACK_SEC:
+            self._arm_deadline()  # Fired early
+            return
+        self._elapsed_before = self.duration_sec
+        self.state = COMPLETED
+        self._cancel_timers()
+        self._emit("completed")
+
+    def _arm_tick(self):
+        # Ticks are aligned to the segment start, so they do not drift with handler run time
+        self._ticks += 1
+        due = self._segment_start + self._ticks * self.tick_ms / 1000
+        self._tick_id = self.root.after(max(0, int((due - self.clock()) * 1000)), self._on_tick)
+
+    def _on_tick(self):
+        self._tick_id = None
+        if self.state != RUNNING:
+            return
+        self._arm_tick()
+        self._emit("tick")
+
+    def _cancel_timers(self):
+        for timer_id in (self._deadline_id, self._tick_id):
+            if timer_id is not None:
+                self.root.after_cancel(timer_id)
+        self._deadline_id = self._tick_id = None
@@ -0,0 +1,145 @@
+import struct
+import sys
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory, resource_tracker
+import channel_dose
+
+# === Live session telemetry in shared memory ===
+# The controller owns the therapy session and writes its state into one small
+# fixed-layout shared memory block. The monitor reads it at display rate
+# instead of running its own timer, so both screens show the same delivered
+# joules and remaining time. The segment name reaches the monitor in the
+# start_therapy snapshot.
+#
+# Writes are guarded by a seqlock: the counter is odd while a write is in
+# progress and goes up by two per write. A reader copies the block and only
+# keeps the copy if the counter was even and unchanged around it.
+#
+# Values are stored as of `updated_mono` (time.monotonic(), which is system
+# wide) and live() extrapolates them, so the writer only has to publish when
+# something changes or about once a second.
+#
+# The per-wavelength dose (channel_dose.py) follows the body as raw doubles,
+# under the same seqlock and extrapolated the same way.
+
+SEQ = struct.Struct("<Q")
+BODY = struct.Struct("<IIdddddd")  # session, state, power W, target J, duration s, elapsed s, delivered J, updated_mono
+CHANNELS_OFFSET = SEQ.size + BODY.size
+CHANNELS_SIZE = channel_dose.SIZE * channel_dose.ITEM_SIZE
+SIZE = CHANNELS_OFFSET + CHANNELS_SIZE
+READ_RETRIES = 50
+
+IDLE, RUNNING, COMPLETED, STOPPED = range(4)
+
+Snapshot = namedtuple("Snapshot", ["seq", "session", "state", "power_w", "target_energy_j", "duration_s",
+                                   "elapsed_s", "delivered_j", "updated_mono", "channels"])
+
+
+def _extra(snapshot, now):
+    """Run time since the snapshot was written, up to the end of the session."""
+    if snapshot.state != RUNNING:
+        return 0.0
+    extra = (time.monotonic() if now is None else now) - snapshot.updated_mono
+    return max(0.0, min(extra, snapshot.duration_s - snapshot.elapsed_s))
+
+
+def live(snapshot, now=None):
+    """(elapsed s, remaining s, delivered J) of a snapshot, brought forward to `now`."""
+    extra = _extra(snapshot, now)
+    elapsed = snapshot.elapsed_s + extra
+    return elapsed, max(0.0, snapshot.duration_s - elapsed), snapshot.delivered_j + snapshot.power_w * extra
+
+
+def live_channels(snapshot, now=None):
+    """The snapshot's ChannelDose brought forward to `now`."""
+    return snapshot.channels.advanced(_extra(snapshot, now))
+
+
+class TelemetryWriter:
+    """The controller's side. Creates the segment and is the only writer."""
+
+    def __init__(self):
+        self._shm = shared_memory.SharedMemory(create=True, size=SIZE)
+        self.name = self._shm.name
+        self._seq = 0
+        self.snapshot = Snapshot(0, 0, IDLE, 0.0, 0.0, 0.0, 0.0, 0.0, time.monotonic(), channel_dose.ChannelDose())
+        self._write(self.snapshot)
+
+    def _write(self, snapshot):
+        buf = self._shm.buf
+        SEQ.pack_into(buf, 0, self._seq + 1)  # Odd: write in progress
+        BODY.pack_into(buf, SEQ.size, *snapshot[1:-1])
+        buf[CHANNELS_OFFSET:SIZE] = snapshot.channels.values.tobytes()
+        self._seq += 2
+        SEQ.pack_into(buf, 0, self._seq)
+        self.snapshot = snapshot._replace(seq=self._seq)
+
+    def start(self, power_w, target_energy_j, duration_s, channel_power_w=None, duty=1.0):
+        """Begins a new session at zero elapsed time."""
+        channels = channel_dose.ChannelDose()
+        if channel_power_w is not None:
+            channels.set_power(channel_power_w, duty)
+        self._write(Snapshot(0, self.snapshot.session + 1, RUNNING, float(power_w), float(target_energy_j),
+                             float(duration_s), 0.0, 0.0, time.monotonic(), channels))
+
+    def update(self, power_w=None, state=None, channel_power_w=None, duty=None):
+        """Accounts for the time since the last write, then stores new powers and/or state."""
+        now = time.monotonic()
+        elapsed, _, delivered = live(self.snapshot, now)
+        channels = live_channels(self.snapshot, now)
+        if channel_power_w is not None:
+            channels.set_power(channel_power_w, channels.values[channel_dose.DUTY] if duty is None else duty)
+        self._write(self.snapshot._replace(
+            state=self.snapshot.state if state is None else state,
+            power_w=self.snapshot.power_w if power_w is None else float(power_w),
+            elapsed_s=elapsed, delivered_j=delivered, updated_mono=now, channels=channels))
+
+    def close(self):
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class TelemetryReader:
+    """The monitor's side. Attaches to an existing segment by name."""
+
+    def __init__(self, name):
+        if sys.version_info >= (3, 13):
+            self._shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            # Otherwise this process's resource tracker unlinks the controller's segment when we exit
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        self.name = name
+        self.retries = 0
+
+    def read(self):
+        """A consistent Snapshot, or None if the writer kept it busy for every retry."""
+        buf = self._shm.buf
+        for _ in range(READ_RETRIES):
+            (before,) = SEQ.unpack_from(buf, 0)
+            if before & 1:
+                self.retries += 1
+                continue
+            body = BODY.unpack_from(buf, SEQ.size)
+            channels = bytes(buf[CHANNELS_OFFSET:SIZE])
+            (after,) = SEQ.unpack_from(buf, 0)
+            if before == after:
+                return Snapshot(before, *body, channel_dose.ChannelDose.from_bytes(channels))
+            self.retries += 1
+        return None
+
+    def close(self):
+        self._shm.close()
+
+
+def create():
+    """A writer for a new segment, or None where shared memory is unavailable."""
+    try:
+        return TelemetryWriter()
+    except OSError as e:
+        print(f"DEBUG: Shared memory telemetry unavailable: {e}")
+        return None
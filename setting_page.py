@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
 import configparser
 import os
+import screen_router
 
 # --------- Sidebar Button Logic ---------
 def create_sidebar_buttons(sidebar, scale_factor, root):
@@ -29,7 +30,7 @@ def create_sidebar_buttons(sidebar, scale_factor, root):
         }
 
         if name == "🔙 Back":
-            root.destroy()
+            screen_router.go_back()
         elif name in script_paths:
             config = configparser.ConfigParser()
             config['DEFAULT'] = {'selected_mode': script_paths[name]}
@@ -59,13 +60,13 @@ def create_sidebar_buttons(sidebar, scale_factor, root):
         canvas.tag_bind(text_id, "<Button-1>", lambda e, name=btn_text: on_button_click(name))
 
 # --------- Save Settings ---------
-def save_settings():
+def save_settings(volume_slider, brightness_slider):
     volume = volume_slider.get()
     brightness = brightness_slider.get()
     messagebox.showinfo("Settings Saved", f"Volume: {volume:.1f}\nBrightness: {brightness:.1f}")
 
 # --------- Engineering Password Entry ---------
-def show_engineering_popup():
+def show_engineering_popup(root):
     password_win = tk.Toplevel(root)
     password_win.title("Enter Password")
     password_win.geometry("300x260")
@@ -87,7 +88,7 @@ def show_engineering_popup():
     def check_password(event=None):
         if pw_entry.get() == "9761":
             password_win.destroy()
-            open_engineering_mode()
+            open_engineering_mode(root)
         else:
             messagebox.showerror("Error", "Incorrect password")
             clear_entry()
@@ -108,7 +109,7 @@ def show_engineering_popup():
     password_win.bind("<Return>", check_password)
 
 # --------- Engineering Mode Data ---------
-def open_engineering_mode():
+def open_engineering_mode(root):
     eng_win = tk.Toplevel(root)
     eng_win.title("Engineering Mode")
     eng_win.geometry("270x150")
@@ -135,51 +136,52 @@ def open_engineering_mode():
     update_engineering_data_popup()
 
 # --------- Main Window ---------
-root = tk.Tk()
-root.title("Lumino Pro")
-root.configure(bg="#2e2e2e")
-root.attributes('-fullscreen', True)
-
-# Sidebar Frame (Right Side)
-sidebar_frame = tk.Frame(root, bg="gray20")
-sidebar_frame.pack(side="right", fill="y", padx=(0, 0), pady=0)
-create_sidebar_buttons(sidebar_frame, scale_factor=1.0, root=root)
-
-# Header
-header = tk.Label(root, text="Lumino Pro", font=("Arial", 28, "bold"),
-                  fg="#ff4dff", bg="#2e2e2e")
-header.place(x=20, y=20)
-
-# Control Frame
-control_frame = tk.Frame(root, bg="#2e2e2e")
-control_frame.place(relx=0.35, rely=0.5, anchor="w")
-
-# Volume Slider
-tk.Label(control_frame, text="Volume", font=("Arial", 14, "bold"),
-         fg="white", bg="#2e2e2e").grid(row=0, column=0, padx=40)
-volume_slider = ttk.Scale(control_frame, from_=100, to=0, orient="vertical", length=150)
-volume_slider.set(50)
-volume_slider.grid(row=1, column=0, padx=40)
-
-# Brightness Slider
-tk.Label(control_frame, text="Brightness", font=("Arial", 14, "bold"),
-         fg="white", bg="#2e2e2e").grid(row=0, column=1, padx=40)
-brightness_slider = ttk.Scale(control_frame, from_=100, to=0, orient="vertical", length=150)
-brightness_slider.set(75)
-brightness_slider.grid(row=1, column=1, padx=40)
-
-# Save Button
-save_btn = tk.Button(control_frame, text="💾 Save Settings", command=save_settings,
-                     font=("Arial", 12), bg="#4CAF50", fg="white", width=18)
-save_btn.grid(row=2, column=0, columnspan=2, pady=15)
-
-# Settings Icon (Bottom Left)
-tk.Label(root, text="⚙️", font=("Arial", 90), bg="#2e2e2e", fg="#ff5733").place(relx=0.05, rely=0.7)
-
-# Engineering Mode Icon (Top Left)
-eng_icon_btn = tk.Button(root, text="🛠️", font=("Arial", 30), bg="#2e2e2e", fg="#ff5733",
-                         bd=0, activebackground="#2e2e2e", activeforeground="#ff5733",
-                         command=show_engineering_popup)
-eng_icon_btn.place(relx=0.05, rely=0.25)
-
-root.mainloop()
+def build_screen(root, router):
+    root.configure(bg="#2e2e2e")
+
+    # Sidebar Frame (Right Side)
+    sidebar_frame = tk.Frame(root, bg="gray20")
+    sidebar_frame.pack(side="right", fill="y", padx=(0, 0), pady=0)
+    create_sidebar_buttons(sidebar_frame, scale_factor=1.0, root=root)
+
+    # Header
+    header = tk.Label(root, text="Lumino Pro", font=("Arial", 28, "bold"),
+                      fg="#ff4dff", bg="#2e2e2e")
+    header.place(x=20, y=20)
+
+    # Control Frame
+    control_frame = tk.Frame(root, bg="#2e2e2e")
+    control_frame.place(relx=0.35, rely=0.5, anchor="w")
+
+    # Volume Slider
+    tk.Label(control_frame, text="Volume", font=("Arial", 14, "bold"),
+             fg="white", bg="#2e2e2e").grid(row=0, column=0, padx=40)
+    volume_slider = ttk.Scale(control_frame, from_=100, to=0, orient="vertical", length=150)
+    volume_slider.set(50)
+    volume_slider.grid(row=1, column=0, padx=40)
+
+    # Brightness Slider
+    tk.Label(control_frame, text="Brightness", font=("Arial", 14, "bold"),
+             fg="white", bg="#2e2e2e").grid(row=0, column=1, padx=40)
+    brightness_slider = ttk.Scale(control_frame, from_=100, to=0, orient="vertical", length=150)
+    brightness_slider.set(75)
+    brightness_slider.grid(row=1, column=1, padx=40)
+
+    # Save Button
+    save_btn = tk.Button(control_frame, text="💾 Save Settings", command=lambda: save_settings(volume_slider, brightness_slider),
+                         font=("Arial", 12), bg="#4CAF50", fg="white", width=18)
+    save_btn.grid(row=2, column=0, columnspan=2, pady=15)
+
+    # Settings Icon (Bottom Left)
+    tk.Label(root, text="⚙️", font=("Arial", 90), bg="#2e2e2e", fg="#ff5733").place(relx=0.05, rely=0.7)
+
+    # Engineering Mode Icon (Top Left)
+    eng_icon_btn = tk.Button(root, text="🛠️", font=("Arial", 30), bg="#2e2e2e", fg="#ff5733",
+                             bd=0, activebackground="#2e2e2e", activeforeground="#ff5733",
+                             command=lambda: show_engineering_popup(root))
+    eng_icon_btn.place(relx=0.05, rely=0.25)
+
+screen_router.register_screen("settings", build_screen, title="Lumino Pro")
+
+if __name__ == "__main__":
+    screen_router.run("settings")
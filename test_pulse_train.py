@@ -0,0 +1,18 @@
+import pulse_train
+
+# === Pulse train edge cases ===
+# Run with: python -m pytest test_pulse_train.py
+
+
+def test_time_for_sub_tolerance_energy_is_within_first_pulse():
+    train = pulse_train.PulseTrain(10.0, "Pulse", "Frequency", 0.01, 10)
+    energy = train.peak_w * train.pulse_duration * pulse_train.EDGE_TOLERANCE / 2
+    t = train.time_for_energy(energy)
+    assert 0.0 < t <= train.pulse_duration
+    assert abs(train.energy(t) - energy) <= 1e-15
+
+
+def test_time_for_energy_on_pulse_edge_ends_with_that_pulse():
+    train = pulse_train.PulseTrain(10.0, "Pulse", "Frequency", 0.01, 10)
+    t = train.time_for_energy(train.peak_w * train.pulse_duration * 3)
+    assert abs(t - (2 / train.frequency + train.pulse_duration)) <= 1e-12
@@ -6,23 +6,36 @@ import sys
 import json
 import time
 import threading
-import socket
 import configparser
 import traceback # Import traceback for detailed error logging
+import selection_handoff
+import monitor_server
+import tk_inbox
+import session_telemetry
+import dose_integrator
+import tk_render
 
 # --- Universal Path Setup (as in automode.py for consistency) ---
 # Ensure this path is correct and accessible.
 # Using r"..." for raw string to avoid issues with backslashes.
 # os.path.expanduser handles the '~' correctly across OS.
 base_dir = os.path.expanduser(r"~\OneDrive\Desktop\project delhi")
-temp_json_path = os.path.join(base_dir, "PythonProject", "temp_selection.json")
 PASSWORD_SCREEN_PATH = os.path.join(base_dir, "PythonProject", "new_passwordscreen.py")
 
+# Live display refresh: often while a session is running, rarely while paused or idle
+LIVE_RUNNING_MS = 200
+LIVE_IDLE_MS = 1000
+
 # Add a variable for elapsed time for proper pause/resume
 # This needs to be part of the class, so initialize it in __init__
 class LuminoProApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, standby=False):
         super().__init__()
+        # In standby mode (see monitor_zygote.py) the window stays hidden until the
+        # controller sends "show" on stdin, so it can be built ahead of time.
+        self.standby = standby
+        if standby:
+            self.withdraw()
         self.title("Lumino Pro")
         self.attributes('-fullscreen', True)
         self.configure(bg="#2b2b2b")
@@ -33,7 +46,11 @@ class LuminoProApp(tk.Tk):
         self.freq_var = tk.StringVar(value="0")
         self.time_var = tk.StringVar(value="00.00")
         self.delivered_j_var = tk.StringVar(value="0000")
+        self.channels_var = tk.StringVar(value="")  # Joules per wavelength, from the controller's telemetry
         self.delivery_mode_var = tk.StringVar(value="N/A")
+        # All writes to the variables above go through here, so unchanged text is not set again
+        self.fields = tk_render.FieldRenderer()
+        self._live_after = None  # Pending update_live_display() call
 
         # Variables to store the last received values from LaserTherapyGUI.py
         self._last_received_target_joule = 0
@@ -42,11 +59,9 @@ class LuminoProApp(tk.Tk):
         self._last_received_target_time_seconds = 0.0
         self._last_received_delivery_mode = "N/A"
 
-        # NEW: Variables for live therapy tracking
-        self.therapy_start_timestamp = 0
-        self.therapy_end_timestamp = 0
-        self.total_therapy_duration_sec = 0
-        self.elapsed_time_at_pause = 0.0 # Crucial for accurate pause/resume
+        # Live therapy tracking: run time and delivered joules per constant-power
+        # segment, on the monotonic clock (see dose_integrator.py)
+        self.dose = dose_integrator.DoseIntegrator()
 
         # List to hold references to labels/buttons that need dynamic font updates
         self._dynamic_font_widgets = []
@@ -63,8 +78,29 @@ class LuminoProApp(tk.Tk):
         self.timer_running = False
         self.is_paused_by_button = True  # Start in a paused state
 
-        # --- Load data from automode.py via temp_selection.json ---
-        self.load_initial_therapy_data()
+        # Version stamp of the selection on screen (see selection_handoff.py)
+        self.selection_version = 0
+        # A selection that arrived during a session: (data, version), shown once it ends
+        self.pending_selection = None
+
+        # The controller's shared session state, once start_therapy names it
+        self.telemetry = None
+
+        # Set by the socket server thread once it is accepting connections
+        self.server_ready = threading.Event()
+        self.server = None
+
+        if standby:
+            self.start_control_listener()
+        else:
+            self.activate()
+
+    def activate(self, selection=None):
+        """Loads the current selection, starts serving and puts the window on screen."""
+        self.standby = False
+
+        # --- Load data from automode.py (handed over, or via temp_selection.json) ---
+        self.load_initial_therapy_data(selection)
 
         # Ensure the play/pause button reflects the initial paused state
         self.toggle_btn.config(text="▶")
@@ -75,51 +111,105 @@ class LuminoProApp(tk.Tk):
         # and then let its after() loop handle subsequent updates.
         self.update_live_display()
 
-    def load_initial_therapy_data(self):
-        """Loads therapy parameters from the temp_selection.json file.
-        Includes enhanced error handling for file operations and data parsing.
+        self.deiconify()
+        self.attributes('-fullscreen', True)
+        self.lift()
+        self.focus_force()
+
+    def start_control_listener(self):
+        """Waits for the controller's "show" command on stdin while in standby.
+
+        It may be preceded by "select <selection message JSON>" (see selection_handoff.py).
         """
-        # --- Debugging: Print the expected path ---
-        # This print is crucial for diagnosing path issues.
-        print(f"DEBUG: Attempting to load therapy data from: {temp_json_path}")
-
-        # Ensure the directory exists before checking the file
-        json_dir = os.path.dirname(temp_json_path)
-        if not os.path.isdir(json_dir):
-            messagebox.showerror("Directory Not Found",
-                                 f"The directory for temp_selection.json does not exist:\n{json_dir}\n"
-                                 "Please ensure the 'PythonProject' folder is in the correct location.")
-            self.stop_therapy_local()
+        # stdout is the handshake channel; regular prints go to stderr
+        control_out = sys.stdout
+        sys.stdout = sys.stderr
+
+        def listen():
+            selection = None
+            for line in sys.stdin:
+                command, _, argument = line.strip().partition(" ")
+                if command == "select":
+                    try:
+                        selection = json.loads(argument)
+                    except ValueError as e:
+                        print(f"Ignoring bad selection on control channel: {e}")
+                elif command == "show" and self.standby:
+                    self.after(0, self.activate, selection)
+                    if self.server_ready.wait(timeout=5):
+                        control_out.write("MONITOR_READY\n")
+                        control_out.flush()
+                    else:
+                        # Not listening: let the controller start a monitor cold instead of this one
+                        print("Monitor server did not start listening; giving up the standby")
+                        control_out.write("MONITOR_FAILED\n")
+                        control_out.flush()
+                        self.after(0, self.destroy)
+                        return
+            # Controller went away before using us
+            if self.standby:
+                self.after(0, self.destroy)
+
+        threading.Thread(target=listen, daemon=True).start()
+
+    def load_initial_therapy_data(self, selection=None):
+        """Loads the therapy parameters chosen in automode or on a body-part screen.
+
+        `selection` is the "selection" message handed over by selection_handoff;
+        without one (cold start) the saved temp_selection.json is read once.
+        """
+        if selection is not None:
+            self.apply_selection(selection.get("selection", {}), selection.get("version", 0))
             return
 
-        if not os.path.exists(temp_json_path):
+        # --- Debugging: Print the expected path ---
+        # This print is crucial for diagnosing path issues.
+        print(f"DEBUG: Attempting to load therapy data from: {selection_handoff.SELECTION_PATH}")
+        try:
+            # One open() instead of checking the directory, existence, type and permissions first
+            version, data = selection_handoff.read()
+        except FileNotFoundError:
             messagebox.showwarning("File Not Found",
-                                   f"Therapy data file (temp_selection.json) not found at:\n{temp_json_path}\n"
+                                   f"Therapy data file (temp_selection.json) not found at:\n{selection_handoff.SELECTION_PATH}\n"
                                    "Please ensure a body part is selected and saved in automode.")
             self.stop_therapy_local()
-            return # Exit the function early if file doesn't exist
+            return
+        except IsADirectoryError:
+            messagebox.showerror("Error",
+                                  f"The path '{selection_handoff.SELECTION_PATH}' exists but is not a file. "
+                                  "Please ensure it points to the temp_selection.json file.")
+            self.stop_therapy_local()
+            return
+        except PermissionError:
+            messagebox.showerror("Permission Error",
+                                  f"No read permission for file:\n{selection_handoff.SELECTION_PATH}\n"
+                                  "Please check file permissions.")
+            self.stop_therapy_local()
+            return
+        except json.JSONDecodeError as e:
+            messagebox.showerror("Error", f"Failed to decode temp_selection.json. It might be corrupted or empty:\n{e}")
+            print(f"JSON Decode Error: {e}")
+            traceback.print_exc() # Print traceback for JSON error
+            self.stop_therapy_local()
+            return
+        except OSError as e:
+            # This is the primary place where [Errno 22] Invalid argument would be caught for open()
+            messagebox.showerror("File System Error",
+                                  f"An operating system error occurred while accessing temp_selection.json:\n{e}\n"
+                                  "Please check the file path, name, and permissions.")
+            print(f"OS Error while accessing file: {e}")
+            traceback.print_exc() # Print traceback for OS error
+            self.stop_therapy_local()
+            return
+        self.apply_selection(data, version)
 
+    def apply_selection(self, data, version=0):
+        """Shows a selection ({"User Selections", "Therapy Data", "Body Part"}) unless a newer one is already shown."""
+        if version and version < self.selection_version:
+            print(f"DEBUG: Ignoring selection {version}, already showing {self.selection_version}")
+            return
+        self.selection_version = version
         try:
-            # Check if the path points to a file, not a directory
-            if not os.path.isfile(temp_json_path):
-                messagebox.showerror("Error",
-                                      f"The path '{temp_json_path}' exists but is not a file. "
-                                      "Please ensure it points to the temp_selection.json file.")
-                self.stop_therapy_local()
-                return
-
-            # Check read permissions
-            if not os.access(temp_json_path, os.R_OK):
-                messagebox.showerror("Permission Error",
-                                      f"No read permission for file:\n{temp_json_path}\n"
-                                      "Please check file permissions.")
-                self.stop_therapy_local()
-                return
-
-            # Attempt to open and load the JSON file
-            with open(temp_json_path, "r") as f:
-                data = json.load(f)
-
             user_selections = data.get("User Selections", {})
             therapy_data = data.get("Therapy Data", {})
             body_part = data.get("Body Part", "N/A")
@@ -128,14 +218,14 @@ class LuminoProApp(tk.Tk):
             try:
                 # Use float() for power as it can be decimal
                 self._last_received_avg_power = float(therapy_data.get("Power", 0))
-                self.power_var.set(str(self._last_received_avg_power))
+                self.fields.set(self.power_var, str(self._last_received_avg_power))
 
                 # Use int() for energy and frequency
                 self._last_received_target_joule = int(therapy_data.get("Total Energy", 0))
-                self.joule_var.set(str(self._last_received_target_joule))
+                self.fields.set(self.joule_var, str(self._last_received_target_joule))
 
                 self._last_received_freq = int(therapy_data.get("Pulse Freq", 0))
-                self.freq_var.set(str(self._last_received_freq))
+                self.fields.set(self.freq_var, str(self._last_received_freq))
 
                 # Time is in minutes in automode, convert to seconds for internal tracking
                 # Added DEBUG print for raw time from JSON
@@ -144,7 +234,7 @@ class LuminoProApp(tk.Tk):
 
                 therapy_time_minutes = float(therapy_time_minutes_raw)
                 # Display in minutes, but store internally as seconds
-                self.time_var.set(f"{therapy_time_minutes:.2f}")
+                self.fields.set(self.time_var, f"{therapy_time_minutes:.2f}")
                 self._last_received_target_time_seconds = therapy_time_minutes * 60
 
             except ValueError as ve:
@@ -158,35 +248,19 @@ class LuminoProApp(tk.Tk):
 
             # Set delivery mode based on the Condition and Body Part
             condition = user_selections.get("Condition", "N/A")
-            self.delivery_mode_var.set(f"{body_part.capitalize()} - {condition}")
+            self.fields.set(self.delivery_mode_var, f"{body_part.capitalize()} - {condition}")
             self._last_received_delivery_mode = f"{body_part.capitalize()} - {condition}"
 
-            # Initialize therapy start/end times for countdown
-            self.total_therapy_duration_sec = self._last_received_target_time_seconds
-            print(f"DEBUG: Calculated total_therapy_duration_sec: {self.total_therapy_duration_sec} seconds")
-
-            self.therapy_start_timestamp = 0  # Reset, will be set when play is pressed
-            self.therapy_end_timestamp = 0  # Reset, will be set when play is pressed
-            self.elapsed_time_at_pause = 0.0 # Reset elapsed time on new load
+            # New session, paused at zero until play is pressed
+            self.dose.reset(self._last_received_avg_power, self._last_received_target_joule,
+                            self._last_received_target_time_seconds)
+            print(f"DEBUG: Calculated therapy duration: {self.dose.duration_sec} seconds")
 
             self.timer_running = False  # Ensure timer is not running
             self.is_paused_by_button = True  # Ensure initial state is paused
 
             print("Initial therapy parameters loaded from automode.py. Awaiting user to press Play.")
 
-        except json.JSONDecodeError as e:
-            messagebox.showerror("Error", f"Failed to decode temp_selection.json. It might be corrupted or empty:\n{e}")
-            print(f"JSON Decode Error: {e}")
-            traceback.print_exc() # Print traceback for JSON error
-            self.stop_therapy_local()
-        except OSError as e:
-            # This is the primary place where [Errno 22] Invalid argument would be caught for open()
-            messagebox.showerror("File System Error",
-                                  f"An operating system error occurred while accessing temp_selection.json:\n{e}\n"
-                                  "Please check the file path, name, and permissions.")
-            print(f"OS Error while accessing file: {e}")
-            traceback.print_exc() # Print traceback for OS error
-            self.stop_therapy_local()
         except Exception as e:
             # General catch-all for any other unexpected errors during loading
             messagebox.showerror("Loading Error", f"An unexpected error occurred while loading therapy data:\n{e}")
@@ -317,6 +391,10 @@ class LuminoProApp(tk.Tk):
         lbl_delivered_j_val.grid(row=4, column=0, columnspan=2, sticky="nsew", pady=2, padx=2)
         self._dynamic_font_widgets.append((lbl_delivered_j_val, "display_label"))
 
+        lbl_channels_val = tk.Label(right_panel, textvariable=self.channels_var, bg="#ff7f2a", fg="white")
+        lbl_channels_val.grid(row=5, column=0, columnspan=2, sticky="nsew", pady=2, padx=2)
+        self._dynamic_font_widgets.append((lbl_channels_val, "unit_label"))
+
         bottom_buttons_frame = tk.Frame(self, bg="#2b2b2b")
         bottom_buttons_frame.grid(row=2, column=0, columnspan=3, sticky="se", padx=20, pady=20)
         bottom_buttons_frame.columnconfigure(0, weight=1)
@@ -355,10 +433,9 @@ class LuminoProApp(tk.Tk):
 
     def toggle_play_pause(self):
         if self.is_paused_by_button: # If currently paused, try to play
-            if self._last_received_avg_power > 0 and self.total_therapy_duration_sec > 0:
-                # Calculate remaining time based on total duration minus already elapsed time
-                # If this is the very first start, elapsed_time_at_pause will be 0
-                remaining_duration = self.total_therapy_duration_sec - self.elapsed_time_at_pause
+            if self._last_received_avg_power > 0 and self.dose.duration_sec > 0:
+                # Remaining time is the total duration minus what already ran (zero on the very first start)
+                remaining_duration = self.dose.remaining_time()
 
                 # Use a small epsilon to avoid issues with float comparisons near zero
                 if remaining_duration <= 0.01:
@@ -366,29 +443,33 @@ class LuminoProApp(tk.Tk):
                     self.stop_therapy_local()
                     return
 
-                self.therapy_start_timestamp = time.time()
-                self.therapy_end_timestamp = self.therapy_start_timestamp + remaining_duration
+                self.dose.resume()
                 self.timer_running = True
                 self.is_paused_by_button = False
                 self.toggle_btn.config(text="⏸")
-                print(f"DEBUG: Therapy monitor locally resumed/started. Remaining: {remaining_duration:.2f}s, Ends at: {self.therapy_end_timestamp}")
+                print(f"DEBUG: Therapy monitor locally resumed/started. Remaining: {remaining_duration:.2f}s")
             else:
                 messagebox.showwarning("Cannot Start Therapy", "No valid therapy time or power set. Please load therapy data.")
                 print("Cannot start: No valid therapy parameters (power or total time is zero).")
                 self.is_paused_by_button = True # Ensure it stays in paused state
         else: # If currently playing, pause
-            # When pausing, calculate how much time has elapsed so far in the current segment
-            if self.therapy_start_timestamp > 0:
-                self.elapsed_time_at_pause += (time.time() - self.therapy_start_timestamp)
-                # Ensure it doesn't exceed total duration
-                if self.elapsed_time_at_pause > self.total_therapy_duration_sec:
-                    self.elapsed_time_at_pause = self.total_therapy_duration_sec
-
+            # Banks the current segment; elapsed time and dose stay frozen until resumed
+            self.dose.pause()
             self.timer_running = False
             self.is_paused_by_button = True
             self.toggle_btn.config(text="▶")
-            print(f"DEBUG: Therapy monitor locally paused. Elapsed: {self.elapsed_time_at_pause:.2f}s")
+            print(f"DEBUG: Therapy monitor locally paused. Elapsed: {self.dose.elapsed():.2f}s, "
+                  f"delivered: {self.dose.delivered():.1f} J")
+        self.refresh_live_display()
+        self.publish_state()
+
 
+    def session_in_progress(self):
+        """Whether a session is under way: the controller's, or a local one started and not yet over."""
+        snapshot = self.telemetry.read() if self.telemetry is not None else None
+        if snapshot is not None and snapshot.state == session_telemetry.RUNNING:
+            return True
+        return self.timer_running or (self.dose.elapsed() > 0 and self.dose.remaining_time() > 0)
 
     def stop_therapy_local(self):
         self.timer_running = False
@@ -398,152 +479,191 @@ class LuminoProApp(tk.Tk):
         self._last_received_freq = 0
         self._last_received_target_time_seconds = 0.0
         self._last_received_delivery_mode = "N/A"
-        self.therapy_start_timestamp = 0
-        self.therapy_end_timestamp = 0
-        self.total_therapy_duration_sec = 0
-        self.elapsed_time_at_pause = 0.0 # Crucial: reset elapsed time on stop
-
-        self.joule_var.set("0")
-        self.power_var.set("0")
-        self.freq_var.set("0")
-        self.time_var.set("00.00") # Reset display to zero
-        self.delivered_j_var.set("0000")
-        self.delivery_mode_var.set("N/A")
+        self.dose.reset()
+
+        self.fields.set(self.joule_var, "0")
+        self.fields.set(self.power_var, "0")
+        self.fields.set(self.freq_var, "0")
+        self.fields.set(self.time_var, "00.00") # Reset display to zero
+        self.fields.set(self.delivered_j_var, "0000")
+        self.fields.set(self.channels_var, "")
+        self.fields.set(self.delivery_mode_var, "N/A")
 
         self.toggle_btn.config(text="▶")
         print("Therapy monitor locally stopped and reset.")
+        if self.server is not None:
+            print(f"DEBUG: Update dispatch: {self.inbox.stats()}")
+        print(f"DEBUG: Live display fields: {self.fields.stats()}")
+        self.publish_state()
+
+        if self.pending_selection is not None:
+            data, version = self.pending_selection
+            self.pending_selection = None
+            self.apply_selection(data, version)
+
+    def attach_telemetry(self, name):
+        if self.telemetry is not None:
+            if self.telemetry.name == name:
+                return
+            self.telemetry.close()
+            self.telemetry = None
+        if name:
+            try:
+                self.telemetry = session_telemetry.TelemetryReader(name)
+                print(f"DEBUG: Reading session telemetry from {name}")
+            except (OSError, ValueError) as e:
+                print(f"Could not attach session telemetry {name}: {e}")
+
+    def show_telemetry(self):
+        """Renders the controller's session state. Returns False when there is no running session to show."""
+        snapshot = self.telemetry.read() if self.telemetry is not None else None
+        if snapshot is None or snapshot.state != session_telemetry.RUNNING:
+            return False
+        _, remaining_sec, delivered_joules = session_telemetry.live(snapshot)
+        self.fields.set(self.time_var, f"{remaining_sec / 60:.2f}")
+        self.fields.set(self.delivered_j_var, f"{int(delivered_joules):04d}")
+        self.fields.set(self.power_var, str(round(snapshot.power_w, 2)))
+        self.fields.set(self.channels_var, session_telemetry.live_channels(snapshot).describe())
+        return True
+
+    def channel_totals(self):
+        """Per-wavelength power, on-time and joules of the controller's session, or None without telemetry."""
+        snapshot = self.telemetry.read() if self.telemetry is not None else None
+        if snapshot is None:
+            return None
+        return session_telemetry.live_channels(snapshot).totals()
 
     def update_live_display(self):
-        if self.timer_running and self.therapy_end_timestamp > 0:
-            current_time = time.time()
-            remaining_time_sec = self.therapy_end_timestamp - current_time
+        """Redraws the live fields and schedules the next redraw."""
+        self._live_after = None
+        # The controller runs the session when there is telemetry; the local timer is only for standalone use
+        running = self.show_telemetry() or self.render_local_timer()
+        self._live_after = self.after(LIVE_RUNNING_MS if running else LIVE_IDLE_MS, self.update_live_display)
+
+    def refresh_live_display(self):
+        """Redraws now, e.g. after play/pause, instead of waiting out the idle interval."""
+        if self._live_after is None:
+            return  # Not on screen yet; activate() starts the loop
+        self.after_cancel(self._live_after)
+        self.update_live_display()
+
+    def render_local_timer(self):
+        """Renders the local session. Returns True while it is running."""
+        if self.timer_running and self.dose.running:
+            now = time.monotonic()
+            remaining_time_sec = self.dose.remaining_time(now)
 
             # Use a small epsilon for floating point comparison to ensure it hits zero
             if remaining_time_sec <= 0.01:
                 self.stop_therapy_local()
                 print("Therapy session completed based on time.")
-                return # Exit the function early after stopping
+                return False
 
             minutes_left = remaining_time_sec / 60
-            self.time_var.set(f"{minutes_left:.2f}")
+            self.fields.set(self.time_var, f"{minutes_left:.2f}")
 
-            # Calculate true elapsed time based on the new pause/resume logic
-            # The time already counted before this current 'play' segment
-            # plus the time elapsed since this 'play' segment started.
-            current_segment_elapsed = current_time - self.therapy_start_timestamp
-            total_elapsed_time_sec = self.elapsed_time_at_pause + current_segment_elapsed
-            if total_elapsed_time_sec < 0: total_elapsed_time_sec = 0 # Safety check
-
-            delivered_joules = self._last_received_avg_power * total_elapsed_time_sec
-            self.delivered_j_var.set(f"{int(delivered_joules):04d}")
+            # Each power segment at its own power, not the whole session at the latest one
+            delivered_joules = self.dose.delivered(now)
+            self.fields.set(self.delivered_j_var, f"{int(delivered_joules):04d}")
 
             # Update other displays (these are generally constant during a session)
-            self.joule_var.set(str(self._last_received_target_joule))
-            self.power_var.set(str(round(self._last_received_avg_power, 2)))
-            self.freq_var.set(str(self._last_received_freq))
-            self.delivery_mode_var.set(self._last_received_delivery_mode)
-
-        elif not self.timer_running and self.is_paused_by_button:
-            # If paused, update 'Time' to show remaining time based on `elapsed_time_at_pause`
+            self.fields.set(self.joule_var, str(self._last_received_target_joule))
+            self.fields.set(self.power_var, str(round(self._last_received_avg_power, 2)))
+            self.fields.set(self.freq_var, str(self._last_received_freq))
+            self.fields.set(self.delivery_mode_var, self._last_received_delivery_mode)
+            return True
+
+        if not self.timer_running and self.is_paused_by_button:
+            # If paused, show the remaining time and dose as of the pause.
             # This ensures the display is correct immediately after pausing.
-            remaining_duration_on_pause = self.total_therapy_duration_sec - self.elapsed_time_at_pause
-            if remaining_duration_on_pause < 0: remaining_duration_on_pause = 0
-            self.time_var.set(f"{remaining_duration_on_pause / 60:.2f}")
-
-            # Also update delivered joules if paused
-            delivered_joules_paused = self._last_received_avg_power * self.elapsed_time_at_pause
-            self.delivered_j_var.set(f"{int(delivered_joules_paused):04d}")
+            self.fields.set(self.time_var, f"{self.dose.remaining_time() / 60:.2f}")
+            self.fields.set(self.delivered_j_var, f"{int(self.dose.delivered()):04d}")
         else:
             # This block handles the state when the app first loads or after a stop,
-            # ensuring the display reflects the initially loaded total_therapy_duration_sec
+            # ensuring the display reflects the initially loaded duration
             # or the reset state.
-            if self.total_therapy_duration_sec > 0:
-                self.time_var.set(f"{self.total_therapy_duration_sec / 60:.2f}")
+            if self.dose.duration_sec > 0:
+                self.fields.set(self.time_var, f"{self.dose.duration_sec / 60:.2f}")
             else:
-                self.time_var.set("00.00") # Ensure it shows 00.00 if duration is 0
-
-
-        # Schedule the next update regardless of timer state, so paused state also updates display
-        self.after(200, self.update_live_display)
+                self.fields.set(self.time_var, "00.00") # Ensure it shows 00.00 if duration is 0
+        return False
 
     def start_socket_server(self):
-        def server():
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            try:
-                sock.bind(('localhost', 65432))
-            except OSError as e:
-                print(f"Failed to bind socket: {e}. Port 65432 might be in use. Trying again in 1 second...")
-                time.sleep(1) # Wait and let the loop retry
-                return # Exit this thread's current attempt, but the outer while True will retry
-            sock.listen(1)
-            print("Monitoring application listening for data...")
-            while True:
-                try:
-                    conn, addr = sock.accept()
-                    with conn:
-                        print(f"Connected by {addr}")
-                        while True:
-                            data = conn.recv(4096)
-                            if not data:
-                                print("Client disconnected.")
-                                # Consider if you want to stop therapy when client disconnects
-                                # self.after(0, self.stop_therapy_local)
-                                break
-                            try:
-                                update = json.loads(data.decode('utf-8'))
-                                self.after(0, self.process_external_update, update)
-                            except json.JSONDecodeError as e:
-                                print(f"JSON Decode Error: {e} - Data: {data.decode('utf-8')}")
-                            except Exception as e:
-                                print("Error parsing update:", e)
-                except Exception as e:
-                    print(f"Socket server error: {e}. Waiting 1 second before next accept attempt.")
-                    time.sleep(1) # Wait before trying to accept new connections again
-
-        threading.Thread(target=server, daemon=True).start()
+        # Messages arrive on the server's loop thread and are applied on the Tk thread in
+        # batches, at most one per frame, with consecutive parameter updates merged
+        self.inbox = tk_inbox.TkInbox(self, self.process_external_update)
+        self.server = monitor_server.MonitorServer(self.inbox.put, ready=self.server_ready)
+        self.server.start()
+
+    def publish_state(self):
+        """Lets every connected client (controller, dashboards, loggers) see the local timer state."""
+        if self.server is not None:
+            self.server.publish({"command": "monitor_state", "timer_running": self.timer_running,
+                                 "elapsed_sec": self.dose.elapsed(),
+                                 "total_sec": self.dose.duration_sec,
+                                 "delivered_j": self.dose.delivered(),
+                                 "dispatch": self.inbox.stats(),
+                                 "render": self.fields.stats(),
+                                 "channels": self.channel_totals()})
 
     def process_external_update(self, update):
         command = update.get('command')
 
+        if command == 'selection':
+            # A new choice in automode or on a body-part screen while we are on screen.
+            # It must not wipe the dose and time of a session under way.
+            if self.session_in_progress():
+                self.pending_selection = (update.get('selection', {}), update.get('version', 0))
+                print("DEBUG: Selection received during a session; it is shown when the session ends")
+            else:
+                self.apply_selection(update.get('selection', {}), update.get('version', 0))
+            self.lift()
+            return
+
         if command == 'stop_therapy' or command == 'therapy_completed':
+            channels = self.channel_totals()
+            if channels is not None:
+                print("DEBUG: Delivered per wavelength: " +
+                      ", ".join(f"{wl} {c['energy_j']:.1f} J" for wl, c in channels.items()))
             self.stop_therapy_local()
             print(f"Received command: {command}. Local therapy monitor stopped.")
             return
 
+        elif command == 'start_therapy':
+            # Parameters arrive as update_parameters; the start only names the session state
+            self.attach_telemetry(update.get('telemetry'))
+            self.refresh_live_display()
+            return
+
         elif command == 'update_parameters':
             # This part handles updates if another script (like LaserTherapyGUI.py)
-            # is actively sending live therapy status.
+            # is actively sending live therapy status. Patches only carry the
+            # fields that changed; a snapshot (after a connect or resync) carries all of them.
             if 'set_energy' in update:
                 self._last_received_target_joule = update['set_energy']
-                self.joule_var.set(str(self._last_received_target_joule))
+                self.dose.target_j = float(self._last_received_target_joule)
+                self.fields.set(self.joule_var, str(self._last_received_target_joule))
             if 'set_power' in update:
                 self._last_received_avg_power = float(update['set_power'])
-                self.power_var.set(str(round(self._last_received_avg_power, 2)))
+                self.fields.set(self.power_var, str(round(self._last_received_avg_power, 2)))
+                # Starts a new segment; joules already delivered keep their old power
+                self.dose.set_power(self._last_received_avg_power)
             if 'frequency' in update:
                 self._last_received_freq = update['frequency']
-                self.freq_var.set(str(self._last_received_freq))
+                self.fields.set(self.freq_var, str(self._last_received_freq))
             if 'set_time_min' in update:
                 new_time_minutes = update['set_time_min']
                 self._last_received_target_time_seconds = new_time_minutes * 60
-                self.time_var.set(f"{new_time_minutes:.2f}")
-                # If time is updated while therapy is running, adjust end time
-                # NOTE: If this app is the primary timer controller, this adjustment
-                # might override local pause/resume logic.
-                if self.timer_running and self.therapy_start_timestamp > 0:
-                    # Adjust therapy_end_timestamp based on new total duration
-                    # and the elapsed time up to this point.
-                    # This ensures the timer length changes mid-session.
-                    current_elapsed_at_update = time.time() - self.therapy_start_timestamp
-                    new_total_elapsed_for_current_segment = self.elapsed_time_at_pause + current_elapsed_at_update
-                    self.therapy_end_timestamp = time.time() + (self._last_received_target_time_seconds - new_total_elapsed_for_current_segment)
-                    print(f"DEBUG: Timer duration updated externally. New remaining: {(self.therapy_end_timestamp - time.time()):.2f}s")
-
-                self.total_therapy_duration_sec = self._last_received_target_time_seconds
+                self.fields.set(self.time_var, f"{new_time_minutes:.2f}")
+                # If time is updated while therapy is running, the end moves with it;
+                # the time already run is kept.
+                self.dose.set_duration(self._last_received_target_time_seconds)
+                if self.timer_running:
+                    print(f"DEBUG: Timer duration updated externally. New remaining: {self.dose.remaining_time():.2f}s")
 
             if 'delivery_mode' in update:
                 self._last_received_delivery_mode = update['delivery_mode']
-                self.delivery_mode_var.set(self._last_received_delivery_mode)
+                self.fields.set(self.delivery_mode_var, self._last_received_delivery_mode)
 
             # The 'therapy_end_time' handling is still 'pass' as per previous discussion
             # prioritizing local play/pause control.
@@ -553,7 +673,7 @@ class LuminoProApp(tk.Tk):
 
 if __name__ == "__main__":
     try:
-        app = LuminoProApp()
+        app = LuminoProApp(standby="--standby" in sys.argv)
         app.mainloop()
     except Exception as e:
         print(f"An error occurred while starting or running Lumino Pro App: {e}")
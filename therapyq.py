@@ -1,13 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading
 import time
-import subprocess
-import os
-import sys
 import configparser
-import socket
-import json
+import screen_router
+import monitor_zygote
+import monitor_link
+import session_telemetry
+import session_scheduler
+import pulse_train
+import channel_dose
 
 # Dummy sidebar fallback - This ensures the code runs even if neck_cervicalspine is not available
 try:
@@ -20,18 +21,17 @@ except ImportError:
         ttk.Button(frame, text="Dummy Button",
                    command=lambda: messagebox.showinfo("Sidebar", "Dummy button clicked!")).pack(pady=5)
 
-# Define the path for the monitor application (adjust if your therapy.py is elsewhere)
-MONITOR_APP_PATH = os.path.join(os.path.dirname(__file__), 'therapy.py')
-
-
 class LaserTherapyGUI:
     def __init__(self, root):
         self.root = root
-        self.root.title("Lumino Pro Laser Therapy")
-        self.root.attributes('-fullscreen', True)  # Starts in fullscreen mode
         self.is_running = False
         self.therapy_start_time = 0
-        self.therapy_end_time = 0  # To store when therapy should end
+        self.therapy_end_time = 0  # Wall-clock end, for the monitor's display only
+
+        # The scheduler owns the session timing; the screen just reacts to it
+        self.session = session_scheduler.SessionScheduler(root)
+        self.session.on("tick", self.monitor_progress)
+        self.session.on("completed", lambda session: self.complete_therapy())
 
         # Shared variables for wavelengths, master power, and mode
         self.wavelengths = {
@@ -92,38 +92,73 @@ class LaserTherapyGUI:
 
         self.build_main_ui()
 
-        self.monitor_socket = None
-        self.monitor_process = None
-
-    def connect_to_monitor(self):
-        """Attempts to establish a socket connection to the monitor application."""
-        max_attempts = 20
-        for i in range(max_attempts):
-            try:
-                self.monitor_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.monitor_socket.connect(('localhost', 65432))
-                print("Connected to monitor application.")
-                return True
-            except ConnectionRefusedError:
-                print(f"Connection attempt {i + 1} failed. Retrying...")
-                time.sleep(0.2)
-            except Exception as e:
-                print(f"An error occurred while connecting: {e}")
-                self.monitor_socket = None
-                return False
-        messagebox.showerror("Connection Error",
-                             "Could not connect to the monitoring application after multiple attempts. Please ensure it's running or try again.")
-        self.monitor_socket = None
-        return False
+        # Launches, connects to and feeds the monitor off the Tk thread
+        self.monitor_link = None
+        # Shared memory block the monitor reads delivered energy and time left from
+        self.telemetry = None
+
+        # Parameters go to the monitor as one snapshot, then as patches with only
+        # the fields that changed. Tk variable traces mark those fields dirty so
+        # unchanged variables are not even read.
+        self.param_seq = 0
+        self.sent_params = None     # What the monitor has; None means send a snapshot next
+        self.dirty_params = set()
+        self.param_readers = {
+            "master_power": self.master_power.get,
+            "wavelengths": lambda: {wl: {"enabled": vals["enabled"].get(), "power_percent": vals["power"].get()}
+                                    for wl, vals in self.wavelengths.items()},
+            "mode": self.mode.get,
+            "pulse_type": self.pulse_type.get,
+            "pulse_duration": self.pulse_duration.get,
+            "frequency": self.frequency.get,
+            "set_power": self.set_power.get,
+            "set_energy": self.set_energy.get,
+            "set_time_min": self.set_time.get,
+            "delivery_mode": self.delivery_mode.get,
+        }
+        traced = [(self.master_power, "master_power"), (self.mode, "mode"), (self.pulse_type, "pulse_type"),
+                  (self.pulse_duration, "pulse_duration"), (self.frequency, "frequency"),
+                  (self.set_power, "set_power"), (self.set_energy, "set_energy"), (self.set_time, "set_time_min"),
+                  (self.delivery_mode, "delivery_mode")]
+        traced += [(var, "wavelengths") for vals in self.wavelengths.values() for var in vals.values()]
+        for var, field in traced:
+            var.trace_add("write", lambda *args, field=field: self.dirty_params.add(field))
+
+    def open_monitor_link(self):
+        """Starts the monitor and its connection in the background; messages queue until it is up."""
+        if self.monitor_link is None:
+            self.monitor_link = monitor_link.MonitorLink(launcher=monitor_zygote.launch_monitor)
+            self.sent_params = None
+
+    def close_monitor_link(self, final_command):
+        """Sends the final command, then disconnects and ends the monitor in the background.
+
+        A monitor that is not connected gets the command if it comes up within
+        monitor_link.CLOSE_TIMEOUT_SEC; it is terminated either way.
+        """
+        if self.monitor_link is not None:
+            link = self.monitor_link
+            self.monitor_link = None
+            link.send({"command": final_command})
+            link.close()
+            if link.failed is None and not link.connected:
+                print(f"Monitor is not connected; {final_command} is delivered only if it comes up before closing.")
+                self.status.set(f"{self.status.get()} (monitor not connected, closing it)")
+            print(f"Disconnected from monitor application ({final_command}).")
 
     def send_data_to_monitor(self, data):
-        """Sends JSON-encoded data to the connected monitor application."""
-        if self.monitor_socket:
-            try:
-                self.monitor_socket.sendall(json.dumps(data).encode('utf-8'))
-            except Exception as e:
-                print(f"Error sending data to monitor: {e}")
-                self.monitor_socket = None
+        """Queues one message for the monitor application."""
+        if self.monitor_link:
+            self.monitor_link.send(data)
+
+    def poll_monitor_requests(self):
+        """Handles messages the monitor sent back (resync requests)."""
+        if not self.monitor_link:
+            return
+        for message in self.monitor_link.received():
+            if message.get("command") == "resync":
+                print(f"Monitor requested a resync (expected seq {message.get('expected')})")
+                self.sent_params = None
 
     def build_main_ui(self):
         """Builds the main user interface layout."""
@@ -389,7 +424,8 @@ class LaserTherapyGUI:
         Prioritizes the input field that was most recently interacted with.
         """
         current_active_input = self.active_pes_input.get()
-        machine_avg_power = self.get_average_power()
+        train = self.get_pulse_train()
+        machine_avg_power = train.average_power()
 
         try:
             e_val_str = self.set_energy.get()
@@ -400,8 +436,9 @@ class LaserTherapyGUI:
             t_sec = t_min * 60
 
             if current_active_input == "energy":
-                if e_val >= 0 and machine_avg_power > 0:
-                    calculated_t_sec = e_val / machine_avg_power
+                # Exact for a pulse train, partial last pulse included; None if it cannot deliver e_val
+                calculated_t_sec = train.time_for_energy(e_val)
+                if e_val >= 0 and calculated_t_sec is not None:
                     self.set_time.set(round(calculated_t_sec / 60, 2))
                 else:
                     self.set_time.set(0.0)
@@ -409,7 +446,7 @@ class LaserTherapyGUI:
 
             elif current_active_input == "time":
                 if t_sec >= 0:
-                    calculated_e = machine_avg_power * t_sec
+                    calculated_e = train.energy(t_sec)
                     self.set_energy.set(round(calculated_e, 2))
                 else:
                     self.set_energy.set(0.0)
@@ -417,14 +454,14 @@ class LaserTherapyGUI:
 
             else:
                 if self.last_target_was_energy.get():
-                    if e_val > 0 and machine_avg_power > 0:
-                        calculated_t_sec = e_val / machine_avg_power
+                    calculated_t_sec = train.time_for_energy(e_val)
+                    if e_val > 0 and calculated_t_sec is not None:
                         self.set_time.set(round(calculated_t_sec / 60, 2))
                     else:
                         self.set_time.set(0.0)
                 else:
                     if t_sec > 0:
-                        calculated_e = machine_avg_power * t_sec
+                        calculated_e = train.energy(t_sec)
                         self.set_energy.set(round(calculated_e, 2))
                     else:
                         self.set_energy.set(0.0)
@@ -530,49 +567,66 @@ class LaserTherapyGUI:
                 total_percent += vals["power"].get()
         return total_percent
 
-    def get_average_power(self):
-        """
-        Calculates the average power of the laser output based on master power,
-        wavelength percentages, mode, pulse duration, and frequency.
-        """
+    def get_pulse_train(self):
+        """The laser output the current settings describe (see pulse_train.py)."""
         master_power_watts = self.master_power.get()
-        total_wavelength_percentage = self.get_total_power_percentage()
-
-        if master_power_watts == 0 or total_wavelength_percentage == 0:
-            return 0.0
-
-        normalized_total_percent = min(100, total_wavelength_percentage) / 100.0
+        normalized_total_percent = min(100, self.get_total_power_percentage()) / 100.0
         effective_peak_power = master_power_watts * normalized_total_percent
 
-        if self.mode.get() == "CW":
-            return effective_peak_power
-
-        elif self.mode.get() == "Pulse":
-            try:
-                pulse_duration = float(self.pulse_duration.get())
-            except ValueError:
-                pulse_duration = 0.01
-                self.pulse_duration.set(0.01)
+        if self.mode.get() != "Pulse":
+            return pulse_train.PulseTrain(effective_peak_power)
 
-            if self.pulse_type.get() == "Single":
-                return effective_peak_power
+        try:
+            pulse_duration = float(self.pulse_duration.get())
+        except (tk.TclError, ValueError):
+            pulse_duration = 0.01
+            self.pulse_duration.set(0.01)
 
-            elif self.pulse_type.get() == "Frequency":
-                try:
-                    frequency = float(self.frequency.get())
-                except ValueError:
-                    frequency = 1
-                    self.frequency.set(1)
+        frequency = 0.0
+        if self.pulse_type.get() == "Frequency":
+            try:
+                frequency = float(self.frequency.get())
+            except (tk.TclError, ValueError):
+                frequency = 1
+                self.frequency.set(1)
+        return pulse_train.PulseTrain(effective_peak_power, "Pulse", self.pulse_type.get(), pulse_duration, frequency)
 
-                if frequency <= 0 or pulse_duration <= 0:
-                    return 0.0
+    def get_channel_powers(self, train=None, duration_sec=None):
+        """
+        Average power of each wavelength (channel_dose.WAVELENGTHS order) and the
+        fraction of the time the diodes are on, over a session of `duration_sec`
+        (the current one by default). Both come from the train's on_time(), so
+        the channels' energy adds up to train.energy() and their on-time to
+        train.on_time(). The channels share the output in proportion to their
+        percentages.
+        """
+        if train is None:
+            train = self.get_pulse_train()
+        if duration_sec is None:
+            duration_sec = self.session.duration_sec
+        total_percent = self.get_total_power_percentage()
+        if total_percent <= 0 or train.peak_w <= 0 or duration_sec <= 0:
+            return [0.0] * channel_dose.N, 0.0
+        duty = train.on_time(duration_sec) / duration_sec
+        watts_per_percent = train.peak_w / total_percent * duty
+        channel_power_w = []
+        for wl in channel_dose.WAVELENGTHS:
+            vals = self.wavelengths[wl]
+            channel_power_w.append(vals["power"].get() * watts_per_percent if vals["enabled"].get() else 0.0)
+        return channel_power_w, duty
 
-                duty_cycle = pulse_duration * frequency
-                if duty_cycle > 1.0:
-                    return effective_peak_power
+    def get_average_power(self):
+        """
+        Calculates the average power of the laser output based on master power,
+        wavelength percentages, mode, pulse duration, and frequency.
+        """
+        return self.get_pulse_train().average_power()
 
-                return effective_peak_power * duty_cycle
-        return 0.0
+    def pulse_note(self, train, duration_sec):
+        """' in N pulses (X s on)' for the therapy summary in Pulse mode."""
+        if self.mode.get() != "Pulse":
+            return ""
+        return f" in {train.pulse_count(duration_sec):,} pulses ({train.on_time(duration_sec):.2f} s on)"
 
     def check_start_button_state(self):
         """Enables/disables the Start button based on conditions."""
@@ -649,24 +703,41 @@ class LaserTherapyGUI:
         target_time_sec = target_time_min * 60
 
         actual_therapy_duration_sec = 0
-        avg_power = self.get_average_power()
+        train = self.get_pulse_train()
+        avg_power = train.average_power()
 
         if target_energy > 0 and (target_time_min == 0 or self.last_target_was_energy.get()):
             if avg_power > 0:
-                actual_therapy_duration_sec = target_energy / avg_power
+                actual_therapy_duration_sec = train.time_for_energy(target_energy)
+                if actual_therapy_duration_sec is None:
+                    messagebox.showwarning("Validation Error",
+                                           f"A single pulse delivers at most {train.energy(train.pulse_duration):.2f} Joules. "
+                                           "Lower the target energy or use Frequency pulses.")
+                    return
                 self.set_time.set(round(actual_therapy_duration_sec / 60, 2))
                 messagebox.showinfo("Therapy Calculation",
-                                    f"Therapy will run for {actual_therapy_duration_sec:.2f} seconds to deliver {target_energy:.2f} Joules.")
+                                    f"Therapy will run for {actual_therapy_duration_sec:.2f} seconds to deliver {target_energy:.2f} Joules"
+                                    f"{self.pulse_note(train, actual_therapy_duration_sec)}.")
             else:
                 messagebox.showwarning("Validation Error",
                                        "Average power is 0. Cannot deliver target energy. Adjust power settings.")
                 return
         elif target_time_min > 0 and (target_energy == 0 or not self.last_target_was_energy.get()):
             actual_therapy_duration_sec = target_time_sec
-            calculated_e = avg_power * actual_therapy_duration_sec
+            calculated_e = train.energy(actual_therapy_duration_sec)
             self.set_energy.set(round(calculated_e, 2))
-            messagebox.showinfo("Therapy Calculation",
-                                f"Therapy will run for {actual_therapy_duration_sec:.2f} seconds ({target_time_min:.2f} minutes).")
+            limit_sec = train.session_limit()
+            if limit_sec is not None and actual_therapy_duration_sec > limit_sec:
+                # Nothing is delivered after a single pulse, and the monitor and telemetry
+                # charge the average power for the whole session
+                actual_therapy_duration_sec = limit_sec
+                messagebox.showinfo("Therapy Calculation",
+                                    f"A single pulse is over after {limit_sec:.2f} seconds, so therapy will run for "
+                                    f"{limit_sec:.2f} seconds to deliver {calculated_e:.2f} Joules.")
+            else:
+                messagebox.showinfo("Therapy Calculation",
+                                    f"Therapy will run for {actual_therapy_duration_sec:.2f} seconds ({target_time_min:.2f} minutes)"
+                                    f"{self.pulse_note(train, actual_therapy_duration_sec)}.")
         else:
             messagebox.showwarning("Validation Error", "Please set a valid target Energy or Time for the therapy.")
             return
@@ -682,182 +753,135 @@ class LaserTherapyGUI:
         self.status.set("Running...")
         self.therapy_start_time = time.time()
         self.therapy_end_time = self.therapy_start_time + actual_therapy_duration_sec
+        if self.telemetry is None:
+            self.telemetry = session_telemetry.create()
+        if self.telemetry:
+            channel_power_w, duty = self.get_channel_powers(train, actual_therapy_duration_sec)
+            self.telemetry.start(avg_power, self.set_energy.get(), actual_therapy_duration_sec,
+                                 channel_power_w=channel_power_w, duty=duty)
 
-        self.therapy_thread = threading.Thread(target=self.run_therapy_session,
-                                               args=(actual_therapy_duration_sec,))
-        self.therapy_thread.daemon = True
-        self.therapy_thread.start()
+        self.session.start(actual_therapy_duration_sec)
 
-        if self.monitor_process is None or self.monitor_process.poll() is not None:
-            try:
-                self.monitor_process = subprocess.Popen([sys.executable, MONITOR_APP_PATH])
-                print(f"Started monitor application: {MONITOR_APP_PATH}")
-                time.sleep(1)
-                if not self.connect_to_monitor():
-                    self.stop_therapy()
-                    return
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to start monitor application: {e}")
-                self.stop_therapy()
-                return
+        # The monitor comes from the warm standby when one is waiting; either way
+        # launching and connecting happen off the Tk thread
+        self.open_monitor_link()
 
-        # Send initial therapy parameters with the 'start_therapy' command
-        self.send_therapy_parameters_to_monitor(command_type="start_therapy")
+        # The parameters go as an ordinary update (a snapshot on a new link);
+        # start_therapy itself only names the shared session state
+        self.send_therapy_parameters_to_monitor()
+        self.send_data_to_monitor({"command": "start_therapy",
+                                   "telemetry": self.telemetry.name if self.telemetry else None})
 
         self.monitor_progress()
 
     def stop_therapy(self):
         """Stops the laser therapy session."""
+        self.session.stop()
+        self.end_telemetry(session_telemetry.STOPPED)
         if not self.is_running:
             self.status.set("Stopped")
             self.btn_start.config(state="normal")
             self.btn_stop.config(state="disabled")
-            if self.monitor_socket:
-                try:
-                    self.send_data_to_monitor({"command": "stop_therapy"})
-                    self.monitor_socket.close()
-                except Exception as e:
-                    print(f"Error during stop_therapy socket close: {e}")
-                finally:
-                    self.monitor_socket = None
-                    print("Disconnected from monitor application (forced stop).")
-            if self.monitor_process and self.monitor_process.poll() is None:
-                print("Terminating monitor application (forced stop).")
-                try:
-                    self.monitor_process.terminate()
-                    self.monitor_process.wait(timeout=2)
-                    if self.monitor_process.poll() is None:
-                        self.monitor_process.kill()
-                except Exception as e:
-                    print(f"Error terminating monitor process: {e}")
-                finally:
-                    self.monitor_process = None
+            self.close_monitor_link("stop_therapy")
             return
 
         self.is_running = False
         self.status.set("Stopped")
         self.btn_start.config(state="normal")
         self.btn_stop.config(state="disabled")
-
-        if self.monitor_socket:
-            self.send_data_to_monitor({"command": "stop_therapy"})
-            try:
-                self.monitor_socket.close()
-            except Exception as e:
-                print(f"Error closing socket during stop_therapy: {e}")
-            self.monitor_socket = None
-            print("Disconnected from monitor application.")
-
-        if self.monitor_process and self.monitor_process.poll() is None:
-            print("Terminating monitor application.")
-            try:
-                self.monitor_process.terminate()
-                self.monitor_process.wait(timeout=5)
-                if self.monitor_process.poll() is None:
-                    self.monitor_process.kill()
-            except Exception as e:
-                print(f"Error terminating monitor process during stop: {e}")
-            finally:
-                self.monitor_process = None
-
-    def run_therapy_session(self, duration_sec):
-        """
-        Simulates the therapy session, updating elapsed time and checking for completion.
-        This runs in a separate thread.
-        """
-        start_time = time.time()
-        while self.is_running and (time.time() - start_time) < duration_sec:
-            time.sleep(0.1)
-
-        if self.is_running:
-            self.root.after(100, self.complete_therapy)
+        self.close_monitor_link("stop_therapy")
 
     def complete_therapy(self):
-        """Handles therapy completion."""
+        """Handles therapy completion. The scheduler calls this once, at the deadline."""
+        self.end_telemetry(session_telemetry.COMPLETED)
         self.is_running = False
         self.status.set("Completed")
         self.btn_start.config(state="normal")
         self.btn_stop.config(state="disabled")
-        messagebox.showinfo("Therapy Status", "Therapy session completed!")
+        self.close_monitor_link("therapy_completed")
+        summary = "Therapy session completed!"
+        if self.telemetry:
+            summary += f"\n\nDelivered per wavelength:\n{self.telemetry.snapshot.channels.describe()}"
+        messagebox.showinfo("Therapy Status", summary)
+
+    def send_therapy_parameters_to_monitor(self):
+        """Sends the therapy parameters to the monitor as update_parameters.
+
+        The first message after a (re)connect or resync carries a full
+        snapshot. Otherwise only the fields that changed since the last
+        message are sent, and nothing at all if none did. Every message
+        carries the next sequence number.
+        """
+        if self.sent_params is None:
+            params = {field: read() for field, read in self.param_readers.items()}
+            params["therapy_end_time"] = self.therapy_end_time
+            self.dirty_params.clear()
+            self.param_seq += 1
+            self.sent_params = params
+            self.send_data_to_monitor({"command": "update_parameters", "seq": self.param_seq, "snapshot": True,
+                                       **params})
+            return
 
-        if self.monitor_socket:
-            self.send_data_to_monitor({"command": "therapy_completed"})
-            try:
-                self.monitor_socket.close()
-            except Exception as e:
-                print(f"Error closing socket during therapy_completed: {e}")
-            self.monitor_socket = None
-            print("Disconnected from monitor application (therapy completed).")
-
-        if self.monitor_process and self.monitor_process.poll() is None:
-            print("Terminating monitor application after completion.")
-            try:
-                self.monitor_process.terminate()
-                self.monitor_process.wait(timeout=5)
-                if self.monitor_process.poll() is None:
-                    self.monitor_process.kill()
-            except Exception as e:
-                print(f"Error terminating monitor process after completion: {e}")
-            finally:
-                self.monitor_process = None
-
-    def send_therapy_parameters_to_monitor(self, command_type="update_parameters"):
-        """Collects current therapy parameters and sends them to the monitor."""
-        parameters = {
-            "master_power": self.master_power.get(),
-            "wavelengths": {wl: {"enabled": vals["enabled"].get(), "power_percent": vals["power"].get()}
-                            for wl, vals in self.wavelengths.items()},
-            "mode": self.mode.get(),
-            "pulse_type": self.pulse_type.get(),
-            "pulse_duration": self.pulse_duration.get(),
-            "frequency": self.frequency.get(),
-            "set_power": self.set_power.get(),
-            "set_energy": self.set_energy.get(),
-            "set_time_min": self.set_time.get(),
-            "therapy_end_time": self.therapy_end_time,
-            "command": command_type,
-            "delivery_mode": self.delivery_mode.get()
-        }
-        self.send_data_to_monitor(parameters)
+        changes = {}
+        for field in self.dirty_params:
+            value = self.param_readers[field]()
+            if value != self.sent_params.get(field):
+                changes[field] = value
+        self.dirty_params.clear()
+        if self.therapy_end_time != self.sent_params.get("therapy_end_time"):
+            changes["therapy_end_time"] = self.therapy_end_time
+        if not changes:
+            return
+        self.param_seq += 1
+        self.sent_params.update(changes)
+        self.send_data_to_monitor({"command": "update_parameters", "seq": self.param_seq, **changes})
 
-    def monitor_progress(self):
+    def monitor_progress(self, session=None):
         """
-        Continuously sends updated parameters to the monitor and updates the GUI
-        with remaining time if therapy is running.
+        Runs on every scheduler tick while therapy is running: sends updated
+        parameters to the monitor and shows the remaining time. Completion is
+        not decided here; the scheduler fires it at the deadline.
         """
+        if not self.session.running:
+            return
+        if self.monitor_link and self.monitor_link.failed:
+            # No session without a monitor to show it
+            reason = self.monitor_link.failed
+            self.stop_therapy()
+            messagebox.showerror("Connection Error",
+                                 f"Therapy was stopped because the monitoring application could not be reached: {reason}.")
+            return
+        self.poll_monitor_requests()
+        self.send_therapy_parameters_to_monitor()
+        if self.telemetry:
+            train = self.get_pulse_train()
+            channel_power_w, duty = self.get_channel_powers(train)
+            self.telemetry.update(power_w=train.average_power(), channel_power_w=channel_power_w, duty=duty)
+
+        link_note = "" if self.monitor_link and self.monitor_link.connected else " (monitor connecting...)"
+        self.status.set(f"Running... Time Left: {self.session.remaining():.1f} s{link_note}")
+
+    def end_telemetry(self, state):
+        if self.telemetry and self.telemetry.snapshot.state == session_telemetry.RUNNING:
+            self.telemetry.update(state=state)
+            print(f"DEBUG: Delivered per wavelength: {self.telemetry.snapshot.channels.describe()}")
+
+    def can_leave(self):
+        """Asked by the screen router before navigating away or quitting."""
         if self.is_running:
-            self.send_therapy_parameters_to_monitor()
+            return messagebox.askyesno("Exit", "Therapy is currently running. Do you want to stop and exit?")
+        return True
 
-            current_time = time.time()
-            remaining_time_sec = self.therapy_end_time - current_time
-            if remaining_time_sec < 0:
-                remaining_time_sec = 0
+    def close(self):
+        """Called by the screen router when this screen is torn down."""
+        self.stop_therapy()
+        if self.telemetry:
+            self.telemetry.close()
+            self.telemetry = None
 
-            if remaining_time_sec <= 0 and self.therapy_end_time > 0:
-                self.root.after(10, self.complete_therapy)
-                return
-
-            if self.therapy_end_time > 0 and self.is_running:
-                self.status.set(f"Running... Time Left: {remaining_time_sec:.1f} s")
-
-            self.root.after(1000, self.monitor_progress)
-
-        elif not self.is_running and self.status.get().startswith("Running"):
-            self.status.set("Stopped" if self.status.get() != "Completed" else "Completed")
-
-    def on_closing(self):
-        """Handles closing the GUI window."""
-        if self.is_running:
-            if messagebox.askyesno("Exit", "Therapy is currently running. Do you want to stop and exit?"):
-                self.stop_therapy()
-                self.root.destroy()
-        else:
-            self.stop_therapy()
-            self.root.destroy()
 
+screen_router.register_screen("therapy", lambda root, router: LaserTherapyGUI(root),
+                              title="Lumino Pro Laser Therapy", cache=False)
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = LaserTherapyGUI(root)
-    root.protocol("WM_DELETE_WINDOW", app.on_closing)
-    root.mainloop()
\ No newline at end of file
+    screen_router.run("therapy")
\ No newline at end of file
@@ -0,0 +1,92 @@
+import collections
+import threading
+import time
+
+# === Network thread -> Tk thread hand-off ===
+# Background threads must not touch widgets, and one after(0, ...) per message
+# costs a Tcl timer and a separate round of StringVar.set calls and redraws each.
+# Messages are queued here instead, and a single pending after() callback, at
+# most one per display frame, applies everything that arrived since the last
+# one. Consecutive update_parameters messages are merged while they wait, so
+# only the latest value of each field is applied.
+
+FRAME_MS = 16
+MERGEABLE = "update_parameters"
+
+
+class TkInbox:
+    def __init__(self, widget, handler, frame_ms=FRAME_MS):
+        self.widget = widget
+        self.handler = handler       # Called on the Tk thread with each message
+        self.frame_ms = frame_ms
+        self._queue = collections.deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._oldest = 0.0           # When the oldest queued message arrived
+        self._last_drain = 0.0
+
+        # Metrics
+        self.received = 0
+        self.merged = 0
+        self.applied = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.last_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self._total_latency_ms = 0.0
+
+    def put(self, message):
+        """Queues a message from any thread."""
+        now = time.monotonic()
+        with self._lock:
+            self.received += 1
+            if not self._queue:
+                self._oldest = now
+            tail = self._queue[-1] if self._queue else None
+            if tail is not None and tail.get("command") == MERGEABLE and message.get("command") == MERGEABLE:
+                self._queue[-1] = {**tail, **message}
+                self.merged += 1
+            else:
+                self._queue.append(message)
+                self.max_depth = max(self.max_depth, len(self._queue))
+            if self._scheduled:
+                return
+            self._scheduled = True
+            delay_ms = max(0, int(self.frame_ms - (now - self._last_drain) * 1000))
+        self.widget.after(delay_ms, self._drain)
+
+    def _drain(self):
+        now = time.monotonic()
+        with self._lock:
+            batch = list(self._queue)
+            self._queue.clear()
+            self._scheduled = False
+            self._last_drain = now
+            latency_ms = (now - self._oldest) * 1000
+        self.batches += 1
+        self.last_latency_ms = latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self._total_latency_ms += latency_ms
+        for message in batch:
+            try:
+                self.handler(message)
+                self.applied += 1
+            except Exception as e:
+                print(f"Error handling message {message.get('command')}: {e}")
+
+    @property
+    def depth(self):
+        return len(self._queue)
+
+    def stats(self):
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "received": self.received,
+            "merged": self.merged,
+            "applied": self.applied,
+            "batches": self.batches,
+            "last_latency_ms": round(self.last_latency_ms, 2),
+            "avg_latency_ms": round(self._total_latency_ms / self.batches, 2) if self.batches else 0.0,
+            "max_latency_ms": round(self.max_latency_ms, 2),
+        }
@@ -0,0 +1,33 @@
+# === Dirty-field rendering for Tk variables ===
+# Setting a StringVar always runs its Tcl traces and makes every label showing
+# it recompute its size, even when the text is the same. The live displays
+# re-render all their fields several times a second, and most of them have not
+# changed. FieldRenderer remembers the last text it set on each variable and
+# only calls set() when the new text differs. The cache is only correct if all
+# writes to these variables go through set() here.
+
+
+class FieldRenderer:
+    def __init__(self):
+        self._shown = {}  # Tcl variable name -> text last set
+        self.applied = 0
+        self.skipped = 0
+
+    def set(self, var, text):
+        """Shows `text` in `var` unless it already does. Returns True if the variable was touched."""
+        key = str(var)
+        if self._shown.get(key) == text:
+            self.skipped += 1
+            return False
+        var.set(text)
+        self._shown[key] = text
+        self.applied += 1
+        return True
+
+    def stats(self):
+        total = self.applied + self.skipped
+        return {
+            "applied": self.applied,
+            "skipped": self.skipped,
+            "skipped_pct": round(100 * self.skipped / total, 1) if total else 0.0,
+        }